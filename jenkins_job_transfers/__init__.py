@@ -1,19 +1,40 @@
+import os
 from . import baseModule as jbm
 from . import utils as jutils
 from . import config as cfg
-from rich.console import Console
-from rich.table import Table
+from . import inventory as jinv
+from . import canonical as jcanon
+from . import events as jevents
+from . import results as jres
+from . import bundle as jbundle
+from . import plan as jplan
+from . import updatecenter as jupdates
 
 '''
 Functions to Support
 
 1. connect(production_machine_url, dev_machine_url, production_username, dev_username, production_password, dev_password)
-2. transfer(production_conn, interim_conn, publish_list, type="job" or "view", allowDuplicateJobs=False)
+2. transfer(production_conn, interim_conn, publish_list, type="job" or "view", allowDuplicateJobs=False, workers=1, skipUnchanged=False, on_event=None, plan=None, includeUpstream=False, includeDownstream=False)
 3. check_publish_standards(production_conn, interim_conn, publish_list, type="job" or "view", allowDuplicateJobs=False) 
 4. check_plugin_dependencies(production_conn, interim_conn, publish_list, type="job" or "view")
-5. check_and_install_plugin_dependencies(production_conn, interim_conn, publish_list, type="job" or "view")
+5. check_and_install_plugin_dependencies(production_conn, interim_conn, publish_list, type="job" or "view", batch=False, restart=False)
 6. production_cleanup()
 7. interim_cleanup()
+8. set_max_workers(workers, per_server=None)
+9. set_ignore_rules(rules)
+10. check_server_drift()
+11. iter_transfer(publish_list, type="job" or "view", allowDuplicates=False, workers=1, skipUnchanged=False, includeUpstream=False, includeDownstream=False)
+12. get_results()
+13. set_folder_depth(depth)
+14. connect_production(production_machine_url, production_username, production_password)
+15. export_bundle(path, publish_list, type="job" or "view")
+16. import_bundle(path, workers=1, skipUnchanged=False)
+17. plan_transfer(publish_list, type="job" or "view", allowDuplicates=False, includeUpstream=False, includeDownstream=False)
+18. get_plan()
+19. set_update_center(source, ttl=86400, cache_dir=None)
+20. resolve_plugin_dependencies(plugin_names)
+21. set_analysis_processes(processes)
+22. set_inventory_backend(backend)
 
 mode = "console" or "quiet"
 
@@ -59,8 +80,7 @@ def connect(production_machine_url, interim_machine_url, production_username, in
         cfg.production_url = production_machine_url
         cfg.interim_url = interim_machine_url   
         cfg.mode = mode
-        cfg.console = Console()
-        cfg.table = Table(show_lines=True, width=cfg.width)
+        cfg.table = jres.ResultSet()
         cfg.table.add_section()
         cfg.table.add_column("Connection Summary", style="cyan", no_wrap=True)
         cfg.table.add_row("Production URL", production_machine_url)
@@ -77,35 +97,111 @@ def connect(production_machine_url, interim_machine_url, production_username, in
             raise ValueError("Connection Not Established!")
 
         cfg.table.add_row("Connection Status", "Connection Established")
-        if mode == 'console': cfg.console.print(cfg.table)
+        if mode == 'console': cfg.table.show()
         return True
 
     except Exception as e:
         cfg.table.add_row("Connection Status", "Connection Failed", str(e))
-        cfg.console.print(cfg.table)
+        cfg.table.show()
         return False
 
 
-def transfer(publish_list, ftype="job", allowDuplicates=False, mode="console"):
+def connect_production(production_machine_url, production_username, production_password, mode="console"):
+    """
+    Establishes a connection to the production Jenkins server only, e.g. to apply a bundle with import_bundle.
+
+    Parameters:
+    - production_machine_url (str): The URL for the production Jenkins server.
+    - production_username (str): The username for the production Jenkins server.
+    - production_password (str): The password for the production Jenkins server.
+    - mode (str, optional): The mode of operation, either "console" or "quiet". Defaults to "console".
+
+    Returns:
+    - bool: True if the connection is successfully established, False otherwise.
+
+    Raises:
+    - ValueError: If the URL, username or password is None, or if the connection cannot be established.
+    - TypeError: If the mode is not one of the allowed values ("console", "quiet").
+    """
+    try:
+
+        cfg.table = jres.ResultSet()
+        cfg.table.add_column("Connection Summary", style="cyan", no_wrap=True)
+
+        if not production_machine_url:
+            raise ValueError("production_machine_url is None.")
+        if not production_username or not production_password:
+            raise ValueError("Either production_username or production_password is None.")
+        if mode not in ('console', 'quiet'):
+            raise TypeError("Invalid Mode Field! Mode = [console, quiet]")
+
+        cfg.production_url = production_machine_url
+        cfg.interim_url = None
+        cfg.mode = mode
+        cfg.table.add_row("Production URL", production_machine_url)
+
+        cfg.production_conn = jbm.jenkins.Jenkins(production_machine_url, username=production_username,
+                                                  password=production_password)
+        cfg.interim_conn = None
+        if not cfg.production_conn.get_views():
+            raise ValueError("Connection Not Established!")
+
+        cfg.table.add_row("Connection Status", "Connection Established")
+        if mode == 'console': cfg.table.show()
+        return True
+
+    except Exception as e:
+        cfg.table.add_row("Connection Status", "Connection Failed", str(e))
+        cfg.table.show()
+        return False
+
+
+def transfer(publish_list, ftype="job", allowDuplicates=False, mode="console", workers=1, skipUnchanged=False,
+             on_event=None, plan=None, includeUpstream=False, includeDownstream=False):
     """
     Transfers jobs/views from the production Jenkins server to the interim Jenkins server.
 
+    Every write is planned against one snapshot of both servers before anything is written, see plan_transfer().
+    Jobs are transferred in dependency order: a job after the jobs triggering it (Build other projects, Build
+    after other projects are built, parameterized triggers and pipeline build steps), and the jobs that do not
+    depend on each other concurrently. Without allowDuplicates, the jobs included for includeUpstream or
+    includeDownstream must pass the same publish standards pre-check as the publish_list.
+
     Parameters:
     - publish_list (list): A list of job/view names to be transferred.
     - ftype (str, optional): The type of the element in the publish_list. Defaults to "job".
     - allowDuplicates (bool, optional): Whether to allow duplicate jobs/views. Defaults to False.
     - mode (str, optional): The mode of operation, either "console" or "quiet". Defaults to "console".
+    - workers (int, optional): The number of jobs transferred concurrently, capped by the production server's
+                               limit from set_max_workers. Results are reported in the order of the jobs.
+                               Defaults to 1, which transfers one job after another.
+    - skipUnchanged (bool, optional): Whether to skip updating jobs/views whose production config already has the same
+                                      normalized content as in interim. These are reported as "Unchanged".
+                                      Defaults to False.
+    - on_event (callable, optional): Called with an events.TransferEvent for every step as soon as it happens
+                                     (fetched, plugins checked, created, updated, view updated, failed, ...).
+                                     With workers > 1 it is called from the worker threads. In "quiet" mode the
+                                     report rows are then not kept. Defaults to None.
+    - plan (dict, optional): A plan token for the same publish_list and ftype, from plan_transfer() or get_plan()
+                             after check_publish_standards()/check_plugin_dependencies(), possibly loaded back
+                             from JSON. Instead of planning the transfer again, only what changed in either
+                             server since the plan was made is verified again. Defaults to None.
+    - includeUpstream (bool, optional): Whether to transfer the jobs triggering the jobs too, directly or through
+                                        other jobs. Defaults to False.
+    - includeDownstream (bool, optional): Whether to transfer the jobs triggered by the jobs too, directly or
+                                          through other jobs. Defaults to False.
 
     Returns:
     - bool: True if the transfer is successful, False otherwise.
 
     Raises:
-    - ValueError: If the connection to the Jenkins servers has not been established.
+    - ValueError: If the connection to the Jenkins servers has not been established, or the plan does not match
+                  its token or was made for other servers or another publish_list.
     - TypeError: If the publish_list is not a list, or if the ftype or mode is not a string.
     """
     try:
 
-        cfg.table = Table(show_lines=True, width=cfg.width)
+        cfg.table = jres.ResultSet()
         cfg.table.add_column("Transfer Details", style="cyan", no_wrap=True)
 
         production_conn = cfg.production_conn
@@ -126,21 +222,229 @@ def transfer(publish_list, ftype="job", allowDuplicates=False, mode="console"):
             raise TypeError("Invalid Type Field! Type = [job, view]")
         if mode not in ('console', 'quiet'):
             raise TypeError("Invalid Mode Field! Mode = [console, quiet]")
+        if not isinstance(workers, int) or workers < 1:
+            raise TypeError("Workers Must be a Positive Integer!")
+
+        cfg.transfer_workers = workers
+        cfg.skipUnchanged = skipUnchanged
+        cfg.event_callback = on_event
+        if on_event and mode == 'quiet':
+            cfg.table = jres.DiscardingResultSet()
+        jinv.reset_snapshot()
+
+        if plan is None:
+            plan = jplan.build_plan(publish_list, ftype, check=not allowDuplicates, upstream=includeUpstream,
+                                    downstream=includeDownstream)
+        else:
+            jplan.check_plan(plan, publish_list, ftype)
+            plan = jplan.refresh_plan(plan)
+        jplan.remember(plan)
+
+        res = jplan.execute_plan(plan)
+
+        if mode == 'console': cfg.table.show()
+        return res
+
+    except Exception as e:
+        cfg.table.add_row("Transfer Status", "Failed", str(e))
+        cfg.table.show()
+        if on_event: on_event(jevents.TransferEvent(jevents.FAILED, detail=str(e)))
+        return False
+
+    finally:
+        cfg.event_callback = None
+
+
+def plan_transfer(publish_list, ftype="job", allowDuplicates=False, mode="console", includeUpstream=False,
+                  includeDownstream=False):
+    """
+    Plans a transfer of jobs/views without writing anything: the publish standards pre-check, the plugins to
+    install, the plugins whose production version is older or newer than the version the jobs were saved with,
+    and every folder, job and view to create, update or delete in production, with the estimated number of
+    requests. The plan can be passed to transfer() to execute it.
+
+    Parameters:
+    - publish_list (list): A list of job/view names to be transferred.
+    - ftype (str, optional): The type of the element in the publish_list. Defaults to "job".
+    - allowDuplicates (bool, optional): Whether to allow duplicate jobs/views. Defaults to False.
+    - mode (str, optional): The mode of operation, either "console" or "quiet". Defaults to "console".
+    - includeUpstream (bool, optional): Whether to plan the jobs triggering the jobs too, see transfer().
+                                        Defaults to False.
+    - includeDownstream (bool, optional): Whether to plan the jobs triggered by the jobs too, see transfer().
+                                          Defaults to False.
+
+    Returns:
+    - dict: The plan, which can be saved with json.dump, see plan.build_plan(); None if it could not be made.
+    """
+    try:
+
+        cfg.table = jres.ResultSet()
+        cfg.table.add_column("Transfer Plan", style="cyan", no_wrap=True)
+
+        production_conn = cfg.production_conn
+        interim_conn = cfg.interim_conn
+
+        ftype = ftype.lower()
+        mode = cfg.mode = mode.lower()
+        cfg.allowDuplicates = allowDuplicates
+
+        if not production_conn or not interim_conn:
+            raise ValueError("Connection Not Established!")
+        if not isinstance(publish_list, list):
+            raise TypeError("Publish List Must be a List!")
+        if ftype not in ('job', 'view'):
+            raise TypeError("Invalid Type Field! Type = [job, view]")
+        if mode not in ('console', 'quiet'):
+            raise TypeError("Invalid Mode Field! Mode = [console, quiet]")
+
+        jinv.reset_snapshot()
+
+        plan = jplan.remember(jplan.build_plan(publish_list, ftype, upstream=includeUpstream,
+                                               downstream=includeDownstream))
+        jplan.add_plan_rows(plan)
+
+        if mode == 'console': cfg.table.show()
+        return plan
+
+    except Exception as e:
+        cfg.table.add_row("Transfer Plan", "Failed", str(e))
+        cfg.table.show()
+        return None
+
+
+def iter_transfer(publish_list, ftype="job", allowDuplicates=False, workers=1, skipUnchanged=False,
+                  includeUpstream=False, includeDownstream=False):
+    """
+    Transfers jobs/views like transfer(), yielding an event for every step as soon as it happens instead of
+    building a report.
+
+    The transfer runs in a background thread in "quiet" mode. Stopping the iteration early does not stop it.
+
+    Parameters:
+    - publish_list (list): A list of job/view names to be transferred.
+    - ftype (str, optional): The type of the element in the publish_list. Defaults to "job".
+    - allowDuplicates (bool, optional): Whether to allow duplicate jobs/views. Defaults to False.
+    - workers (int, optional): The number of jobs transferred concurrently, see transfer(). Defaults to 1.
+    - skipUnchanged (bool, optional): Whether to skip jobs/views that are unchanged, see transfer(). Defaults to False.
+    - includeUpstream (bool, optional): Whether to transfer the jobs triggering the jobs too, see transfer().
+                                        Defaults to False.
+    - includeDownstream (bool, optional): Whether to transfer the jobs triggered by the jobs too, see transfer().
+                                          Defaults to False.
+
+    Yields:
+    - events.TransferEvent: The steps of the transfer, e.g. kind "fetched", "plugins_checked", "created",
+                            "updated", "view_updated" or "failed", with the job or view they concern. The last
+                            event has kind "finished" and the result of the transfer as detail.
+    """
+    return jevents.iterate(lambda on_event: transfer(publish_list, ftype, allowDuplicates, mode="quiet",
+                                                     workers=workers, skipUnchanged=skipUnchanged,
+                                                     on_event=on_event, includeUpstream=includeUpstream,
+                                                     includeDownstream=includeDownstream))
+
+
+def export_bundle(path, publish_list, ftype="job", mode="console"):
+    """
+    Exports jobs/views from the interim Jenkins server, with the plugins they need, into a bundle file that
+    import_bundle applies to production without a connection to interim.
+
+    The bundle is a compressed zip file holding a manifest and every distinct config once, named by its SHA-256.
+    For a list of jobs the views containing them are exported too; for a list of views, all of their jobs.
+    Folders containing the jobs are included.
+
+    Parameters:
+    - path (str): The bundle file to write.
+    - publish_list (list): A list of job/view names to be exported.
+    - ftype (str, optional): The type of the element in the publish_list. Defaults to "job".
+    - mode (str, optional): The mode of operation, either "console" or "quiet". Defaults to "console".
+
+    Returns:
+    - bool: True if every job/view was exported, False otherwise.
+    """
+    try:
+
+        cfg.table = jres.ResultSet()
+        cfg.table.add_column("Export Bundle", style="cyan", no_wrap=True)
+
+        interim_conn = cfg.interim_conn
+
+        ftype = ftype.lower()
+        mode = cfg.mode = mode.lower()
+
+        if not interim_conn:
+            raise ValueError("Connection Not Established!")
+        if not isinstance(path, str) or not path:
+            raise TypeError("Path Must be a String!")
+        if not isinstance(publish_list, list):
+            raise TypeError("Publish List Must be a List!")
+        if ftype not in ('job', 'view'):
+            raise TypeError("Invalid Type Field! Type = [job, view]")
+        if mode not in ('console', 'quiet'):
+            raise TypeError("Invalid Mode Field! Mode = [console, quiet]")
+
+        jinv.reset_snapshot()
 
         if ftype == "job":
+            res = jbundle.export_bundle(path, publish_list, [])
+        else:
+            res = jbundle.export_bundle(path, [], publish_list)
 
-            res = jbm.transfer_jobs(publish_list)
+        if mode == 'console': cfg.table.show()
+        return res
 
-        elif ftype == "view":
+    except Exception as e:
+        cfg.table.add_row("Export Bundle", "Failed", str(e))
+        cfg.table.show()
+        return False
+
+
+def import_bundle(path, mode="console", workers=1, skipUnchanged=False):
+    """
+    Applies a bundle written by export_bundle to the production Jenkins server. Only a connection to production
+    is needed (see connect_production), and the same bundle can be applied any number of times.
+
+    The plugins missing in production are installed first; jobs needing a plugin that could not be installed are
+    skipped. Folders and jobs are then created or updated, followed by the views; the jobs and folders inside a
+    folder that could not be written are skipped too.
+
+    Parameters:
+    - path (str): The bundle file to apply.
+    - mode (str, optional): The mode of operation, either "console" or "quiet". Defaults to "console".
+    - workers (int, optional): The number of jobs written concurrently, see transfer(). Defaults to 1.
+    - skipUnchanged (bool, optional): Whether to skip jobs/views whose production config is unchanged, see
+                                      transfer(). Defaults to False.
+
+    Returns:
+    - bool: True if every job/view of the bundle was applied, False otherwise.
+    """
+    try:
+
+        cfg.table = jres.ResultSet()
+        cfg.table.add_column("Import Bundle", style="cyan", no_wrap=True)
+
+        production_conn = cfg.production_conn
+        mode = cfg.mode = mode.lower()
+
+        if not production_conn:
+            raise ValueError("Connection Not Established!")
+        if not isinstance(path, str) or not path:
+            raise TypeError("Path Must be a String!")
+        if mode not in ('console', 'quiet'):
+            raise TypeError("Invalid Mode Field! Mode = [console, quiet]")
+        if not isinstance(workers, int) or workers < 1:
+            raise TypeError("Workers Must be a Positive Integer!")
+
+        cfg.transfer_workers = workers
+        cfg.skipUnchanged = skipUnchanged
+        jinv.reset_snapshot()
 
-            res = jbm.transfer_views(publish_list)
+        res = jbundle.import_bundle(path)
 
-        if mode == 'console': cfg.console.print(cfg.table)
+        if mode == 'console': cfg.table.show()
         return res
 
     except Exception as e:
-        cfg.table.add_row("Transfer Status", "Failed", str(e))
-        cfg.console.print(cfg.table)
+        cfg.table.add_row("Import Bundle", "Failed", str(e))
+        cfg.table.show()
         return False
 
 
@@ -154,12 +458,15 @@ def check_publish_standards(publish_list, ftype="job", allowDuplicates=False, mo
     allowDuplicates (bool): If duplicate jobs/views are allowed in the target environment.
     mode (str): The mode of the check. Must be one of 'console' or 'quiet'.
 
+    Only the job lists and views of both servers are read. The transfer is planned when get_plan() or
+    check_plugin_dependencies() asks for the plan, which transfer() can then execute without planning again.
+
     Returns:
     bool: True if all jobs/views meet the standards, False otherwise.
     """
     try:
 
-        cfg.table = Table(show_lines=True, width=cfg.width)
+        cfg.table = jres.ResultSet()
         cfg.table.add_column("Check Publish Standards", style="cyan", no_wrap=True)
 
         production_conn = cfg.production_conn
@@ -180,22 +487,65 @@ def check_publish_standards(publish_list, ftype="job", allowDuplicates=False, mo
         if mode not in ('console', 'quiet'):
             raise TypeError("Invalid Mode Field! Mode = [console, quiet]")
 
-        if ftype == "job":
-            chk = jbm.job_pre_check(publish_list)
-            if mode == 'console': cfg.console.print(cfg.table)
-            return chk
+        jinv.reset_snapshot()
 
-        elif ftype == "view":
-            chk = jbm.view_pre_check(publish_list)
-            if mode == 'console': cfg.console.print(cfg.table)
-            return chk
+        if ftype == 'job':
+            passed = jbm.job_pre_check(publish_list)
+        else:
+            passed = jbm.view_pre_check(publish_list)
+        jplan.defer_plan(publish_list, ftype, passed)
+
+        if mode == 'console': cfg.table.show()
+        return passed
 
     except Exception as e:
         cfg.table.add_row("Check Publish Standards", "Failed", str(e))
-        cfg.console.print(cfg.table)
+        cfg.table.show()
         return False
 
 
+def check_server_drift(mode="console"):
+    """
+    Compares the whole interim and production servers and reports the jobs, views and plugins that differ.
+
+    Job and view configs are fetched concurrently, up to the limit from set_max_workers, and compared by the hash
+    of their canonical form (see set_ignore_rules). Plugins are compared by version.
+
+    Parameters:
+    mode (str): The mode of the check. Must be one of 'console' or 'quiet'.
+
+    Returns:
+    dict: 'jobs', 'views' and 'plugins', each with 'missing' (only in interim), 'extra' (only in production),
+          'changed' and 'identical' lists of names. 'plugins' also maps every changed plugin to its
+          (production, interim) versions under 'versions'. An empty dict if the check failed.
+    """
+    try:
+
+        cfg.table = jres.ResultSet()
+        cfg.table.add_column("Check Server Drift", style="cyan", no_wrap=True)
+
+        production_conn = cfg.production_conn
+        interim_conn = cfg.interim_conn
+
+        mode = cfg.mode = mode.lower()
+
+        if not production_conn or not interim_conn:
+            raise ValueError("Connection Not Established!")
+        if mode not in ('console', 'quiet'):
+            raise TypeError("Invalid Mode Field! Mode = [console, quiet]")
+
+        jinv.reset_snapshot()
+
+        report = jbm.server_drift()
+        if mode == 'console': cfg.table.show()
+        return report or {}
+
+    except Exception as e:
+        cfg.table.add_row("Check Server Drift", "Failed", str(e))
+        cfg.table.show()
+        return {}
+
+
 def check_plugin_dependencies(publish_list, ftype="job", mode="console"):
     """
     A function that checks if the jobs/views in the given list meets the plugin standards of the production server
@@ -203,6 +553,10 @@ def check_plugin_dependencies(publish_list, ftype="job", mode="console"):
     the plugin standards. The dictionary will have the job/view name as the key and the list of required plugins
     as the value.
 
+    The answer is read from the transfer plan, see get_plan(); the plan of a previous check of the same jobs/views
+    is reused and only verified again, so the job configs are not read again. Plugins production has in an older or
+    newer version than a job was saved with are reported too, and the plan lists them per job.
+
     Parameters:
         - publish_list (list): A list of jobs/views to be checked.
         - ftype (str): The type of the publish_list. It can either be "job" or "view".
@@ -216,7 +570,7 @@ def check_plugin_dependencies(publish_list, ftype="job", mode="console"):
     """
     try:
 
-        cfg.table = Table(show_lines=True, width=cfg.width)
+        cfg.table = jres.ResultSet()
         cfg.table.add_column("Check Plugin Dependencies (w/o Install)", style="cyan", no_wrap=True)
 
         production_conn = cfg.production_conn
@@ -236,39 +590,21 @@ def check_plugin_dependencies(publish_list, ftype="job", mode="console"):
         if mode not in ('console', 'quiet'):
             raise TypeError("Invalid Mode Field! Mode = [console, quiet]")
 
-        if ftype == "job":
-            job_plugins = {}
-            for job in publish_list:
-                cfg.table.add_row("Job", job)
-                job_plugins[job] = jbm.check_job_plugins_in_production_without_install(job)
-                cfg.table.add_row()
+        jinv.reset_snapshot()
 
-            if mode == 'console': cfg.console.print(cfg.table)
-            return job_plugins
+        plan = jplan.remember(jplan.current_plan(publish_list, ftype))
+        job_plugins = jplan.plugin_dependencies(plan)
 
-        elif ftype == "view":
-
-            interim_views_list = jutils.get_views_list(interim_conn)
-            jobs_plugins = {}
-            for view in publish_list:
-                if view in interim_views_list:
-                    cfg.table.add_row("View", view)
-                    interim_jobs_list = jutils.get_view_and_its_jobs(interim_conn)[view]
-                    for job in interim_jobs_list:
-                        chk_plugins = jbm.check_job_plugins_in_production_without_install(job)
-                        if chk_plugins:
-                            jobs_plugins[job] = chk_plugins
-                    cfg.table.add_row()
-            if mode == 'console': cfg.console.print(cfg.table)
-            return jobs_plugins
+        if mode == 'console': cfg.table.show()
+        return job_plugins
 
     except Exception as e:
         cfg.table.add_row("Check Plugin Dependencies", "Failed", str(e))
-        cfg.console.print(cfg.table)
+        cfg.table.show()
         return {}
 
 
-def check_and_install_plugin_dependencies(publish_list, ftype="job", mode="console"):
+def check_and_install_plugin_dependencies(publish_list, ftype="job", mode="console", batch=False, restart=False):
     """
     A function that checks and installs plugins required by jobs in a view or specified jobs
     in a Jenkins server. The function will print out the results in a table format. In "quiet" mode, the function will
@@ -278,12 +614,16 @@ def check_and_install_plugin_dependencies(publish_list, ftype="job", mode="conso
         - publish_list: A list of jobs or views to be checked for plugin dependencies.
         - ftype: A string indicating whether the publish_list contains jobs or views. Default is "job".
         - mode: A string indicating whether to print the results in the console or return them as a boolean. Default is "console".
+        - batch: If True, the missing plugins of all jobs are collected first and installed with a single request,
+                 instead of one install per plugin and job. Default is False.
+        - restart: Only used with batch. If True, production is safe-restarted once if the installs require it.
+                   Default is False.
     Returns:
         - bool: A boolean indicating whether all plugins were successfully installed.
     """
     try:
 
-        cfg.table = Table(show_lines=True, width=cfg.width)
+        cfg.table = jres.ResultSet()
         cfg.table.add_column("Check and Install Plugin Dependencies", style="cyan", no_wrap=True)
 
         production_conn = cfg.production_conn
@@ -304,31 +644,52 @@ def check_and_install_plugin_dependencies(publish_list, ftype="job", mode="conso
         if mode not in ('console', 'quiet'):
             raise TypeError("Invalid Mode Field! Mode = [console, quiet]")
 
+        jinv.reset_snapshot()
+
+        if batch:
+
+            if ftype == "job":
+                job_list = publish_list
+            else:
+                snapshot = jinv.get_snapshot()
+                interim_views_and_jobs = snapshot.interim.get_view_and_its_jobs()
+                job_list = []
+                for view in publish_list:
+                    for job in interim_views_and_jobs.get(view, []):
+                        if job not in job_list:
+                            job_list.append(job)
+
+            res = jbm.install_plugins_in_production_batch(job_list, restart=restart)
+
+            if mode == 'console': cfg.table.show()
+            return res
+
         if ftype == "job":
 
             for job in publish_list:
                 if not jbm.check_job_plugins_in_production(job):
                     res = False
 
-            if mode == 'console': cfg.console.print(cfg.table)
+            if mode == 'console': cfg.table.show()
             return res
 
         elif ftype == "view":
 
-            interim_views_list = jutils.get_views_list(interim_conn)
+            snapshot = jinv.get_snapshot()
+            interim_views_list = snapshot.interim.get_views_list()
             for view in publish_list:
                 if view in interim_views_list:
-                    interim_jobs_list = jutils.get_view_and_its_jobs(interim_conn)[view]
+                    interim_jobs_list = snapshot.interim.get_view_and_its_jobs()[view]
                     for job in interim_jobs_list:
                         if not jbm.check_job_plugins_in_production(job):
                             res = False
 
-            if mode == 'console': cfg.console.print(cfg.table)
+            if mode == 'console': cfg.table.show()
             return res
 
     except Exception as e:
         cfg.table.add_row("Check and Install Plugin Dependencies", "Failed", str(e))
-        cfg.console.print(cfg.table)
+        cfg.table.show()
         return False
 
 
@@ -345,7 +706,7 @@ def production_cleanup(mode='console'):
         interim_conn = cfg.interim_conn
         mode = cfg.mode = mode.lower()
 
-        cfg.table = Table(show_lines=True, width=cfg.width)
+        cfg.table = jres.ResultSet()
         cfg.table.add_column("Production CleanUp", style="cyan", no_wrap=True)
 
         if not production_conn or not interim_conn:
@@ -353,14 +714,16 @@ def production_cleanup(mode='console'):
         if mode not in ('console', 'quiet'):
             raise TypeError("Invalid Mode Field! Mode = [console, quiet]")
 
+        jinv.reset_snapshot()
+
         res = jbm.production_view_clean_up()
-        if mode == 'console': cfg.console.print(cfg.table)
+        if mode == 'console': cfg.table.show()
 
         return res
 
     except Exception as e:
         cfg.table.add_row("", "Exception (production_cleanup)", str(e))
-        cfg.console.print(cfg.table)
+        cfg.table.show()
         return False
 
 
@@ -379,7 +742,7 @@ def interim_cleanup(mode='console'):
         interim_conn = cfg.interim_conn
         mode = cfg.mode = mode.lower()
 
-        cfg.table = Table(show_lines=True, width=cfg.width)
+        cfg.table = jres.ResultSet()
         cfg.table.add_column("Production CleanUp", style="cyan", no_wrap=True)
 
         if not production_conn or not interim_conn:
@@ -387,17 +750,48 @@ def interim_cleanup(mode='console'):
         if mode not in ('console', 'quiet'):
             raise TypeError("Invalid Mode Field! Mode = [console, quiet]")
 
+        jinv.reset_snapshot()
+
         res = jbm.interim_view_clean_up()
-        if mode == 'console': cfg.console.print(cfg.table)
+        if mode == 'console': cfg.table.show()
 
         return res
 
     except Exception as e:
         cfg.table.add_row("", "Exception (interim_cleanup)", str(e))
-        cfg.console.print(cfg.table)
+        cfg.table.show()
         return False
 
 
+def get_results():
+    """
+    Returns the results of the last public function call.
+
+    Every job, view or plugin operation is recorded as a results.Result with its entity, kind, action, status,
+    error and timings, e.g. get_results().filter(kind="job", action="created") or get_results().failed().
+    The rich report printed in "console" mode is rendered from the same results.
+
+    Returns:
+        - results.ResultSet: The results, or None if no function was called yet.
+    """
+    return cfg.table if isinstance(cfg.table, jres.ResultSet) else None
+
+
+def get_plan():
+    """
+    Returns the plan of the last transfer, plan_transfer(), check_plugin_dependencies() or
+    check_publish_standards(). The transfer checked by check_publish_standards() is planned on this first call.
+
+    Returns:
+    - dict: The plan, see plan_transfer(); None if no transfer was planned yet.
+    """
+    try:
+        return jplan.last_plan()
+    except Exception as e:
+        print(e)
+        return None
+
+
 def set_console_size(width):
     """
     Sets the console width for the output of the functions.
@@ -414,4 +808,230 @@ def set_console_size(width):
     try:
         cfg.width = width
     except Exception as e:
-        print(e)
\ No newline at end of file
+        print(e)
+
+
+def set_max_workers(workers, per_server=None):
+    """
+    Sets the number of concurrent requests made against the Jenkins servers.
+
+    With the default of 1 every request is made one after another. Higher values fetch view configs
+    concurrently through a bounded thread pool.
+
+    Parameters:
+        - workers (int): The maximum number of concurrent requests per server.
+        - per_server (dict, optional): Server URL -> maximum number of concurrent requests, for servers
+                                       that need a lower limit than workers.
+
+    Returns:
+        - None
+
+    Raises:
+        - ValueError: If workers or a per-server limit is not a positive integer.
+    """
+    try:
+        per_server = per_server or {}
+        if not isinstance(workers, int) or workers < 1:
+            raise ValueError("Workers Must be a Positive Integer!")
+        for url, limit in per_server.items():
+            if not isinstance(limit, int) or limit < 1:
+                raise ValueError(f"Worker Limit for {url} Must be a Positive Integer!")
+        cfg.max_workers = workers
+        cfg.max_workers_per_server = {url.rstrip('/'): limit for url, limit in per_server.items()}
+    except Exception as e:
+        print(e)
+
+
+def set_folder_depth(depth):
+    """
+    Sets how many folder levels are walked when the jobs of a server are listed.
+
+    Jobs inside folders are known by their full name, e.g. "team/build", and their folders are created in
+    production when they are transferred. Sibling folders are walked concurrently, up to the limit from
+    set_max_workers.
+
+    Parameters:
+        - depth (int): The number of folder levels to walk, 0 for top-level jobs only, or None for every level.
+
+    Returns:
+        - None
+
+    Raises:
+        - ValueError: If depth is not None or a non-negative integer.
+    """
+    try:
+        if depth is not None and (not isinstance(depth, int) or depth < 0):
+            raise ValueError("Folder Depth Must be None or a Non-Negative Integer!")
+        cfg.folder_depth = depth
+    except Exception as e:
+        print(e)
+
+
+def set_analysis_processes(processes):
+    """
+    Sets the number of worker processes parsing job and view configs.
+
+    Configs are always fetched on threads, see set_max_workers. Parsing them is CPU-bound, so when hundreds of
+    configs are analyzed at once, e.g. the views of a server or every job for includeUpstream/includeDownstream,
+    they are parsed in a pool of this many processes. Scripts using more than one process must guard their entry
+    point with if __name__ == "__main__": on platforms that start processes by importing the script again.
+
+    Parameters:
+        - processes (int): The number of worker processes, 1 to parse in the calling process, or None for one per
+                           CPU.
+
+    Returns:
+        - None
+
+    Raises:
+        - ValueError: If processes is not None or a positive integer.
+    """
+    try:
+        if processes is None:
+            processes = os.cpu_count() or 1
+        if not isinstance(processes, int) or processes < 1:
+            raise ValueError("Processes Must be None or a Positive Integer!")
+        cfg.analysis_processes = processes
+    except Exception as e:
+        print(e)
+
+
+def set_inventory_backend(backend):
+    """
+    Sets how the jobs and views of a server, and the jobs in each view, are listed.
+
+    With "config", the default, every view is listed by reading its config.xml. With "tree", the job names, the
+    views and the jobs of every list view are read from a single tree API request; views of other types, e.g.
+    nested or dashboard views, are still read from their config.xml.
+
+    Parameters:
+        - backend (str): "config" or "tree".
+
+    Returns:
+        - None
+
+    Raises:
+        - ValueError: If backend is not "config" or "tree".
+    """
+    try:
+        if backend not in ('config', 'tree'):
+            raise ValueError("Invalid Inventory Backend! Backend = [config, tree]")
+        cfg.inventory_backend = backend
+    except Exception as e:
+        print(e)
+
+
+def set_ignore_rules(rules):
+    """
+    Sets the parts of job and view configs that are ignored when configs are compared.
+
+    Each rule is an XPath expression; the elements, attributes or text it selects are removed from
+    both configs before they are canonicalized, hashed or diffed.
+
+    Parameters:
+        - rules (list): XPath expressions, e.g. ["//description", "//@plugin"].
+
+    Returns:
+        - None
+
+    Raises:
+        - ValueError: If a rule is not a valid XPath expression.
+    """
+    try:
+        if not isinstance(rules, list):
+            raise TypeError("Rules Must be a List!")
+        jcanon.validate_rules(rules)
+        cfg.ignore_rules = list(rules)
+    except Exception as e:
+        print(e)
+
+
+def set_update_center(source, ttl=86400, cache_dir=None):
+    """
+    Sets the update-center index plugin dependencies are resolved from.
+
+    With an update center set, the plugins needed by the missing plugins of a job, directly or through other
+    plugins, are worked out from the index: they are reported by check_plugin_dependencies and installed in the
+    same request as the plugins needing them, so installs do not have to be retried. Without one, the dependencies
+    are left to the update center of production.
+
+    Parameters:
+        - source (str): A local update-center JSON file, or the URL of one, e.g.
+                        "https://updates.jenkins.io/current/update-center.actual.json". None unsets the update center.
+        - ttl (int, optional): Seconds a downloaded index is cached on disk before it is downloaded again.
+                               Defaults to one day.
+        - cache_dir (str, optional): The directory downloaded indexes are cached in. Defaults to
+                                     ~/.cache/jenkins_job_transfers.
+
+    Returns:
+        - None
+
+    Raises:
+        - ValueError: If ttl is not a non-negative integer, or the index cannot be loaded.
+    """
+    try:
+        if source is None:
+            cfg.update_center = cfg.update_center_index = None
+            return
+        if not isinstance(source, str):
+            raise TypeError("Source Must be a String!")
+        if not isinstance(ttl, int) or ttl < 0:
+            raise ValueError("TTL Must be a Non-Negative Integer!")
+        index = jupdates.load_index(source, ttl, cache_dir)
+        cfg.update_center = source
+        cfg.update_center_ttl = ttl
+        cfg.update_center_cache_dir = cache_dir
+        cfg.update_center_index = index
+    except Exception as e:
+        print(e)
+
+
+def resolve_plugin_dependencies(plugin_names, mode="console"):
+    """
+    Works out, from the update center set with set_update_center, the plugins to install in production so that
+    the given plugins and every plugin they need are installed, without installing anything.
+
+    Parameters:
+        - plugin_names (list): Short names of the plugins needed.
+        - mode (str): The mode of the function. It can either be "console" or "quiet".
+
+    Returns:
+        - dict: 'install', the plugins to install, each after the plugins it needs, and 'unavailable', the plugins
+                the update center cannot provide. Empty if the dependencies could not be resolved.
+    """
+    try:
+
+        cfg.table = jres.ResultSet()
+        cfg.table.add_column("Resolve Plugin Dependencies", style="cyan", no_wrap=True)
+
+        mode = cfg.mode = mode.lower()
+
+        if not cfg.production_conn:
+            raise ValueError("Connection Not Established!")
+        if not isinstance(plugin_names, list):
+            raise TypeError("Plugin Names Must be a List!")
+        if mode not in ('console', 'quiet'):
+            raise TypeError("Invalid Mode Field! Mode = [console, quiet]")
+
+        index = jupdates.get_index()
+        if index is None:
+            raise ValueError("Update Center Not Set!")
+
+        jinv.reset_snapshot()
+        production_plugins = jinv.get_snapshot().production.get_plugin_versions()
+        if production_plugins is None:
+            raise ValueError("Plugin List NOT RETRIEVED")
+
+        to_install, unavailable = jupdates.install_set(plugin_names, index, production_plugins)
+        cfg.table.add_row("Plugins", str(plugin_names))
+        cfg.table.add_row("", "Plugins to be INSTALLED", str(to_install))
+        if unavailable:
+            cfg.table.add_row("", "NOT AVAILABLE in Update Center", str(unavailable))
+
+        if mode == 'console': cfg.table.show()
+        return {'install': to_install, 'unavailable': unavailable}
+
+    except Exception as e:
+        cfg.table.add_row("Resolve Plugin Dependencies", "Failed", str(e))
+        cfg.table.show()
+        return {}
@@ -0,0 +1,94 @@
+"""
+
+Summary - Analysis of raw job and view configs into compact results: the plugins and triggers of jobs, and the jobs
+          of views.
+
+Configs are fetched on threads; parsing them is CPU-bound, so with set_analysis_processes the analysis of many configs
+runs in a process pool. Only the config bytes go to the worker processes and only the compact results come back.
+
+"""
+
+from . import config as cfg
+from . import graph as jgraph
+from .lazy import lazy_import
+
+etree = lazy_import('lxml.etree')
+futures = lazy_import('concurrent.futures')
+
+# Below this many configs starting the worker processes costs more than it saves
+POOL_MIN_CONFIGS = 200
+
+# Chunks per worker process, so workers that finish early pick up more of the configs
+CHUNKS_PER_PROCESS = 4
+
+
+def analyze_job_config(data):
+    """
+    Analyze a job config.
+
+    Args:
+        data (bytes): The config XML.
+
+    Returns:
+        dict: 'plugins', the plugin attributes in document order, e.g. "git@5.2.1", and the names of the
+              'downstream' and 'upstream' jobs as written in the config, see graph.get_trigger_names; None if the
+              XML is not well-formed.
+    """
+    try:
+        tree = etree.fromstring(data)
+    except etree.XMLSyntaxError:
+        return None
+    downstream, upstream = jgraph.get_trigger_names(tree)
+    return {
+        'plugins': tuple(str(plugin) for plugin in tree.xpath('//@plugin') if plugin),
+        'downstream': downstream,
+        'upstream': upstream,
+    }
+
+
+def analyze_view_config(data):
+    """
+    Analyze a view config.
+
+    Args:
+        data (bytes): The config XML.
+
+    Returns:
+        list: The names of the jobs listed in the view, or None if the XML is not well-formed.
+    """
+    try:
+        tree = etree.fromstring(data)
+    except etree.XMLSyntaxError:
+        return None
+    return [str(name) for name in tree.xpath('//jobNames/string/text()')]
+
+
+def analyze(func, configs):
+    """
+    Apply analyze_job_config or analyze_view_config to every config.
+
+    With cfg.analysis_processes above 1 and at least POOL_MIN_CONFIGS configs, the configs are analyzed in a pool of
+    that many processes, else one after another in this process.
+
+    Args:
+        func: analyze_job_config or analyze_view_config.
+        configs (list): The config XMLs, as str or bytes; None for configs that were not retrieved.
+
+    Returns:
+        list: The results of func in the order of configs, None for the configs that are None.
+    """
+    data = [config.encode('utf-8') if isinstance(config, str) else config for config in configs]
+    indexes = [index for index, config in enumerate(data) if config]
+    processes = min(cfg.analysis_processes, len(indexes))
+
+    if processes > 1 and len(indexes) >= POOL_MIN_CONFIGS:
+        chunksize = max(1, len(indexes) // (processes * CHUNKS_PER_PROCESS))
+        with futures.ProcessPoolExecutor(max_workers=processes) as executor:
+            analyzed = list(executor.map(func, [data[index] for index in indexes], chunksize=chunksize))
+    else:
+        analyzed = [func(data[index]) for index in indexes]
+
+    results = [None] * len(data)
+    for index, result in zip(indexes, analyzed):
+        results[index] = result
+    return results
@@ -6,11 +6,29 @@ Created On - 12-03-2024
 
 """
 
-import jenkins
-from lxml import etree
+import collections
+import hashlib
 import json
+import threading
+import time
 from . import utils as jutils
 from . import config as cfg
+from . import inventory as jinv
+from . import events as jevents
+from . import results as jres
+from . import updatecenter as jupdates
+from . import plan as jplan
+from .lazy import lazy_import
+
+jenkins = lazy_import('jenkins')
+etree = lazy_import('lxml.etree')
+
+# Workers checking job plugins share the plugin diff; plugins are installed one worker at a time
+_plugins_lock = threading.Lock()
+
+# Plugin references of the configs read lately, by the SHA-256 of the config, least recently used first
+_plugin_cache = collections.OrderedDict()
+_plugin_cache_lock = threading.Lock()
 
 
 def establish_connection_to_servers(production_url, interim_url, production_username, interim_username,
@@ -49,14 +67,20 @@ def install_plugin_in_production(to_install_plugins_list):
     try:
         production_conn = cfg.production_conn
         flag_installed = []
+        installed = []
         for plugin in to_install_plugins_list:
+            started = time.time()
             try:
-                cfg.table.add_row("", plugin, "Installing Plugin")
                 flag_installed.append(production_conn.install_plugin(plugin))
+                installed.append(plugin)
+                jres.record(plugin, 'plugin', 'installed', started=started)
             except Exception as e:
-                cfg.table.add_row("", plugin, "Installation Failed", str(e))
+                jres.record(plugin, 'plugin', 'installed', jres.FAILED, str(e), started)
 
                 flag_installed.append(False)
+        # The cached plugin differences only go stale when something was actually installed
+        if installed:
+            jinv.get_snapshot().plugins_installed()
         if False in flag_installed:
             return False
         else:
@@ -68,6 +92,9 @@ def install_plugin_in_production(to_install_plugins_list):
 def plugin_differences():
     """
     Calculate the differences in plugins between two database connections.
+
+    The differences are computed once per snapshot and reused until plugins are installed in production.
+
     :return: A list of plugins that are in the interim database but not in the production database.
     """
     try:
@@ -77,7 +104,7 @@ def plugin_differences():
         if not production_conn or not interim_conn:
             raise ValueError("Either production_conn or interim_conn is None.")
 
-        return list(set(jutils.get_plugin_list(interim_conn)).difference(jutils.get_plugin_list(production_conn)))
+        return jinv.get_snapshot().plugin_differences()
     except Exception as e:
         cfg.table.add_row("", "", "Exception (plugin_differences)", str(e))
 
@@ -94,7 +121,6 @@ def check_job_plugins_in_production(job):
     """
     try:
         interim_conn = cfg.interim_conn
-        plugins_to_install_production = plugin_differences()
 
         config_xml = jutils.get_config_xml(interim_conn, job)
 
@@ -107,18 +133,21 @@ def check_job_plugins_in_production(job):
         
         job_specific_plugins = get_job_specific_plugins(
             config_xml)  # returns a list of jobs required for a particular job in interim
-        plugins_to_install = list(set(plugins_to_install_production) & set(job_specific_plugins))
-        if len(plugins_to_install) != 0:
-            chk_flag = install_plugin_in_production(plugins_to_install)
-            if chk_flag:
-                cfg.table.add_row("", "SUCCESS", "Install Initiated")
-                return True
+        with _plugins_lock:
+            plugins_to_install_production = plugin_differences()
+            plugins_to_install = list(set(plugins_to_install_production) & set(job_specific_plugins))
+            if len(plugins_to_install) != 0:
+                production_plugins = jinv.get_snapshot().production.get_plugin_versions() or {}
+                chk_flag = install_plugin_in_production(plugins_to_deploy(plugins_to_install, production_plugins))
+                if chk_flag:
+                    cfg.table.add_row("", "SUCCESS", "Install Initiated")
+                    return True
+                else:
+                    cfg.table.add_row("", "SUCCESS", "Restart Production Server")
+                    return False
             else:
-                cfg.table.add_row("", "SUCCESS", "Restart Production Server")
-                return False
-        else:
-            cfg.table.add_row("", "SUCCESS", "All Plugins Installed")
-            return True
+                cfg.table.add_row("", "SUCCESS", "All Plugins Installed")
+                return True
     except Exception as e:
         cfg.table.add_row("Plugin Check", "Failed", "Exception", str(e))
         return False
@@ -137,7 +166,7 @@ def check_job_plugins_in_production_without_install(job):
     try:
 
         interim_conn = cfg.interim_conn
-        jobs_in_interim = jutils.get_job_list(interim_conn)
+        jobs_in_interim = jinv.get_snapshot().interim.get_job_list()
 
         # Check if the Job is Present in the Interim Server
         if job not in jobs_in_interim:
@@ -161,6 +190,207 @@ def check_job_plugins_in_production_without_install(job):
         return []
 
 
+def install_plugins_in_production_batch(job_name_list, restart=False):
+    """
+    Installs the plugins missing in production for a whole list of jobs at once.
+
+    The missing plugins of every job are collected first and installed with a single script console
+    request. The update center is then polled until the installs are done, and production is restarted
+    at most once, only if restart is True and Jenkins needs it to complete the installs.
+
+    Args:
+        job_name_list (list): The jobs whose plugins are checked and installed.
+        restart (bool): Whether to safe-restart production if the installs require it.
+
+    Returns:
+        bool: True if all plugins were successfully installed, False otherwise.
+    """
+    try:
+        production_conn = cfg.production_conn
+        interim_conn = cfg.interim_conn
+        res = True
+
+        configs = jutils.map_concurrently(interim_conn, lambda job: jutils.get_config_xml(interim_conn, job),
+                                          job_name_list)
+        plugins_to_install_production = set(plugin_differences())
+
+        to_install = set()
+        for job, config_xml in zip(job_name_list, configs):
+            cfg.table.add_row("Plugin Check", job)
+            if not config_xml:
+                cfg.table.add_row("", "FAILED", "Job Not Present in Interim Server")
+                res = False
+                continue
+            plugins_to_install = plugins_to_install_production & set(get_job_specific_plugins(config_xml) or [])
+            if plugins_to_install:
+                cfg.table.add_row("", "Plugins to be INSTALLED", str(sorted(plugins_to_install)))
+                to_install |= plugins_to_install
+            else:
+                cfg.table.add_row("", "SUCCESS", "All Plugins Installed")
+
+        if not to_install:
+            return res
+
+        cfg.table.add_row("Batch Install", str(sorted(to_install)), "Installing Plugins")
+        started = time.time()
+        production_plugins = jinv.get_snapshot().production.get_plugin_versions() or {}
+        deploying, not_found = jutils.install_plugins(production_conn,
+                                                      plugins_to_deploy(sorted(to_install), production_plugins))
+        for plugin in not_found:
+            jres.record(plugin, 'plugin', 'installed', jres.FAILED, "Not Found in Update Center", started)
+            res = False
+
+        if deploying:
+            status = jutils.wait_for_plugin_installs(production_conn)
+            jinv.get_snapshot().plugins_installed()
+
+            for plugin in deploying:
+                if plugin in status['failed']:
+                    jres.record(plugin, 'plugin', 'installed', jres.FAILED, str(status['failed'][plugin]), started)
+                    res = False
+                elif not status['timed_out']:
+                    jres.record(plugin, 'plugin', 'installed', started=started)
+            if status['timed_out']:
+                cfg.table.add_row("", "FAILED", "Installation Timed Out")
+                res = False
+
+            if status['restart_required']:
+                if restart:
+                    cfg.table.add_row("", "Restarting Production Server")
+                    if jutils.safe_restart(production_conn):
+                        cfg.table.add_row("", "SUCCESS", "Production Server Restarted")
+                    else:
+                        cfg.table.add_row("", "FAILED", "Production Server NOT Back After Restart")
+                        res = False
+                else:
+                    cfg.table.add_row("", "SUCCESS", "Restart Production Server")
+                    res = False
+            elif res:
+                cfg.table.add_row("", "SUCCESS", "Plugins Installed")
+
+        return res
+
+    except Exception as e:
+        cfg.table.add_row("Batch Install", "Failed", "Exception", str(e))
+        return False
+
+
+def get_plugin_references(config_xml, references=None):
+    """
+    Get the plugin attributes of a config, e.g. "git@5.2.1", in document order.
+
+    The config is streamed through a SAX-style parser target that only keeps the attributes, so large pipeline
+    configs are never built into a tree. Results are memoized by the SHA-256 of the config in an LRU of
+    cfg.plugin_cache_size entries, so a config read by several checks of a run is parsed once.
+
+    Parameters:
+    - config_xml (str): The XML configuration.
+    - references (tuple, optional): The plugin attributes of the config when they are already known, e.g. from
+                                    analysis.analyze_job_config; they are memoized instead of parsing the config.
+
+    Returns:
+    - tuple: The plugin attribute values, once per referencing element, or None if the XML is not well-formed.
+    """
+    data = config_xml.encode('utf-8') if isinstance(config_xml, str) else config_xml
+    key = hashlib.sha256(data).digest()
+    with _plugin_cache_lock:
+        if key in _plugin_cache:
+            _plugin_cache.move_to_end(key)
+            return _plugin_cache[key]
+
+    if references is None:
+        references = _stream_plugin_references(data)
+
+    with _plugin_cache_lock:
+        _plugin_cache[key] = references
+        while len(_plugin_cache) > cfg.plugin_cache_size:
+            _plugin_cache.popitem(last=False)
+    return references
+
+
+class _PluginReferences:
+    """
+    Parser target collecting plugin attributes as elements start; no tree is built.
+    """
+
+    def __init__(self):
+        self.references = []
+
+    def start(self, tag, attrib):
+        plugin = attrib.get('plugin')
+        if plugin:
+            self.references.append(plugin)
+
+    def close(self):
+        return tuple(self.references)
+
+
+def _stream_plugin_references(data):
+    try:
+        return etree.fromstring(data, etree.XMLParser(target=_PluginReferences(), remove_comments=True))
+    except etree.XMLSyntaxError as e:
+        print(f"Error parsing XML: {e}")
+        return None
+
+
+def get_job_plugin_versions(config_xml, references=None):
+    """
+    Get the plugins referenced by a config with the versions they were saved with, see get_plugin_references.
+
+    Parameters:
+    - config_xml (str): The XML configuration.
+    - references (tuple, optional): The plugin attributes of the config when they are already known.
+
+    Returns:
+    - dict: The plugin names as keys and the highest version referenced as values, None for references without
+            a version; None if the XML is not well-formed.
+    """
+    references = get_plugin_references(config_xml, references)
+    if references is None:
+        return None
+    versions = {}
+    for reference in references:
+        name, _, version = reference.partition('@')
+        version = version or None
+        if name not in versions or (version is not None and (
+                versions[name] is None or jupdates.compare_versions(version, versions[name]) > 0)):
+            versions[name] = version
+    return versions
+
+
+def compare_plugin_versions(required, installed, cache=None):
+    """
+    Compare the plugin versions a job was saved with against the versions installed in production.
+
+    Parameters:
+    - required (dict): The plugins of the job with their versions, see get_job_plugin_versions.
+    - installed (dict): The plugins installed in production with their versions.
+    - cache (dict, optional): The result for each plugin version already compared, shared by the jobs of a run
+                              so every distinct plugin version is compared once.
+
+    Returns:
+    - dict: 'missing', the plugins not installed, and 'older' and 'newer', the plugins installed in an older or
+            newer version than the job was saved with, each with the installed version.
+    """
+    cache = {} if cache is None else cache
+    status = {'missing': [], 'older': {}, 'newer': {}}
+    for name, version in sorted(required.items()):
+        key = (name, version)
+        if key not in cache:
+            if name not in installed:
+                cache[key] = 'missing'
+            elif version is None or installed[name] is None:
+                cache[key] = None
+            else:
+                compared = jupdates.compare_versions(installed[name], version)
+                cache[key] = 'older' if compared < 0 else 'newer' if compared > 0 else None
+        if cache[key] == 'missing':
+            status['missing'].append(name)
+        elif cache[key] is not None:
+            status[cache[key]][name] = installed[name]
+    return status
+
+
 def get_job_specific_plugins(config_xml):
     """
     Get job specific plugins from the given config XML.
@@ -173,81 +403,86 @@ def get_job_specific_plugins(config_xml):
     """
 
     try:
-        plugin_names = []
-        try:
-            tree = etree.fromstring(config_xml.encode())
-        except etree.XMLSyntaxError as e:
-            print(f"Error parsing XML: {e}")
+        references = get_plugin_references(config_xml)
+        if references is None:
             return None
-        except Exception as e:
-            print(f"Unexpected error: {e}")
-            return []
-
-        plugin_elements = tree.xpath('//*[@plugin]')
-        for plugin_attr in plugin_elements:
-            plugin_name = plugin_attr.attrib['plugin'].split('@')[0]  # Get Name w/o Version
-            plugin_names.append(plugin_name)
-
-        return plugin_names
+        return [reference.split('@')[0] for reference in references]
     except Exception as e:
         print("Error in get_job_specific_plugins: ", e)
+        return []
 
 
-def check_views(job_to_update, view_to_update='throughall'):
+def affected_views(job_to_update, view_to_update='throughall'):
     """
-    A function to check and update views in production based on jobs and views in interim connection.
+    A function to find the views in production that have to be updated or created for a job, based on the
+    jobs and views in the interim connection.
 
     Parameters:
-    - production_conn: Connection to the production environment.
-    - interim_conn: Connection to the interim environment.
-    - job_to_update: Job to be updated.
-    - view_to_update: The view to be updated (default is 'throughall').
+    - job_to_update: Job that was updated.
+    - view_to_update: The only view to consider (default is 'throughall', which considers every view).
+
+    Returns:
+    list: The names of the views to reconcile.
+    """
+    snapshot = jinv.get_snapshot()
+    interim_specific_views_and_jobs = snapshot.interim.get_view_and_its_jobs()
+
+    # Only the views containing the job in either server can be affected
+    candidates = snapshot.interim.get_job_views().get(job_to_update, set()) | \
+        snapshot.production.get_job_views().get(job_to_update, set())
+    if view_to_update != 'throughall':
+        candidates = candidates & {view_to_update}
+
+    # A candidate present in production contains the job there, so it is updated; a candidate missing in
+    # production contains the job in interim, so it is created
+    return [view for view in sorted(candidates) if view in interim_specific_views_and_jobs]
+
+
+def reconcile_views(view_names):
+    """
+    A function to update or create views in production with their config from the interim connection.
+
+    Each view is written once, however many of its jobs were transferred; the views are written concurrently,
+    bounded by the transfer workers.
+
+    Parameters:
+    - view_names: The names of the views to update or create, see affected_views.
 
     Returns:
     None
     """
-    try:
-        production_conn = cfg.production_conn
-        interim_conn = cfg.interim_conn
+    production_conn = cfg.production_conn
+    interim_conn = cfg.interim_conn
+    production_specific_views_and_jobs = jinv.get_snapshot().production.get_view_and_its_jobs()
 
-        # Get Views
-        interim_specific_views_and_jobs = jutils.get_view_and_its_jobs(interim_conn)
-        # print('Interim Jobs and Views', interim_specific_views_and_jobs)
-        production_specific_views_and_jobs = jutils.get_view_and_its_jobs(production_conn)
-        # print('Production Jobs and Views', production_specific_views_and_jobs)
+    def reconcile(view):
+        config_xml = jutils.get_view_config_xml(interim_conn, view)
+        if not config_xml:
+            jres.record(view, 'view', 'published', jres.FAILED, "config.xml NOT RETRIEVED in Interim Server")
+            jevents.emit(jevents.FAILED, 'view', view, "config.xml NOT RETRIEVED in Interim Server")
+            return
+        jevents.emit(jevents.FETCHED, 'view', view)
+        if view in production_specific_views_and_jobs.keys():
+            jutils.update_view(view, config_xml)
+        else:
+            jutils.create_view(view, config_xml)
 
-        for view, jobs in interim_specific_views_and_jobs.items():
+    jutils.map_concurrently(production_conn, reconcile, view_names, workers=cfg.transfer_workers)
 
-            # the below if condition is to narrow down the update/create operations
 
-            if job_to_update in jobs and view_to_update == 'throughall' or job_to_update in \
-                    production_specific_views_and_jobs.get(view, '') and view_to_update == 'throughall':
-                if view in production_specific_views_and_jobs.keys():  # update view if present!
-                    if job_to_update in jobs or production_specific_views_and_jobs[view]:
-                        # now check if the view exists, else create one!
-                        config_xml = jutils.get_view_config_xml(interim_conn, view)
-                        if config_xml:
-                            jutils.update_view(view, config_xml)
-                else:
-                    if job_to_update in jobs:  # create view if not present!
-                        config_xml = jutils.get_view_config_xml(interim_conn, view)
-                        if config_xml:
-                            jutils.create_view(view, config_xml)
-
-            elif job_to_update in jobs and view_to_update == view or job_to_update in production_specific_views_and_jobs.get(
-                    view, '') and view_to_update == view:
-                if view in production_specific_views_and_jobs.keys():
-                    if job_to_update in jobs or production_specific_views_and_jobs[view]:
-                        # now check if the view exists, else create one!
-                        config_xml = jutils.get_view_config_xml(interim_conn, view)
-                        if config_xml:
-                            jutils.update_view(view, config_xml)
-                else:
-                    if job_to_update in jobs:
-                        config_xml = jutils.get_view_config_xml(interim_conn, view)
-                        if config_xml:
-                            jutils.create_view(view, config_xml)
+def check_views(job_to_update, view_to_update='throughall'):
+    """
+    A function to check and update views in production based on jobs and views in interim connection.
 
+    Parameters:
+    - job_to_update: Job to be updated.
+    - view_to_update: The view to be updated (default is 'throughall').
+
+    Returns:
+    None
+    """
+    try:
+        reconcile_views(affected_views(job_to_update, view_to_update))
     except Exception as e:
         print("Error in check_views: ", e)
 
@@ -259,11 +494,14 @@ def production_view_clean_up():
     try:
 
         production_conn = cfg.production_conn
-        production_specific_views_and_jobs = jutils.get_view_and_its_jobs(production_conn)
+        production_inventory = jinv.get_snapshot().production
+        production_specific_views_and_jobs = production_inventory.get_view_and_its_jobs()
         for view, jobs in production_specific_views_and_jobs.items():
             if len(jobs) == 0:
+                started = time.time()
                 production_conn.delete_view(view)
-                cfg.table.add_row("", view, "Deleted")
+                production_inventory.view_deleted(view)
+                jres.record(view, 'view', 'deleted', started=started)
         cfg.table.add_row("Production CleanUp", "Success")
         return True
 
@@ -279,11 +517,14 @@ def interim_view_clean_up():
     try:
 
         interim_conn = cfg.interim_conn
-        interim_specific_views_and_jobs = jutils.get_view_and_its_jobs(interim_conn)
+        interim_inventory = jinv.get_snapshot().interim
+        interim_specific_views_and_jobs = interim_inventory.get_view_and_its_jobs()
         for view, jobs in interim_specific_views_and_jobs.items():
             if len(jobs) == 0:
+                started = time.time()
                 interim_conn.delete_view(view)
-                cfg.table.add_row("", view, "Deleted")
+                interim_inventory.view_deleted(view)
+                jres.record(view, 'view', 'deleted', started=started)
         cfg.table.add_row("Production CleanUp", "Success")
         return True
 
@@ -308,13 +549,13 @@ def chk_publish_job_standards(job_to_update):
         interim_conn = cfg.interim_conn
         allowDuplicates = cfg.allowDuplicates
 
-        view_list = []
-        interim_specific_views_and_jobs = jutils.get_view_and_its_jobs(interim_conn)
-        production_specific_views_and_jobs = jutils.get_view_and_its_jobs(production_conn)
+        snapshot = jinv.get_snapshot()
+        interim_specific_views_and_jobs = snapshot.interim.get_view_and_its_jobs()
 
-        for view, jobs in interim_specific_views_and_jobs.items():
-            if job_to_update in jobs or job_to_update in production_specific_views_and_jobs.get(view, ''):
-                view_list.append(view)
+        # Views of interim containing the job in interim, or in production
+        views = snapshot.interim.get_job_views().get(job_to_update, set()) | \
+            snapshot.production.get_job_views().get(job_to_update, set())
+        view_list = [view for view in sorted(views) if view in interim_specific_views_and_jobs]
 
         if len(view_list) == 1:
             cfg.table.add_row("", job_to_update, "Present in View", str(view_list))
@@ -335,6 +576,129 @@ def chk_publish_job_standards(job_to_update):
         return False
 
 
+def compare_configs(interim_names, production_names, fetch):
+    """
+    Compare the configs of the entities of both servers by content hash.
+
+    Configs are fetched concurrently, bounded by the worker limit of each server, and only their hashes are
+    kept, so comparing thousands of jobs does not hold thousands of configs in memory.
+
+    Parameters:
+    - interim_names (list): The names of the entities in the interim server.
+    - production_names (list): The names of the entities in the production server.
+    - fetch: A callable taking a connection and a name and returning the config, or None, e.g. jutils.get_config_xml.
+
+    Returns:
+    dict: 'missing' (only in interim), 'extra' (only in production), 'changed' and 'identical' lists of names.
+          Entities whose config could not be retrieved from either server are reported as changed.
+    """
+    production_conn = cfg.production_conn
+    interim_conn = cfg.interim_conn
+
+    production_set = set(production_names)
+    interim_set = set(interim_names)
+    common = [name for name in interim_names if name in production_set]
+
+    def hashes(conn):
+        def get_hash(name):
+            config_xml = fetch(conn, name)
+            return jutils.config_hash(config_xml) if config_xml is not None else None
+        return jutils.map_concurrently(conn, get_hash, common)
+
+    interim_hashes = hashes(interim_conn)
+    production_hashes = hashes(production_conn)
+
+    result = {
+        'missing': [name for name in interim_names if name not in production_set],
+        'extra': [name for name in production_names if name not in interim_set],
+        'changed': [],
+        'identical': [],
+    }
+    for name, interim_hash, production_hash in zip(common, interim_hashes, production_hashes):
+        if interim_hash is not None and interim_hash == production_hash:
+            result['identical'].append(name)
+        else:
+            result['changed'].append(name)
+    return result
+
+
+def compare_plugins():
+    """
+    Compare the installed plugins of both servers by version.
+
+    Returns:
+    dict: 'missing' (only in interim), 'extra' (only in production), 'changed' and 'identical' lists of plugin
+          short names, and 'versions' mapping each changed plugin to its (production, interim) versions.
+    """
+    snapshot = jinv.get_snapshot()
+    interim_versions = snapshot.interim.get_plugin_versions()
+    production_versions = snapshot.production.get_plugin_versions()
+    if interim_versions is None or production_versions is None:
+        raise ValueError("Plugin List NOT RETRIEVED")
+
+    result = {'missing': [], 'extra': [], 'changed': [], 'identical': [], 'versions': {}}
+    for plugin, version in sorted(interim_versions.items()):
+        if plugin not in production_versions:
+            result['missing'].append(plugin)
+        elif production_versions[plugin] != version:
+            result['changed'].append(plugin)
+            result['versions'][plugin] = (production_versions[plugin], version)
+        else:
+            result['identical'].append(plugin)
+    result['extra'] = sorted(plugin for plugin in production_versions if plugin not in interim_versions)
+    return result
+
+
+def server_drift():
+    """
+    Compare the whole interim and production servers: every job and view config by content hash, and every
+    plugin by version.
+
+    Returns:
+    dict: 'jobs', 'views' and 'plugins', each as returned by compare_configs/compare_plugins, or None on failure.
+    """
+    try:
+        snapshot = jinv.get_snapshot()
+
+        interim_jobs_list = snapshot.interim.get_job_list()
+        production_jobs_list = snapshot.production.get_job_list()
+        interim_views_list = snapshot.interim.get_views_list()
+        production_views_list = snapshot.production.get_views_list()
+        if interim_jobs_list is None or production_jobs_list is None:
+            raise ValueError("Job List NOT RETRIEVED")
+        if interim_views_list is None or production_views_list is None:
+            raise ValueError("Views List NOT RETRIEVED")
+
+        report = {
+            'jobs': compare_configs(interim_jobs_list, production_jobs_list, jutils.get_config_xml),
+            'views': compare_configs([view for view in interim_views_list if view != 'all'],
+                                     [view for view in production_views_list if view != 'all'],
+                                     jutils.get_view_config_xml),
+            'plugins': compare_plugins(),
+        }
+
+        for kind, label in (('jobs', 'Job'), ('views', 'View'), ('plugins', 'Plugin')):
+            drift = report[kind]
+            cfg.table.add_row(label + "s", f"Missing: {len(drift['missing'])}", f"Extra: {len(drift['extra'])}",
+                              f"Changed: {len(drift['changed'])}", f"Identical: {len(drift['identical'])}")
+            for name in drift['missing']:
+                cfg.table.add_row("", name, label, "Missing in Production")
+            for name in drift['extra']:
+                cfg.table.add_row("", name, label, "Extra in Production")
+            for name in drift['changed']:
+                if kind == 'plugins':
+                    cfg.table.add_row("", name, label, "Changed", "%s -> %s" % drift['versions'][name])
+                else:
+                    cfg.table.add_row("", name, label, "Changed")
+            cfg.table.add_section()
+
+        return report
+
+    except Exception as e:
+        cfg.table.add_row("", "server_drift()", "Exception", str(e))
+        return None
+
+
 def view_pre_check(views_name_list):
     """
     A function that performs pre-checks on a list of views by checking their associated jobs against publish job standards.
@@ -347,8 +711,7 @@ def view_pre_check(views_name_list):
     """
     try:
         cfg.table.add_row('View Pre Check')
-        interim_conn = cfg.interim_conn
-        interim_specific_views_and_jobs = jutils.get_view_and_its_jobs(interim_conn)
+        interim_specific_views_and_jobs = jinv.get_snapshot().interim.get_view_and_its_jobs()
         flag = False
         for view in views_name_list:
             for job in interim_specific_views_and_jobs[view]:
@@ -440,7 +803,7 @@ def pre_check(list_name, action):
             job_list = []
             if view_pre_check(view_name_list):
                 for view in view_name_list:
-                    for job in jutils.get_view_and_its_jobs(interim_conn)[view]:
+                    for job in jinv.get_snapshot().interim.get_view_and_its_jobs()[view]:
                         job_list.append(job)
                         config_xml = jutils.get_config_xml(interim_conn, job)
                         if config_xml:
@@ -473,125 +836,126 @@ def pre_check(list_name, action):
 
 
 def transfer_jobs(job_name_list):
-    try:
-        production_conn = cfg.production_conn
-        interim_conn = cfg.interim_conn
-        allow_duplicates = cfg.allowDuplicates
-
-        # Performing Pre-Check here, ensuring that there are no duplicate jobs present!
-        if not allow_duplicates:
-            if not job_pre_check(job_name_list):
-                raise ValueError('Error: Duplicate Job(s) present')
-
-        interim_jobs_list = jutils.get_job_list(interim_conn)
-        production_jobs_list = jutils.get_job_list(production_conn)
-
-        # Update Specific Jobs
-        if len(job_name_list) != 0:
-            for job in job_name_list:
-                if job in interim_jobs_list:
-                    config_xml = jutils.get_config_xml(interim_conn, job)
-                    if config_xml:
-
-                        job_specific_plugins_exist = check_job_plugins_in_production(job)
-
-                        if job_specific_plugins_exist:
-
-                            cfg.table.add_row("Publishing Details", "Name", "Type", "Status", "Action")
-                            if job in production_jobs_list:
-                                jutils.update_job(job, config_xml)
-                            else:
-                                jutils.create_job(job, config_xml)
-                            check_views(job)
-
-                        else:
-                            cfg.table.add_row("", "", "Error", "Job Specific Plugin NOT INSTALLED in Production Server")
-                    else:
-                        cfg.table.add_row("", "", "Error", f"{job}'s config.xml NOT RETRIEVED in Interim Server")
-                else:
-                    cfg.table.add_row("", "", "Error", f"{job} DOES NOT Exist in Interim Server")
-                    if job in production_jobs_list:
-                        jutils.delete_job(job)
-
-        else:
-            cfg.table.add_row("", "", "Error", "Enter Job Details to Move/Update")
-            return False
+    """
+    Transfers jobs to production: the transfer is planned against the inventory snapshot, then the plan is
+    executed, see plan.build_plan and plan.execute_plan.
 
-        production_view_clean_up()
-        return True
+    Parameters:
+    - job_name_list (list): The names of the jobs to transfer.
 
+    Returns:
+    - bool: True if the plan was applied, False otherwise; failed jobs/views are in cfg.table.
+    """
+    try:
+        plan = jplan.remember(jplan.build_plan(job_name_list, 'job', check=not cfg.allowDuplicates))
+        return jplan.execute_plan(plan)
     except Exception as e:
         cfg.table.add_row("Transfer Status", "Failed", str(e))
+        jevents.emit(jevents.FAILED, detail=str(e))
         return False
 
 
 def transfer_views(views_name_list):
+    """
+    Transfers views and their jobs to production the same way as transfer_jobs.
+
+    Parameters:
+    - views_name_list (list): The names of the views to transfer.
+
+    Returns:
+    - bool: True if the plan was applied, False otherwise; failed jobs/views are in cfg.table.
+    """
     try:
+        plan = jplan.remember(jplan.build_plan(views_name_list, 'view', check=not cfg.allowDuplicates))
+        return jplan.execute_plan(plan)
+    except Exception as e:
+        cfg.table.add_row("Transfer Status", "Failed", str(e))
+        jevents.emit(jevents.FAILED, detail=str(e))
+        return False
 
-        production_conn = cfg.production_conn
-        interim_conn = cfg.interim_conn
-        allow_duplicates = cfg.allowDuplicates
-
-        job = ''
-        flag_update = False
-
-        production_jobs_list = jutils.get_job_list(production_conn)
-        interim_views_list = jutils.get_views_list(interim_conn)
-
-        # Performing Pre-Check here, ensuring that there are no duplicate jobs present!
-        if not allow_duplicates:
-            if not view_pre_check(views_name_list):
-                raise ValueError('Error: Duplicate Job(s) present')
-
-        # Update Specific Views, and all jobs within
-        if len(views_name_list) != 0:
-            for view in views_name_list:
-                if view in interim_views_list:
-                    interim_jobs_list = jutils.get_view_and_its_jobs(interim_conn)[view]
-                    for job in interim_jobs_list:
-                        # check the required plugins are installed in the Production, if not, skip
-                        config_xml = jutils.get_config_xml(interim_conn, job)
-                        if config_xml:
 
-                            job_specific_plugins_exist = check_job_plugins_in_production(job)
-                            if job_specific_plugins_exist:
+def plugins_to_deploy(plugin_names, production_plugins):
+    """
+    Get the plugins to deploy in production for the given missing plugins.
 
-                                cfg.table.add_row("Publishing Details", "Name", "Type", "Status", "Action")
-                                if job in production_jobs_list:
-                                    flag_update = True
-                                    jutils.update_job(job, config_xml)
-                                else:
-                                    flag_update = True
-                                    jutils.create_job(job, config_xml)
+    With an update center set, see set_update_center, the plugins they need that production is missing or has
+    too old a version of are added ahead of them, so every plugin is deployed in the same request and after the
+    plugins it needs. Plugins the index cannot resolve are still left to the update center of production.
 
-                            else:
-                                cfg.table.add_row("", "", "Error", "Job Specific Plugin NOT INSTALLED in Production Server")
+    Parameters:
+    - plugin_names (list): Short names of the plugins missing in production.
+    - production_plugins (dict): The plugins installed in production with their versions.
 
-                        else:
-                            cfg.table.add_row("", "",  "Error", f"{job}'s config.xml NOT RETRIEVED in Interim Server")
+    Returns:
+    - list: The plugins to deploy.
+    """
+    index = jupdates.get_index()
+    if index is None:
+        return list(plugin_names)
+    to_install, unavailable = jupdates.install_set(plugin_names, index, production_plugins)
+    dependencies = [plugin for plugin in to_install if plugin not in plugin_names]
+    if dependencies:
+        cfg.table.add_row("", "Plugin Dependencies", str(dependencies))
+    return to_install + [plugin for plugin in plugin_names if plugin in unavailable]
 
-                        cfg.table.add_row()
 
-                else:
-                    cfg.table.add_row("", "",  "Error", f"{view} DOES NOT Exist in Interim Server")
-                    if view in production_jobs_list:
-                        jutils.delete_view(view)
+def install_missing_plugins(plugin_names):
+    """
+    Installs the plugins that are missing in production, with a single script console request, and waits
+    for the installs to finish.
 
-                # Updating the View once the jobs have been updated/created
-                if flag_update:
-                    check_views(job, view)
-                flag_update = False
+    Parameters:
+    - plugin_names (list): Short names of the plugins needed in production.
 
-                cfg.table.add_row()
+    Returns:
+    - set: The plugins that are still missing after the installation.
+    """
+    production_conn = cfg.production_conn
+    production_plugins = jinv.get_snapshot().production.get_plugin_versions()
+    if production_plugins is None:
+        raise ValueError("Plugin List NOT RETRIEVED")
+
+    missing = sorted(plugin for plugin in plugin_names if plugin not in production_plugins)
+    if not missing:
+        cfg.table.add_row("Plugin Check", "SUCCESS", "All Plugins Installed")
+        return set()
+
+    started = time.time()
+    deploying, not_found = jutils.install_plugins(production_conn, plugins_to_deploy(missing, production_plugins))
+    unavailable = set(not_found)
+    for plugin in not_found:
+        jres.record(plugin, 'plugin', 'installed', jres.FAILED, "Not Found in Update Center", started)
+    if deploying:
+        status = jutils.wait_for_plugin_installs(production_conn)
+        jinv.get_snapshot().plugins_installed()
+        for plugin in deploying:
+            if plugin in status['failed']:
+                jres.record(plugin, 'plugin', 'installed', jres.FAILED, str(status['failed'][plugin]), started)
+                unavailable.add(plugin)
+            elif not status['timed_out']:
+                jres.record(plugin, 'plugin', 'installed', started=started)
+        if status['restart_required']:
+            cfg.table.add_row("", "SUCCESS", "Restart Production Server")
+    return unavailable & set(missing)
+
+
+def create_folder(folder):
+    """
+    Creates a folder in production with its config from the interim server, unless it already exists.
 
-        else:
-            cfg.table.add_row("", "", "Error", "Enter Job Details to Move/Update")
-            return False
+    Parameters:
+    - folder (str): The full name of the folder, e.g. "team/sub". The folders containing it must exist.
 
-        production_view_clean_up()
+    Returns:
+    - bool: True if the folder exists in production afterwards, False otherwise.
+    """
+    production_conn = cfg.production_conn
+    interim_conn = cfg.interim_conn
+    if folder in jinv.get_snapshot().production.get_job_list() or production_conn.job_exists(folder):
         return True
-
-    except Exception as e:
-        cfg.table.add_row("Transfer Status", "Failed", str(e))
+    config_xml = jutils.get_config_xml(interim_conn, folder)
+    if not config_xml:
+        jres.record(folder, 'job', 'created', jres.FAILED, "config.xml NOT RETRIEVED in Interim Server")
+        jevents.emit(jevents.FAILED, 'job', folder, "config.xml NOT RETRIEVED in Interim Server")
         return False
-    
\ No newline at end of file
+    return jutils.create_job(folder, config_xml)
@@ -0,0 +1,18 @@
+'''
+
+Benchmarks, run against in-process fake Jenkins servers, see fakejenkins.py; no live servers are needed.
+
+Every benchmark reports the wall time and the number of requests made to each server, for 10, 100 and 1,000 jobs:
+
+1. transfer() of jobs and of views
+2. check_publish_standards()
+3. check_plugin_dependencies()
+4. production_cleanup()
+5. interim_cleanup()
+
+The benchmarks are opt-in:
+
+    pytest jenkins_job_transfers/benchmarks --benchmark [--benchmark_sizes 10,100] [--benchmark_latency 0.005]
+           [--benchmark_config_size 2048] [--benchmark_workers 4] [--benchmark_json results.json]
+
+'''
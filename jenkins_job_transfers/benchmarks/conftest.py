@@ -0,0 +1,76 @@
+import json
+import pytest
+from pathlib import Path
+
+BENCHMARK_RESULTS = pytest.StashKey()
+BENCHMARKS_DIR = Path(__file__).parent
+
+
+def pytest_addoption(parser):
+    """Define the command-line options of the benchmarks."""
+    parser.addoption("--benchmark", action="store_true", default=False, help="Run the benchmarks")
+    parser.addoption("--benchmark_sizes", action="store", default="10,100,1000",
+                     help="Comma-separated numbers of jobs to benchmark with")
+    parser.addoption("--benchmark_latency", action="store", type=float, default=0.0,
+                     help="Seconds every request to the fake servers waits before it is answered")
+    parser.addoption("--benchmark_config_size", action="store", type=int, default=2048,
+                     help="Size of the job configs in bytes")
+    parser.addoption("--benchmark_workers", action="store", type=int, default=1,
+                     help="Concurrent requests per server, see set_max_workers")
+    parser.addoption("--benchmark_json", action="store", default=None, help="File to write the results to as JSON")
+
+
+def pytest_configure(config):
+    config.stash[BENCHMARK_RESULTS] = []
+
+
+def pytest_generate_tests(metafunc):
+    """Run every benchmark once per number of jobs."""
+    if "jobCount" in metafunc.fixturenames:
+        sizes = [int(size) for size in metafunc.config.getoption("--benchmark_sizes").split(",") if size.strip()]
+        metafunc.parametrize("jobCount", sizes)
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip the benchmarks unless --benchmark is given; tests outside this directory are left alone."""
+    if config.getoption("--benchmark"):
+        return
+    skip = pytest.mark.skip(reason="Benchmarks Run Only with --benchmark")
+    for item in items:
+        if BENCHMARKS_DIR in item.path.parents:
+            item.add_marker(skip)
+
+
+@pytest.fixture
+def benchmarkOptions(request):
+    """The latency, config size and workers the benchmarks run with."""
+    return {
+        "latency": request.config.getoption("--benchmark_latency"),
+        "configSize": request.config.getoption("--benchmark_config_size"),
+        "workers": request.config.getoption("--benchmark_workers"),
+    }
+
+
+@pytest.fixture
+def benchmarkResults(request):
+    """The results of the benchmarks run so far, reported at the end of the session."""
+    return request.config.stash[BENCHMARK_RESULTS]
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """Report the wall time and requests of every benchmark."""
+    results = config.stash.get(BENCHMARK_RESULTS, [])
+    if not results:
+        return
+
+    terminalreporter.section("Benchmarks")
+    terminalreporter.write_line(f"{'Operation':<40}{'Jobs':>8}{'Wall Time (s)':>16}{'Production Requests':>22}"
+                                f"{'Interim Requests':>19}")
+    for result in results:
+        terminalreporter.write_line(f"{result['operation']:<40}{result['jobs']:>8}{result['seconds']:>16.3f}"
+                                    f"{result['productionRequests']:>22}{result['interimRequests']:>19}")
+
+    path = config.getoption("--benchmark_json")
+    if path:
+        with open(path, "w") as f:
+            json.dump(results, f, indent=4)
@@ -0,0 +1,317 @@
+"""
+
+Summary - An in-process fake Jenkins server implementing the endpoints python-jenkins and this package use: jobs and
+          folders, views, config.xml, pluginManager, updateCenter, the script console and crumbIssuer.
+
+Every request is counted, and a fixed latency can be added to each one, so transfers can be measured reproducibly
+without live servers.
+
+"""
+
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, unquote
+from xml.sax.saxutils import escape, unescape
+
+JOB_XML = """<?xml version='1.1' encoding='UTF-8'?>
+<project>
+  <actions/>
+  <description>{description}</description>
+  <keepDependencies>false</keepDependencies>
+  <properties>{properties}</properties>
+  <scm class="hudson.scm.NullSCM"/>
+  <canRoam>true</canRoam>
+  <disabled>false</disabled>
+  <triggers/>
+  <concurrentBuild>false</concurrentBuild>
+  <builders/>
+  <publishers>{publishers}</publishers>
+  <buildWrappers/>
+</project>"""
+
+VIEW_XML = """<?xml version="1.1" encoding="UTF-8"?>
+<hudson.model.ListView>
+  <name>{name}</name>
+  <filterExecutors>false</filterExecutors>
+  <filterQueue>false</filterQueue>
+  <properties class="hudson.model.View$PropertyList"/>
+  <jobNames>
+    <comparator class="java.lang.String$CaseInsensitiveComparator"/>
+{jobs}
+  </jobNames>
+  <jobFilters/>
+  <columns/>
+  <recurse>false</recurse>
+</hudson.model.ListView>"""
+
+FOLDER_XML = """<?xml version='1.1' encoding='UTF-8'?>
+<com.cloudbees.hudson.plugins.folder.Folder plugin="cloudbees-folder@6.815.v0dd5a_cb_40e0e">
+  <description></description>
+</com.cloudbees.hudson.plugins.folder.Folder>"""
+
+JENKINS_VERSION = '2.440'
+
+# python-jenkins prints this after every script and refuses output that does not end with it
+SCRIPT_END_MARKER = ')]}.'
+
+
+def job_xml(description='', plugins=(), downstream=(), size=0):
+    """
+    Returns a freestyle job config.
+
+    Args:
+        description (str): The job description.
+        plugins (list): (name, version) pairs of the plugins the job references.
+        downstream (list): The names of the jobs it triggers.
+        size (int): The minimal size of the config in bytes; the description is padded to reach it.
+    """
+    properties = ''.join(f'<p.{name} plugin="{name}@{version}"/>' for name, version in plugins)
+    publishers = ''
+    if downstream:
+        publishers = (f'<hudson.tasks.BuildTrigger><childProjects>{", ".join(downstream)}</childProjects>'
+                      '</hudson.tasks.BuildTrigger>')
+    config_xml = JOB_XML.format(description=escape(description), properties=properties, publishers=publishers)
+    if len(config_xml) < size:
+        config_xml = JOB_XML.format(description=escape(description) + 'x' * (size - len(config_xml)),
+                                    properties=properties, publishers=publishers)
+    return config_xml
+
+
+def view_xml(name, jobs):
+    """
+    Returns a list view config listing jobs.
+    """
+    return VIEW_XML.format(name=escape(name),
+                           jobs='\n'.join(f'    <string>{escape(job)}</string>' for job in sorted(jobs)))
+
+
+class FakeJenkins:
+    """
+    A fake Jenkins server holding jobs, views and plugins in memory.
+
+    Args:
+        latency (float): Seconds every request waits before it is answered.
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.jobs = {}
+        self.views = {}
+        self.plugins = {}
+        self.available_plugins = {}
+        self.requests = []
+        self.lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    def add_job(self, name, config_xml=None):
+        self.jobs[name] = config_xml or job_xml()
+
+    def add_folder(self, name):
+        self.jobs[name] = FOLDER_XML
+
+    def add_view(self, name, jobs, config_xml=None):
+        self.views[name] = config_xml or view_xml(name, jobs)
+
+    def is_folder(self, name):
+        return 'hudson.plugins.folder.Folder' in self.jobs[name][:300]
+
+    def view_jobs(self, name):
+        jobs = (unescape(job) for job in re.findall(r'<string>([^<]*)</string>', self.views[name]))
+        return [job for job in jobs if job in self.jobs]
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self._server.server_address[1]}/'
+
+    def start(self):
+        """
+        Starts serving on a free local port in a background thread.
+
+        Returns:
+            FakeJenkins: The server itself.
+        """
+        handler = type('Handler', (_Handler,), {'fake': self})
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset_requests(self):
+        with self.lock:
+            self.requests = []
+
+    def count(self, method=None):
+        """
+        Returns the number of requests served, optionally only those of an HTTP method.
+        """
+        with self.lock:
+            return len([request for request in self.requests if method is None or request[0] == method])
+
+
+def _job_name(path):
+    """
+    Splits a job URL path, e.g. "job/team/job/build/config.xml", into the full job name and the rest.
+    """
+    parts = path.strip('/').split('/')
+    names = []
+    while len(parts) >= 2 and parts[0] == 'job':
+        names.append(unquote(parts[1]))
+        parts = parts[2:]
+    return '/'.join(names), '/'.join(parts)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Connections are kept alive, as python-jenkins reuses them with a real Jenkins; without Nagle's algorithm the
+    # headers and body of a response are not held back waiting for an acknowledgement
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    fake = None
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def _send(self, code, body='', content_type='application/json'):
+        data = body.encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', content_type)
+        self.send_header('X-Jenkins', JENKINS_VERSION)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _items(self, folder):
+        fake = self.fake
+        items = []
+        for name in sorted(fake.jobs):
+            parent, _, short_name = name.rpartition('/')
+            if parent != folder:
+                continue
+            item = {'_class': 'hudson.model.FreeStyleProject', 'name': short_name, 'fullName': name,
+                    'url': fake.url + ''.join(f'job/{part}/' for part in name.split('/')), 'color': 'blue'}
+            if fake.is_folder(name):
+                item['_class'] = 'com.cloudbees.hudson.plugins.folder.Folder'
+                item['jobs'] = self._items(name)
+            items.append(item)
+        return items
+
+    def _view_items(self, name):
+        return [{'name': job.rsplit('/', 1)[-1], 'fullName': job, 'url': '', 'color': 'blue'}
+                for job in self.fake.view_jobs(name)]
+
+    def _handle(self, method):
+        fake = self.fake
+        parsed = urlparse(self.path)
+        path = unquote(parsed.path).strip('/')
+        query = parse_qs(parsed.query)
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length).decode('utf-8') if length else ''
+        with fake.lock:
+            fake.requests.append((method, path))
+        if fake.latency:
+            time.sleep(fake.latency)
+
+        with fake.lock:
+            response = self._route(method, path, query, body)
+        self._send(*response)
+
+    def _route(self, method, path, query, body):
+        fake = self.fake
+
+        if path == 'crumbIssuer/api/json':
+            return 200, json.dumps({'crumbRequestField': 'Jenkins-Crumb', 'crumb': 'fake'})
+        if path in ('', 'api/json'):
+            views = [{'_class': 'hudson.model.AllView', 'name': 'all', 'url': fake.url,
+                      'jobs': [{'name': job, 'fullName': job} for job in sorted(fake.jobs) if '/' not in job]}]
+            views += [{'_class': 'hudson.model.ListView', 'name': name, 'url': f'{fake.url}view/{name}/',
+                       'jobs': self._view_items(name)} for name in sorted(fake.views)]
+            return 200, json.dumps({'_class': 'hudson.model.Hudson', 'jobs': self._items(''), 'views': views})
+        if path == 'me/api/json':
+            return 200, json.dumps({'fullName': 'fake'})
+        if path == 'pluginManager/api/json':
+            return 200, json.dumps({'plugins': [{'shortName': name, 'longName': name, 'version': version,
+                                                 'active': True, 'enabled': True, 'dependencies': []}
+                                                for name, version in sorted(fake.plugins.items())]})
+        if path == 'updateCenter/api/json':
+            return 200, json.dumps({'restartRequiredForCompletion': False, 'jobs': []})
+        if path == 'scriptText':
+            return 200, self._run_script(parse_qs(body).get('script', [''])[0]), 'text/plain'
+
+        if path == 'createItem':
+            fake.jobs[query['name'][0]] = body
+            return 200, ''
+        if path.startswith('job/'):
+            name, rest = _job_name(path)
+            if rest == 'createItem':
+                fake.jobs[f"{name}/{query['name'][0]}"] = body
+                return 200, ''
+            if name not in fake.jobs:
+                return 404, ''
+            if rest == 'config.xml':
+                if method == 'POST':
+                    fake.jobs[name] = body
+                    return 200, ''
+                return 200, fake.jobs[name], 'application/xml'
+            if rest == 'doDelete':
+                for job in [job for job in fake.jobs if job == name or job.startswith(f'{name}/')]:
+                    del fake.jobs[job]
+                return 200, ''
+            if rest == 'api/json':
+                info = {'name': name.rsplit('/', 1)[-1], 'fullName': name}
+                if fake.is_folder(name):
+                    info['jobs'] = self._items(name)
+                return 200, json.dumps(info)
+
+        if path == 'createView':
+            fake.views[query['name'][0]] = body
+            return 200, ''
+        if path.startswith('view/'):
+            parts = path.split('/')
+            name, rest = parts[1], '/'.join(parts[2:])
+            if name not in fake.views:
+                return 404, ''
+            if rest == 'config.xml':
+                if method == 'POST':
+                    fake.views[name] = body
+                    return 200, ''
+                return 200, fake.views[name], 'application/xml'
+            if rest == 'doDelete':
+                del fake.views[name]
+                return 200, ''
+            if rest == 'api/json':
+                return 200, json.dumps({'_class': 'hudson.model.ListView', 'name': name,
+                                        'jobs': self._view_items(name)})
+        return 404, ''
+
+    def _run_script(self, script):
+        """
+        Answers the script console requests of this package: batch plugin installs, which deploy the plugins of
+        available_plugins at once.
+        """
+        fake = self.fake
+        output = ''
+        names = re.search(r"\[('[^\]]*)\]\.each", script) or re.search(r'getPlugin\("([^"]+)"\)', script)
+        if names:
+            deploying = []
+            for name in re.findall(r"'([^']+)'", names.group(0)) or [names.group(1)]:
+                if name in fake.available_plugins:
+                    fake.plugins[name] = fake.available_plugins[name]
+                    deploying.append(name)
+                else:
+                    output += f'NOT FOUND: {name}\n'
+            output += f"DEPLOYING: {','.join(deploying)}\n"
+        return output + SCRIPT_END_MARKER
@@ -0,0 +1,176 @@
+import jenkins_job_transfers as jjt
+import time
+import pytest
+from .fakejenkins import FakeJenkins, job_xml
+
+# Jobs per view, plugins referenced by the jobs and share of the jobs already in production
+JOBS_PER_VIEW = 10
+PLUGINS = [("benchmark-plugin-%d" % index, "1.%d" % index) for index in range(10)]
+EXISTING_SHARE = 0.1
+
+
+def jobName(index):
+    return "Benchmark Job %04d" % index
+
+
+def viewName(index):
+    return "Benchmark View %03d" % index
+
+
+@pytest.fixture
+def servers(jobCount, benchmarkOptions):
+    """
+    Start a fake production and interim server and connect to them.
+
+    Interim holds jobCount jobs, JOBS_PER_VIEW to a view, each referencing one of PLUGINS, which both servers have.
+    Production already holds the first EXISTING_SHARE of the jobs with an older config, and both servers hold one
+    empty view per JOBS_PER_VIEW jobs to be cleaned up.
+
+    Yields:
+        tuple: The production and interim FakeJenkins.
+    """
+    production = FakeJenkins(benchmarkOptions["latency"]).start()
+    interim = FakeJenkins(benchmarkOptions["latency"]).start()
+    try:
+        production.plugins = dict(PLUGINS)
+        interim.plugins = dict(PLUGINS)
+
+        viewCount = max(1, jobCount // JOBS_PER_VIEW)
+        for index in range(jobCount):
+            plugin = PLUGINS[index % len(PLUGINS)]
+            interim.add_job(jobName(index), job_xml("Interim", plugins=[plugin], size=benchmarkOptions["configSize"]))
+            if index < jobCount * EXISTING_SHARE:
+                production.add_job(jobName(index), job_xml("Production", plugins=[plugin],
+                                                           size=benchmarkOptions["configSize"]))
+        for index in range(viewCount):
+            interim.add_view(viewName(index), [jobName(job) for job in range(jobCount) if job % viewCount == index])
+            production.add_view("Empty " + viewName(index), [])
+            interim.add_view("Empty " + viewName(index), [])
+
+        assert jjt.connect(production.url, interim.url, "benchmark", "benchmark", "benchmark", "benchmark",
+                           mode="quiet"), "Failed to Connect to the Fake Servers"
+        jjt.set_max_workers(benchmarkOptions["workers"])
+
+        yield production, interim
+
+    finally:
+        jjt.set_max_workers(1)
+        production.stop()
+        interim.stop()
+
+
+def measure(servers, benchmarkResults, operation, jobCount, func):
+    """
+    Run func against the servers and record its wall time and the requests made to each server.
+
+    Returns:
+        The result of func.
+    """
+    production, interim = servers
+    production.reset_requests()
+    interim.reset_requests()
+
+    started = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - started
+
+    benchmarkResults.append({
+        "operation": operation,
+        "jobs": jobCount,
+        "seconds": seconds,
+        "productionRequests": production.count(),
+        "interimRequests": interim.count(),
+    })
+    return result
+
+
+def test_benchmark_transfer_jobs(servers, benchmarkResults, benchmarkOptions, jobCount):
+    """
+    Measures the transfer of every job, creating most of them and updating the ones already in production.
+    """
+    jobs = [jobName(index) for index in range(jobCount)]
+
+    result = measure(servers, benchmarkResults, "transfer (jobs)", jobCount,
+                     lambda: jjt.transfer(jobs, "job", allowDuplicates=True, mode="quiet",
+                                          workers=benchmarkOptions["workers"]))
+
+    assert result, "Transfer Failed"
+    assert set(jobs) <= set(servers[0].jobs), "Jobs Not Transferred"
+
+
+def test_benchmark_transfer_views(servers, benchmarkResults, benchmarkOptions, jobCount):
+    """
+    Measures the transfer of every view with its jobs.
+    """
+    views = [viewName(index) for index in range(max(1, jobCount // JOBS_PER_VIEW))]
+
+    result = measure(servers, benchmarkResults, "transfer (views)", jobCount,
+                     lambda: jjt.transfer(views, "view", allowDuplicates=True, mode="quiet",
+                                          workers=benchmarkOptions["workers"]))
+
+    assert result, "Transfer Failed"
+    assert set(views) <= set(servers[0].views), "Views Not Transferred"
+
+
+def test_benchmark_check_publish_standards(servers, benchmarkResults, jobCount):
+    """
+    Measures the publish standards pre-check of every job.
+    """
+    jobs = [jobName(index) for index in range(jobCount)]
+
+    result = measure(servers, benchmarkResults, "check_publish_standards", jobCount,
+                     lambda: jjt.check_publish_standards(jobs, "job", allowDuplicates=True, mode="quiet"))
+
+    assert result, "Publish Standards Not Met"
+
+
+def test_benchmark_check_plugin_dependencies(servers, benchmarkResults, jobCount):
+    """
+    Measures the plugin check of every job.
+    """
+    jobs = [jobName(index) for index in range(jobCount)]
+
+    result = measure(servers, benchmarkResults, "check_plugin_dependencies", jobCount,
+                     lambda: jjt.check_plugin_dependencies(jobs, "job", mode="quiet"))
+
+    assert result == {job: [] for job in jobs}, "Unexpected Plugin Dependencies"
+
+
+def test_benchmark_install_plugins(servers, benchmarkResults, jobCount):
+    """
+    Measures the batch install of a plugin the jobs need and production is missing, in the update center of the
+    fake production server.
+    """
+    production = servers[0]
+    plugin, version = PLUGINS[0]
+    del production.plugins[plugin]
+    production.available_plugins[plugin] = version
+    jobs = [jobName(index) for index in range(jobCount)]
+
+    result = measure(servers, benchmarkResults, "check_and_install_plugin_dependencies", jobCount,
+                     lambda: jjt.check_and_install_plugin_dependencies(jobs, "job", mode="quiet", batch=True))
+
+    assert result, "Plugin Install Failed"
+    assert production.plugins.get(plugin) == version, "Missing Plugin Not Installed"
+
+
+def test_benchmark_production_cleanup(servers, benchmarkResults, jobCount):
+    """
+    Measures the clean up of the empty views of production.
+    """
+    result = measure(servers, benchmarkResults, "production_cleanup", jobCount,
+                     lambda: jjt.production_cleanup(mode="quiet"))
+
+    assert result, "Production CleanUp Failed"
+    assert not [view for view in servers[0].views if view.startswith("Empty ")], "Empty Views Not Deleted"
+
+
+def test_benchmark_interim_cleanup(servers, benchmarkResults, jobCount):
+    """
+    Measures the clean up of the empty views of interim.
+    """
+    result = measure(servers, benchmarkResults, "interim_cleanup", jobCount,
+                     lambda: jjt.interim_cleanup(mode="quiet"))
+
+    assert result, "Interim CleanUp Failed"
+    assert not [view for view in servers[1].views if view.startswith("Empty ")], "Empty Views Not Deleted"
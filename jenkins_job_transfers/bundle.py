@@ -0,0 +1,287 @@
+"""
+
+Summary - Offline transfer bundles: jobs, views and the plugins they need, exported from interim into one file
+          and applied to production without a connection to interim.
+
+A bundle is a zip file with a manifest.json and one objects/<sha256>.xml entry per distinct config, so the
+same config is stored once and every config is verified against its hash when the bundle is applied.
+
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import zipfile
+from . import baseModule as jbm
+from . import utils as jutils
+from . import config as cfg
+from . import inventory as jinv
+from . import events as jevents
+from . import results as jres
+
+BUNDLE_FORMAT = 1
+MANIFEST = 'manifest.json'
+
+
+def object_name(digest):
+    return f'objects/{digest}.xml'
+
+
+class BundleWriter:
+    """
+    Writes configs into a bundle as they are fetched, so only the configs being written are held in memory.
+
+    Worker threads may add configs concurrently; the zip file is written one entry at a time.
+    """
+
+    def __init__(self, path):
+        self._zip = zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED)
+        self._digests = set()
+        self._lock = threading.Lock()
+
+    def add_config(self, config_xml):
+        """
+        Stores a config, once per distinct content.
+
+        Returns:
+            str: The SHA-256 hex digest the config is stored under.
+        """
+        data = config_xml.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            if digest not in self._digests:
+                with self._zip.open(object_name(digest), 'w') as entry:
+                    entry.write(data)
+                self._digests.add(digest)
+        return digest
+
+    def close(self, manifest=None):
+        """
+        Writes the manifest and closes the bundle. Without a manifest the bundle is left incomplete.
+        """
+        with self._lock:
+            if manifest is not None:
+                self._zip.writestr(MANIFEST, json.dumps(manifest, indent=2))
+            self._zip.close()
+
+
+class BundleReader:
+    """
+    Reads the manifest and the configs of a bundle, verifying every config against its digest.
+    """
+
+    def __init__(self, path):
+        self._zip = zipfile.ZipFile(path, 'r')
+        self._lock = threading.Lock()
+        self.manifest = json.loads(self._zip.read(MANIFEST).decode('utf-8'))
+        if self.manifest.get('format') != BUNDLE_FORMAT:
+            raise ValueError(f"Unsupported Bundle Format: {self.manifest.get('format')}")
+
+    def read_config(self, digest):
+        """
+        Returns the config stored under digest.
+
+        Raises:
+            ValueError: If the stored config does not match its digest.
+        """
+        sha256 = hashlib.sha256()
+        chunks = []
+        with self._lock, self._zip.open(object_name(digest)) as entry:
+            for chunk in iter(lambda: entry.read(1 << 16), b''):
+                sha256.update(chunk)
+                chunks.append(chunk)
+        if sha256.hexdigest() != digest:
+            raise ValueError(f"Config {digest} is Corrupted")
+        return b''.join(chunks).decode('utf-8')
+
+    def close(self):
+        self._zip.close()
+
+
+def bundle_contents(job_name_list, views_name_list):
+    """
+    Resolves what goes into a bundle: the jobs with the folders containing them, and the views.
+
+    The views are the given ones and, for a list of jobs, the views containing them in interim, as transfer
+    would update them too.
+
+    Returns:
+        tuple: The job/folder names, outermost folders first, and the view names.
+    """
+    interim_inventory = jinv.get_snapshot().interim
+    interim_views_and_jobs = interim_inventory.get_view_and_its_jobs()
+    job_views = interim_inventory.get_job_views()
+
+    jobs = list(job_name_list)
+    views = list(views_name_list)
+    for view in views_name_list:
+        if view not in interim_views_and_jobs:
+            raise ValueError(f"{view} DOES NOT Exist in Interim Server")
+        jobs.extend(interim_views_and_jobs[view])
+    if not views_name_list:
+        for job in job_name_list:
+            views.extend(sorted(job_views.get(job, ())))
+
+    names = []
+    for job in jobs:
+        parts = job.split('/')
+        for index in range(1, len(parts) + 1):
+            name = '/'.join(parts[:index])
+            if name not in names:
+                names.append(name)
+    return names, list(dict.fromkeys(views))
+
+
+def export_bundle(path, job_name_list, views_name_list):
+    """
+    Writes the jobs and views, with the versions of the plugins they need in interim, into a bundle.
+
+    Configs are fetched concurrently, bounded by the worker limit of interim, and written to the bundle as
+    soon as they arrive.
+
+    Parameters:
+    - path (str): The bundle file to write.
+    - job_name_list (list): The jobs to export.
+    - views_name_list (list): The views to export, with all their jobs.
+
+    Returns:
+    - bool: True if every job and view was exported, False otherwise.
+    """
+    writer = None
+    try:
+        interim_conn = cfg.interim_conn
+        job_names, view_names = bundle_contents(job_name_list, views_name_list)
+        interim_plugin_versions = jinv.get_snapshot().interim.get_plugin_versions() or {}
+        writer = BundleWriter(path)
+
+        def export(name, fetch, kind):
+            started = time.time()
+            config_xml = fetch(interim_conn, name)
+            if not config_xml:
+                jres.record(name, kind, 'exported', jres.FAILED, "config.xml NOT RETRIEVED in Interim Server", started)
+                return None
+            entry = {'name': name, 'hash': writer.add_config(config_xml)}
+            if kind == 'job':
+                entry['plugins'] = sorted(set(jbm.get_job_specific_plugins(config_xml) or []))
+            jres.record(name, kind, 'exported', started=started)
+            return entry
+
+        jobs = jutils.map_concurrently(interim_conn, lambda name: export(name, jutils.get_config_xml, 'job'),
+                                       job_names)
+        views = jutils.map_concurrently(interim_conn, lambda name: export(name, jutils.get_view_config_xml, 'view'),
+                                        view_names)
+
+        required = sorted({plugin for job in jobs if job for plugin in job['plugins']})
+        manifest = {
+            'format': BUNDLE_FORMAT,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'source': cfg.interim_url,
+            'jobs': [job for job in jobs if job],
+            'views': [view for view in views if view],
+            'plugins': {plugin: interim_plugin_versions.get(plugin) for plugin in required},
+        }
+        writer.close(manifest)
+        writer = None
+
+        cfg.table.add_row("Bundle", path, f"Jobs: {len(manifest['jobs'])}", f"Views: {len(manifest['views'])}",
+                          f"Plugins: {len(required)}")
+        return None not in jobs and None not in views
+
+    except Exception as e:
+        cfg.table.add_row("Export Bundle", "Failed", str(e))
+        return False
+
+    finally:
+        # An incomplete bundle is removed rather than left to be applied
+        if writer is not None:
+            writer.close()
+            os.remove(path)
+
+
+def import_bundle(path):
+    """
+    Applies a bundle to production: installs the missing plugins, then creates or updates its folders and jobs,
+    then its views. Only a connection to production is needed, and a bundle can be applied any number of times.
+
+    Jobs needing a plugin that could not be installed are skipped, and so is everything inside a folder that
+    could not be written. Jobs are written concurrently, bounded by the transfer workers, and each config is read
+    from the bundle only when it is written.
+
+    Parameters:
+    - path (str): The bundle file to apply.
+
+    Returns:
+    - bool: True if every job and view was applied, False otherwise.
+    """
+    reader = None
+    try:
+        production_conn = cfg.production_conn
+        reader = BundleReader(path)
+        manifest = reader.manifest
+        cfg.table.add_row("Bundle", path, str(manifest.get('source')), str(manifest.get('created')))
+
+        unavailable = jbm.install_missing_plugins(manifest['plugins'])
+        production_inventory = jinv.get_snapshot().production
+        # Jobs and folders that failed; whatever is inside them is not written
+        failed = set()
+
+        def apply_job(job):
+            started = time.time()
+            name = job['name']
+            try:
+                parts = name.split('/')
+                folders = ['/'.join(parts[:index]) for index in range(1, len(parts))]
+                failed_folders = [folder for folder in folders if folder in failed]
+                if failed_folders:
+                    raise ValueError(f"Skipped, Folder NOT IMPORTED: {failed_folders[0]}")
+                missing = unavailable.intersection(job.get('plugins', []))
+                if missing:
+                    raise ValueError(f"Job Specific Plugin NOT INSTALLED in Production Server: {sorted(missing)}")
+                config_xml = reader.read_config(job['hash'])
+                jevents.emit(jevents.FETCHED, 'job', name)
+                if name in production_inventory.get_job_list():
+                    return jutils.update_job(name, config_xml)
+                return jutils.create_job(name, config_xml)
+            except Exception as e:
+                jres.record(name, 'job', 'imported', jres.FAILED, str(e), started)
+                jevents.emit(jevents.FAILED, 'job', name, str(e))
+                return False
+
+        def apply_view(view):
+            started = time.time()
+            name = view['name']
+            try:
+                config_xml = reader.read_config(view['hash'])
+                jevents.emit(jevents.FETCHED, 'view', name)
+                if name in production_inventory.get_views_list():
+                    return jutils.update_view(name, config_xml)
+                return jutils.create_view(name, config_xml)
+            except Exception as e:
+                jres.record(name, 'view', 'imported', jres.FAILED, str(e), started)
+                jevents.emit(jevents.FAILED, 'view', name, str(e))
+                return False
+
+        # Folders come before their jobs, so each folder level is written before the next one
+        levels = {}
+        for job in manifest['jobs']:
+            levels.setdefault(job['name'].count('/'), []).append(job)
+        applied = []
+        for level in sorted(levels):
+            level_applied = jutils.map_concurrently(production_conn, apply_job, levels[level],
+                                                    workers=cfg.transfer_workers)
+            failed.update(job['name'] for job, chk in zip(levels[level], level_applied) if not chk)
+            applied += level_applied
+        applied += jutils.map_concurrently(production_conn, apply_view, manifest['views'],
+                                           workers=cfg.transfer_workers)
+
+        return all(applied)
+
+    except Exception as e:
+        cfg.table.add_row("Import Bundle", "Failed", str(e))
+        return False
+
+    finally:
+        if reader is not None:
+            reader.close()
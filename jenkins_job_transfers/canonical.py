@@ -0,0 +1,184 @@
+"""
+
+Summary - Canonical form, content hashes and structural diffs of job and view config XMLs.
+
+"""
+
+import hashlib
+from functools import lru_cache
+from . import config as cfg
+from .lazy import lazy_import
+
+etree = lazy_import('lxml.etree')
+
+
+@lru_cache(maxsize=32)
+def _compile_rules(rules):
+    """
+    Compile ignore-rules once per distinct set of rules.
+
+    Args:
+        rules (tuple): XPath expressions selecting the elements, attributes or text to ignore.
+
+    Returns:
+        list: The compiled XPath objects.
+    """
+    return [etree.XPath(rule) for rule in rules]
+
+
+def validate_rules(rules):
+    """
+    Check that every ignore-rule is a valid XPath expression selecting nodes.
+
+    Args:
+        rules (list): XPath expressions.
+
+    Raises:
+        ValueError: If a rule is not a valid XPath expression, or selects a number, string or boolean
+                    instead of nodes, e.g. "count(//x)".
+    """
+    for rule in rules:
+        try:
+            xpath = etree.XPath(rule)
+            result = xpath(etree.Element('project'))
+        except (etree.XPathSyntaxError, etree.XPathEvalError):
+            raise ValueError(f"Invalid XPath Rule: {rule}")
+        if not isinstance(result, list):
+            raise ValueError(f"XPath Rule Does Not Select Nodes: {rule}")
+
+
+def _canonical_tree(config_xml, ignore=None):
+    """
+    Parse a config and strip everything that does not change its meaning.
+
+    Comments and whitespace-only text between elements are dropped, and so is everything matched by
+    the ignore-rules.
+
+    Args:
+        config_xml (str): The configuration XML.
+        ignore (list, optional): XPath ignore-rules. Defaults to cfg.ignore_rules.
+
+    Returns:
+        lxml.etree._Element: The root of the stripped tree.
+    """
+    parser = etree.XMLParser(remove_blank_text=True, remove_comments=True)
+    data = config_xml.encode('utf-8') if isinstance(config_xml, str) else config_xml
+    root = etree.fromstring(data, parser)
+
+    rules = tuple(cfg.ignore_rules if ignore is None else ignore)
+    for xpath in _compile_rules(rules):
+        matches = xpath(root)
+        if not isinstance(matches, list):
+            continue
+        for match in matches:
+            if isinstance(match, etree._Element):
+                parent = match.getparent()
+                if parent is not None:
+                    parent.remove(match)
+            elif getattr(match, 'is_attribute', False):
+                del match.getparent().attrib[match.attrname]
+            elif getattr(match, 'is_text', False):
+                match.getparent().text = None
+            elif getattr(match, 'is_tail', False):
+                match.getparent().tail = None
+    return root
+
+
+def canonicalize(config_xml, ignore=None):
+    """
+    Get the canonical (C14N) form of a job or view config.
+
+    The XML declaration, attribute order, quoting, empty-element syntax, comments and insignificant
+    whitespace do not affect the result.
+
+    Args:
+        config_xml (str): The configuration XML.
+        ignore (list, optional): XPath ignore-rules. Defaults to cfg.ignore_rules.
+
+    Returns:
+        bytes: The canonical XML.
+    """
+    return etree.tostring(_canonical_tree(config_xml, ignore), method='c14n', with_comments=False)
+
+
+def content_hash(config_xml, ignore=None):
+    """
+    Get a stable content hash of a job or view config, computed over its canonical form.
+
+    Configs that cannot be parsed are hashed over their raw text with surrounding whitespace removed.
+
+    Args:
+        config_xml (str): The configuration XML.
+        ignore (list, optional): XPath ignore-rules. Defaults to cfg.ignore_rules.
+
+    Returns:
+        str: The SHA-256 hex digest.
+    """
+    try:
+        data = canonicalize(config_xml, ignore)
+    except etree.XMLSyntaxError:
+        data = config_xml.strip().encode('utf-8') if isinstance(config_xml, str) else config_xml.strip()
+    return hashlib.sha256(data).hexdigest()
+
+
+def _describe(element):
+    return etree.tostring(element, method='c14n', with_comments=False).decode('utf-8')
+
+
+def _diff_elements(old, new, path, changes):
+    for name in sorted(set(old.attrib) | set(new.attrib)):
+        old_value, new_value = old.attrib.get(name), new.attrib.get(name)
+        if old_value != new_value:
+            change = 'added' if old_value is None else 'removed' if new_value is None else 'changed'
+            changes.append({'path': f'{path}/@{name}', 'change': change, 'old': old_value, 'new': new_value})
+
+    if (old.text or '') != (new.text or ''):
+        changes.append({'path': f'{path}/text()', 'change': 'changed', 'old': old.text, 'new': new.text})
+
+    # Children are paired by tag and position among siblings with the same tag
+    old_children, new_children = {}, {}
+    tags = []
+    for children, element in ((old_children, old), (new_children, new)):
+        for child in element:
+            if not isinstance(child.tag, str):
+                continue
+            if child.tag not in old_children and child.tag not in new_children:
+                tags.append(child.tag)
+            children.setdefault(child.tag, []).append(child)
+
+    for tag in tags:
+        old_list, new_list = old_children.get(tag, []), new_children.get(tag, [])
+        for index in range(max(len(old_list), len(new_list))):
+            child_path = f'{path}/{tag}[{index + 1}]'
+            if index >= len(old_list):
+                changes.append({'path': child_path, 'change': 'added', 'old': None,
+                                'new': _describe(new_list[index])})
+            elif index >= len(new_list):
+                changes.append({'path': child_path, 'change': 'removed', 'old': _describe(old_list[index]),
+                                'new': None})
+            else:
+                _diff_elements(old_list[index], new_list[index], child_path, changes)
+
+
+def diff(config_xml, other_config_xml, ignore=None):
+    """
+    Get the structural differences between two job or view configs.
+
+    Both configs are compared in their canonical form, so only changes in meaning are reported.
+
+    Args:
+        config_xml (str): The configuration XML to compare from, e.g. production's.
+        other_config_xml (str): The configuration XML to compare to, e.g. interim's.
+        ignore (list, optional): XPath ignore-rules. Defaults to cfg.ignore_rules.
+
+    Returns:
+        list: One dict per difference with 'path', 'change' ("added", "removed" or "changed"), 'old' and 'new'.
+    """
+    old = _canonical_tree(config_xml, ignore)
+    new = _canonical_tree(other_config_xml, ignore)
+    changes = []
+    if old.tag != new.tag:
+        changes.append({'path': '/', 'change': 'changed', 'old': _describe(old), 'new': _describe(new)})
+        return changes
+    _diff_elements(old, new, f'/{old.tag}', changes)
+    return changes
@@ -6,4 +6,21 @@ allowDuplicates = None
 mode = None
 table = None
 console = None
-width = 149
\ No newline at end of file
+width = 149
+snapshot = None
+max_workers = 1
+max_workers_per_server = {}
+inventory_backend = 'config'
+transfer_workers = 1
+skipUnchanged = False
+ignore_rules = []
+event_callback = None
+folder_depth = None
+plan = None
+pending_plan = None
+update_center = None
+update_center_ttl = 86400
+update_center_cache_dir = None
+update_center_index = None
+plugin_cache_size = 256
+analysis_processes = 1
@@ -0,0 +1,97 @@
+"""
+
+Summary - Typed events emitted while a transfer runs, so callers can follow its progress as it happens.
+
+"""
+
+import queue
+import threading
+import time
+from . import config as cfg
+
+# Event kinds
+FETCHED = 'fetched'
+PLUGINS_CHECKED = 'plugins_checked'
+CREATED = 'created'
+UPDATED = 'updated'
+UNCHANGED = 'unchanged'
+DELETED = 'deleted'
+VIEW_CREATED = 'view_created'
+VIEW_UPDATED = 'view_updated'
+VIEW_DELETED = 'view_deleted'
+FAILED = 'failed'
+FINISHED = 'finished'
+
+
+class TransferEvent:
+    """
+    A single step of a transfer.
+
+    Attributes:
+        kind (str): One of the event kinds above, e.g. CREATED.
+        entity (str): "job" or "view", or None for events about the whole transfer.
+        name (str): The name of the job or view, or None.
+        detail: The error message of FAILED events, whether the plugins are installed for PLUGINS_CHECKED
+                events and the result of the transfer for FINISHED events; None otherwise.
+        time (float): When the event happened, as returned by time.time().
+    """
+
+    __slots__ = ('kind', 'entity', 'name', 'detail', 'time')
+
+    def __init__(self, kind, entity=None, name=None, detail=None):
+        self.kind = kind
+        self.entity = entity
+        self.name = name
+        self.detail = detail
+        self.time = time.time()
+
+    def __repr__(self):
+        return f"TransferEvent({self.kind!r}, {self.entity!r}, {self.name!r}, {self.detail!r})"
+
+
+def emit(kind, entity=None, name=None, detail=None):
+    """
+    Pass an event to cfg.event_callback, if one is set.
+
+    The callback is called from the thread doing the step, which is a worker thread for concurrent transfers.
+
+    Args:
+        kind (str): The event kind.
+        entity (str, optional): "job" or "view".
+        name (str, optional): The name of the job or view.
+        detail (optional): See TransferEvent.
+    """
+    callback = cfg.event_callback
+    if callback is None:
+        return
+    try:
+        callback(TransferEvent(kind, entity, name, detail))
+    except Exception as e:
+        print("Error in event callback: ", e)
+
+
+def iterate(run):
+    """
+    Run a transfer in a background thread and yield its events as they are emitted.
+
+    Args:
+        run: A callable taking the event callback and returning the result of the transfer.
+
+    Yields:
+        TransferEvent: The events of the transfer, ending with a FINISHED event holding its result.
+    """
+    events = queue.Queue()
+
+    def target():
+        result = False
+        try:
+            result = run(events.put)
+        finally:
+            events.put(TransferEvent(FINISHED, detail=result))
+
+    threading.Thread(target=target, daemon=True).start()
+    while True:
+        event = events.get()
+        yield event
+        if event.kind == FINISHED:
+            return
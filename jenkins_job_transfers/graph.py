@@ -0,0 +1,195 @@
+"""
+
+Summary - Dependencies between jobs, read from their configs: the jobs a job triggers and the jobs that trigger it,
+          and the order jobs are transferred in so that every job comes after the jobs it depends on.
+
+"""
+
+import re
+
+# Comma-separated names of the jobs triggered after a build: Build other projects, and the parameterized trigger
+# publisher and build step
+DOWNSTREAM_XPATH = ('//hudson.tasks.BuildTrigger/childProjects'
+                    ' | //*[contains(local-name(), "BuildTriggerConfig")]/projects')
+
+# Comma-separated names of the jobs whose builds trigger this one: Build after other projects are built
+UPSTREAM_XPATH = '//jenkins.triggers.ReverseBuildTrigger/upstreamProjects'
+
+# The script of a pipeline job defined in its config
+PIPELINE_SCRIPT_XPATH = '/flow-definition/definition/script'
+
+# Pipeline build steps: build 'name', build job: 'name', build(job: "name", ...)
+BUILD_STEP = re.compile(r'''\bbuild\s*\(?\s*(?:job\s*:\s*)?(['"])([^'"]+)\1''')
+
+
+def _split_names(text):
+    """
+    Returns the names in a comma-separated list, leaving out names built from parameters, e.g. "${TARGET}".
+    """
+    return [name.strip() for name in (text or '').split(',') if name.strip() and '$' not in name]
+
+
+def _normalize(path):
+    parts = []
+    for part in path.split('/'):
+        if part == '..':
+            if parts:
+                parts.pop()
+        elif part and part != '.':
+            parts.append(part)
+    return '/'.join(parts)
+
+
+def resolve_job_name(name, job, jobs):
+    """
+    Resolves a job name referenced in the config of job the way Jenkins does: relative to the folder containing
+    job, else from the root. Names starting with "/" are absolute.
+
+    Args:
+        name (str): The referenced name, e.g. "deploy", "../common/deploy" or "/team/deploy".
+        job (str): The full name of the job whose config references it.
+        jobs (set): The full names of the existing jobs.
+
+    Returns:
+        str: The full name of the referenced job, or None if there is no such job.
+    """
+    if name.startswith('/'):
+        candidates = [_normalize(name)]
+    else:
+        parent = job.rsplit('/', 1)[0] if '/' in job else ''
+        candidates = [_normalize(f'{parent}/{name}'), _normalize(name)]
+    for candidate in candidates:
+        if candidate in jobs:
+            return candidate
+    return None
+
+
+def get_trigger_names(tree):
+    """
+    Get the names of the jobs a job triggers and of the jobs that trigger it, as written in its config.
+
+    Args:
+        tree (lxml.etree._Element): The root element of the job's config.
+
+    Returns:
+        tuple: The list of downstream job names and the list of upstream job names.
+    """
+    downstream = []
+    for element in tree.xpath(DOWNSTREAM_XPATH):
+        downstream.extend(_split_names(element.text))
+    for element in tree.xpath(PIPELINE_SCRIPT_XPATH):
+        downstream.extend(match.group(2) for match in BUILD_STEP.finditer(element.text or '')
+                          if '$' not in match.group(2))
+
+    upstream = []
+    for element in tree.xpath(UPSTREAM_XPATH):
+        upstream.extend(_split_names(element.text))
+    return downstream, upstream
+
+
+def resolve_job_names(names, job, jobs):
+    """
+    Returns the full names of the existing jobs among the names referenced in the config of job, see
+    resolve_job_name, leaving out job itself.
+    """
+    return {resolved for resolved in (resolve_job_name(name, job, jobs) for name in names)
+            if resolved is not None and resolved != job}
+
+
+def build_graph(triggers, jobs):
+    """
+    Build the dependency graph of jobs.
+
+    Args:
+        triggers (dict): The full names of the jobs as keys and the downstream and upstream job names in their
+                         configs as values, see get_trigger_names.
+        jobs (set): The full names of the existing jobs; references to other jobs are left out.
+
+    Returns:
+        dict: Every job of triggers, and every job they reference, as keys, with the set of jobs it triggers.
+    """
+    graph = {job: set() for job in triggers}
+    for job, (downstream, upstream) in triggers.items():
+        downstream = resolve_job_names(downstream, job, jobs)
+        graph[job].update(downstream)
+        for name in downstream:
+            graph.setdefault(name, set())
+        for name in resolve_job_names(upstream, job, jobs):
+            graph.setdefault(name, set()).add(job)
+    return graph
+
+
+def related_jobs(job_names, graph, upstream=False, downstream=False):
+    """
+    Get the jobs triggering job_names, or triggered by them, directly or through other jobs.
+
+    Args:
+        job_names (list): The jobs to start from.
+        graph (dict): The dependency graph, see build_graph.
+        upstream (bool): Whether to include the jobs triggering them.
+        downstream (bool): Whether to include the jobs they trigger.
+
+    Returns:
+        list: The related jobs that are not in job_names, sorted.
+    """
+    reverse = {}
+    for job, triggered in graph.items():
+        for name in triggered:
+            reverse.setdefault(name, set()).add(job)
+
+    # Each direction is followed on its own, so the other jobs triggered by an upstream job are not included
+    found = set()
+    for include, edges in ((upstream, reverse), (downstream, graph)):
+        if not include:
+            continue
+        seen = set(job_names)
+        pending = list(job_names)
+        while pending:
+            for name in edges.get(pending.pop(), set()) - seen:
+                seen.add(name)
+                pending.append(name)
+        found |= seen
+    return sorted(found - set(job_names))
+
+
+def topological_levels(job_names, edges):
+    """
+    Group jobs into levels such that every job is in a later level than the jobs it depends on; the jobs of a
+    level do not depend on each other and can be transferred concurrently.
+
+    Jobs in a dependency cycle cannot be ordered; they go together in a last level.
+
+    Args:
+        job_names (list): The jobs to order.
+        edges (dict): Job names as keys with the set of jobs that must come after them. Jobs not in job_names
+                      are ignored.
+
+    Returns:
+        list: The levels, each a list of job names in the order of job_names.
+    """
+    names = set(job_names)
+    predecessors = {job: 0 for job in job_names}
+    for job in job_names:
+        for name in edges.get(job, ()):
+            if name in names and name != job:
+                predecessors[name] += 1
+
+    levels = []
+    current = [job for job in job_names if predecessors[job] == 0]
+    placed = set()
+    while current:
+        levels.append(current)
+        placed.update(current)
+        following = set()
+        for job in current:
+            for name in edges.get(job, ()):
+                if name in names and name != job:
+                    predecessors[name] -= 1
+                    if predecessors[name] == 0:
+                        following.add(name)
+        current = [job for job in job_names if job in following]
+
+    cycle = [job for job in job_names if job not in placed]
+    if cycle:
+        levels.append(cycle)
+    return levels
@@ -0,0 +1,235 @@
+"""
+
+Summary - Snapshot of the views, jobs and plugins of the production and interim servers, shared by all checks.
+
+"""
+
+import threading
+from . import utils as jutils
+from . import config as cfg
+
+
+class ServerInventory:
+    """
+    Cached views->jobs map, job list, views list and plugins of a single Jenkins server.
+
+    Each collection is fetched on first use and reused afterwards. Writes made through utils only
+    invalidate the entities they touch, so a view that was updated is re-read on its own instead of
+    re-downloading every view config of the server.
+
+    The inventory is shared by the transfer workers; a lock guards every load and update, and the
+    views->jobs map is replaced rather than modified so callers can keep iterating the copy they got.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self._views_and_jobs = None
+        self._stale_views = set()
+        self._job_views = None
+        self._job_views_source = None
+        self._job_list = None
+        self._views_list = None
+        self._plugin_versions = None
+        self._tree = None
+        self._lock = threading.RLock()
+
+    def _get_tree(self):
+        """
+        Returns the single-request inventory of the server when the tree backend is in use, else None.
+
+        The views->jobs map, the job list and the views list are all read from the same response. Any
+        write drops it, so collections loaded after a write see the current state of the server.
+        """
+        if cfg.inventory_backend != 'tree':
+            return None
+        if self._tree is None:
+            try:
+                self._tree = jutils.get_inventory_tree(self.conn)
+            except Exception as e:
+                print("Error in get_inventory_tree: ", e)
+                return None
+        return self._tree
+
+    def get_view_and_its_jobs(self):
+        """
+        Returns the cached views->jobs map, re-reading only the views that were written since the last call.
+
+        Returns:
+            dict: View names as keys and a list of job names as values.
+        """
+        with self._lock:
+            if self._views_and_jobs is None:
+                views_and_jobs = jutils.get_view_and_its_jobs(self.conn, tree=self._get_tree())
+                if views_and_jobs is None:
+                    return None
+                self._views_and_jobs = views_and_jobs
+                self._stale_views.clear()
+
+            if self._stale_views:
+                views_and_jobs = dict(self._views_and_jobs)
+                while self._stale_views:
+                    view = self._stale_views.pop()
+                    jobs = jutils.get_jobs_in_view(self.conn, view)
+                    if jobs is None:
+                        views_and_jobs.pop(view, None)
+                    else:
+                        views_and_jobs[view] = jobs
+                self._views_and_jobs = views_and_jobs
+
+            return self._views_and_jobs
+
+    def get_job_views(self):
+        """
+        Returns the inverted views->jobs map: every job that is in a view, with the set of views containing it.
+
+        The index is rebuilt whenever the views->jobs map was re-read, so it always matches get_view_and_its_jobs().
+
+        Returns:
+            dict: Job names as keys and a set of view names as values.
+        """
+        with self._lock:
+            views_and_jobs = self.get_view_and_its_jobs()
+            if views_and_jobs is None:
+                return None
+            if self._job_views_source is not views_and_jobs:
+                job_views = {}
+                for view, jobs in views_and_jobs.items():
+                    for job in jobs:
+                        job_views.setdefault(job, set()).add(view)
+                self._job_views = job_views
+                self._job_views_source = views_and_jobs
+            return self._job_views
+
+    def get_job_list(self):
+        """
+        Returns the cached list of job names.
+        """
+        with self._lock:
+            if self._job_list is None:
+                self._job_list = jutils.get_job_list(self.conn, tree=self._get_tree())
+            return self._job_list
+
+    def get_views_list(self):
+        """
+        Returns the cached list of view names.
+        """
+        with self._lock:
+            if self._views_list is None:
+                self._views_list = jutils.get_views_list(self.conn, tree=self._get_tree())
+            return self._views_list
+
+    def get_plugin_versions(self):
+        """
+        Returns the cached plugin short name -> version mapping.
+        """
+        with self._lock:
+            if self._plugin_versions is None:
+                self._plugin_versions = jutils.get_plugin_versions(self.conn)
+            return self._plugin_versions
+
+    def get_plugin_list(self):
+        """
+        Returns the cached list of plugin short names.
+        """
+        plugin_versions = self.get_plugin_versions()
+        if plugin_versions is None:
+            return None
+        return list(plugin_versions)
+
+    def job_created(self, job_name):
+        with self._lock:
+            self._tree = None
+            if self._job_list is not None and job_name not in self._job_list:
+                self._job_list.append(job_name)
+
+    def job_deleted(self, job_name):
+        with self._lock:
+            self._tree = None
+            if self._job_list is not None and job_name in self._job_list:
+                self._job_list.remove(job_name)
+            # Deleted jobs disappear from the views containing them
+            if self._views_and_jobs is not None:
+                for view, jobs in self._views_and_jobs.items():
+                    if job_name in jobs:
+                        self._stale_views.add(view)
+
+    def view_written(self, view_name):
+        with self._lock:
+            self._tree = None
+            if self._views_list is not None and view_name not in self._views_list:
+                self._views_list.append(view_name)
+            self._stale_views.add(view_name)
+
+    def view_deleted(self, view_name):
+        with self._lock:
+            self._tree = None
+            if self._views_list is not None and view_name in self._views_list:
+                self._views_list.remove(view_name)
+            self._stale_views.add(view_name)
+
+    def plugins_changed(self):
+        with self._lock:
+            self._plugin_versions = None
+
+
+class Snapshot:
+    """
+    Inventory of both servers, built once per public call and shared by job_pre_check, view_pre_check,
+    the transfer planner and the executor.
+    """
+
+    def __init__(self, production_conn, interim_conn):
+        self.production = ServerInventory(production_conn)
+        self.interim = ServerInventory(interim_conn)
+        self._plugin_differences = None
+        self._lock = threading.RLock()
+
+    def plugin_differences(self):
+        """
+        Returns the plugins installed in interim but not in production, computed once and reused until
+        plugins_installed() is called.
+
+        Returns:
+            list: Short names of the plugins missing in production.
+        """
+        with self._lock:
+            if self._plugin_differences is None:
+                interim_plugins = self.interim.get_plugin_list()
+                production_plugins = self.production.get_plugin_list()
+                if interim_plugins is None or production_plugins is None:
+                    raise ValueError("Plugin List NOT RETRIEVED")
+                self._plugin_differences = list(set(interim_plugins).difference(production_plugins))
+            return self._plugin_differences
+
+    def plugins_installed(self):
+        """
+        Drops the production plugin list and the plugin differences after plugins were installed in production.
+        """
+        with self._lock:
+            self.production.plugins_changed()
+            self._plugin_differences = None
+
+
+def reset_snapshot():
+    """
+    Discards the current snapshot and starts a new one for the connections in config.
+
+    Returns:
+        Snapshot: The new snapshot.
+    """
+    cfg.snapshot = Snapshot(cfg.production_conn, cfg.interim_conn)
+    return cfg.snapshot
+
+
+def get_snapshot():
+    """
+    Returns the current snapshot, creating one if none exists for the connections in config.
+
+    Returns:
+        Snapshot: The current snapshot.
+    """
+    snapshot = cfg.snapshot
+    if snapshot is None or snapshot.production.conn is not cfg.production_conn \
+            or snapshot.interim.conn is not cfg.interim_conn:
+        snapshot = reset_snapshot()
+    return snapshot
@@ -0,0 +1,45 @@
+"""
+
+Summary - Modules imported on first use, so importing the package stays cheap for short-lived scripts.
+
+"""
+
+import importlib
+
+
+class LazyModule:
+    """
+    Stands in for a module until one of its attributes is used, then imports it.
+
+    The import goes through importlib, so concurrent first uses from worker threads are safe.
+    """
+
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            module = importlib.import_module(self.__dict__['_name'])
+            self.__dict__['_module'] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        return f"<lazy module {self.__dict__['_name']!r}>"
+
+
+def lazy_import(name):
+    """
+    Get a module that is only imported when one of its attributes is first used.
+
+    Args:
+        name (str): The full name of the module, e.g. "lxml.etree".
+
+    Returns:
+        LazyModule: The stand-in for the module.
+    """
+    return LazyModule(name)
@@ -0,0 +1,637 @@
+"""
+
+Summary - Transfer plans: every write a transfer makes, decided against one inventory snapshot before anything is
+          written, and the executor that applies them.
+
+A plan is a plain dict that can be saved as JSON and executed later, e.g. the plan computed by
+check_publish_standards can be handed to transfer instead of running the checks again. It doubles as a token:
+it carries a fingerprint of both inventories, so only what changed since it was made is verified again, and a
+digest of its own content, so a plan that was edited or corrupted is refused.
+
+"""
+
+import hashlib
+import json
+import threading
+import time
+from . import baseModule as jbm
+from . import utils as jutils
+from . import config as cfg
+from . import inventory as jinv
+from . import events as jevents
+from . import results as jres
+from . import graph as jgraph
+from . import analysis as janalysis
+from . import updatecenter as jupdates
+
+PLAN_FORMAT = 4
+
+# HTTP requests the executor makes for each step, to both servers. python-jenkins checks that an item does not exist
+# before creating it and that it exists (or not) after creating (or deleting) it. With skipUnchanged an update reads
+# the production config too, and a crumb is fetched once per connection; neither is counted.
+STEP_REQUESTS = {
+    ('folder', 'create'): 5,    # job_exists, interim config.xml, job_exists, createItem, job_exists
+    ('job', 'create'): 4,       # interim config.xml, job_exists, createItem, job_exists
+    ('job', 'update'): 2,       # interim config.xml, config.xml
+    ('job', 'delete'): 2,       # doDelete, job_exists
+    ('view', 'create'): 4,      # interim config.xml, view_exists, createView, view_exists
+    ('view', 'update'): 2,      # interim config.xml, config.xml
+    ('view', 'delete'): 2,      # doDelete, view_exists
+}
+
+# One script console request, then at least one poll of the update center
+PLUGIN_INSTALL_REQUESTS = 2
+
+# The order the executor makes the steps in: creates and updates keep the order of the publish list
+STEP_ORDER = {
+    ('folder', 'create'): 0,
+    ('job', 'delete'): 1,
+    ('job', 'create'): 2,
+    ('job', 'update'): 2,
+    ('view', 'create'): 3,
+    ('view', 'update'): 3,
+    ('view', 'delete'): 4,
+}
+
+# Jobs whose config changed since the plan was made have their plugins installed one at a time
+_plugins_lock = threading.Lock()
+
+
+def step(kind, action, name, **details):
+    """
+    Returns a plan step, with the number of requests the executor makes for it.
+    """
+    return dict(kind=kind, action=action, name=name, requests=STEP_REQUESTS[(kind, action)], **details)
+
+
+def digest(data):
+    """
+    Returns the SHA-256 hex digest of a JSON-serializable value, independent of the order of dict keys.
+    """
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def fingerprint(snapshot):
+    """
+    Returns the digests of the job list, the views->jobs map and the plugin versions of both servers in the snapshot.
+
+    Returns:
+        dict: 'production' and 'interim', each a dict with the 'jobs', 'views' and 'plugins' digests.
+    """
+    result = {}
+    for server, inventory in (('production', snapshot.production), ('interim', snapshot.interim)):
+        views_and_jobs = inventory.get_view_and_its_jobs() or {}
+        result[server] = {
+            'jobs': digest(sorted(inventory.get_job_list() or [])),
+            'views': digest({view: sorted(jobs) for view, jobs in views_and_jobs.items()}),
+            'plugins': digest(inventory.get_plugin_versions() or {}),
+        }
+    return result
+
+
+def seal(plan):
+    """
+    Updates the request estimate and the token of a plan after it was made or changed.
+
+    Returns:
+        dict: The plan.
+    """
+    plan['requests'] = sum(s['requests'] for s in plan['steps']) + (PLUGIN_INSTALL_REQUESTS if plan['plugins'] else 0)
+    plan['token'] = digest({key: value for key, value in plan.items() if key != 'token'})
+    return plan
+
+
+def job_plugin_fields(requires, plugins_missing, production_plugins, cache):
+    """
+    Returns the plugin fields of a job step: the 'plugins' to install in production, and the plugins installed
+    there in an 'older' or 'newer' version than the job was saved with, see baseModule.compare_plugin_versions.
+    """
+    status = jbm.compare_plugin_versions(requires, production_plugins, cache)
+    return {'plugins': sorted(plugins_missing.intersection(status['missing'])), 'older': status['older'],
+            'newer': status['newer']}
+
+
+def add_plugin_version_rows(plan):
+    """
+    Adds to cfg.table the number of jobs with plugins that are older or newer in production than the versions the
+    jobs were saved with.
+    """
+    older = [s['name'] for s in plan['steps'] if s.get('older')]
+    newer = [s['name'] for s in plan['steps'] if s.get('newer')]
+    if older or newer:
+        cfg.table.add_row("Plugin Versions", f"Older in Production: {len(older)} Jobs",
+                          f"Newer in Production: {len(newer)} Jobs")
+
+
+def build_plan(publish_list, ftype, check=True, upstream=False, downstream=False):
+    """
+    Decides every write a transfer of publish_list makes, against the current inventory snapshot.
+
+    The configs of the jobs and views to write are read from interim to find the plugins they need, the jobs they
+    trigger and to record their content hash; nothing is written to either server. Jobs are written in
+    dependency levels: a job comes after the jobs triggering it and after the folder containing it.
+
+    Parameters:
+    - publish_list (list): The jobs/views to be transferred.
+    - ftype (str): "job" or "view".
+    - check (bool, optional): Whether to run the publish standards pre-check, on the jobs added for the
+                              dependencies too. Defaults to True.
+    - upstream (bool, optional): Whether to transfer the jobs triggering the jobs too, directly or through other
+                                 jobs. The configs of all interim jobs are read to find them. Defaults to False.
+    - downstream (bool, optional): Whether to transfer the jobs triggered by the jobs too, the same way.
+                                   Defaults to False.
+
+    Returns:
+    - dict: The plan, with
+        'steps': the writes in the order they are made, each a dict with 'kind' ("folder", "job" or "view"),
+                 'action' ("create", "update" or "delete"), 'name' and 'requests', plus the interim 'hash' of
+                 the configs to write, the missing 'plugins', required plugins with their versions ('requires'),
+                 the plugins production has 'older' or 'newer' versions of and the dependency 'level' of jobs, and
+                 the planned 'jobs' of views.
+        'dependencies': whether 'upstream' and 'downstream' jobs were included, and the jobs 'added' for them.
+        'plugins': the plugins to install in production.
+        'failures': the jobs/views that cannot be transferred, each a dict with 'kind', 'name' and 'error'.
+        'passed': the result of the pre-check, or None if it was not run.
+        'requests': the estimated number of requests made by the executor.
+        'fingerprint': the inventories the plan was made against, see fingerprint().
+        'token': the digest of the rest of the plan.
+    """
+    interim_conn = cfg.interim_conn
+    production_conn = cfg.production_conn
+    snapshot = jinv.get_snapshot()
+
+    passed = None
+    if check:
+        passed = jbm.job_pre_check(publish_list) if ftype == 'job' else jbm.view_pre_check(publish_list)
+
+    interim_jobs_list = snapshot.interim.get_job_list()
+    production_jobs_list = snapshot.production.get_job_list()
+    interim_views_and_jobs = snapshot.interim.get_view_and_its_jobs()
+    production_views_and_jobs = snapshot.production.get_view_and_its_jobs()
+    if interim_jobs_list is None or production_jobs_list is None:
+        raise ValueError("Job List NOT RETRIEVED")
+    if interim_views_and_jobs is None or production_views_and_jobs is None:
+        raise ValueError("Views List NOT RETRIEVED")
+
+    steps = []
+    failures = []
+
+    # The jobs to write, and for a list of views the jobs of each view
+    jobs, view_jobs = [], {}
+    if ftype == 'job':
+        for job in dict.fromkeys(publish_list):
+            if job in interim_jobs_list:
+                jobs.append(job)
+                continue
+            failures.append({'kind': 'job', 'name': job, 'error': "DOES NOT Exist in Interim Server"})
+            if job in production_jobs_list:
+                steps.append(step('job', 'delete', job))
+    else:
+        for view in dict.fromkeys(publish_list):
+            if view in interim_views_and_jobs:
+                view_jobs[view] = list(interim_views_and_jobs[view])
+                jobs.extend(job for job in view_jobs[view] if job not in jobs)
+                continue
+            failures.append({'kind': 'view', 'name': view, 'error': "DOES NOT Exist in Interim Server"})
+            if view in production_views_and_jobs:
+                steps.append(step('view', 'delete', view))
+
+    def fetch(job):
+        return jutils.get_config_xml(interim_conn, job)
+
+    # Configs are fetched on threads, then parsed, in worker processes if set with set_analysis_processes
+    interim_jobs = set(interim_jobs_list)
+    added = []
+    if upstream or downstream:
+        # Any interim job may trigger the jobs, or be triggered by them
+        all_configs = jutils.map_concurrently(interim_conn, fetch, interim_jobs_list)
+        all_analyses = janalysis.analyze(janalysis.analyze_job_config, all_configs)
+        analyses = {job: analysis for job, analysis in zip(interim_jobs_list, all_analyses) if analysis}
+        triggers = {job: (analysis['downstream'], analysis['upstream']) for job, analysis in analyses.items()}
+        added = jgraph.related_jobs(jobs, jgraph.build_graph(triggers, interim_jobs), upstream, downstream)
+        jobs.extend(added)
+        if check and added:
+            # The jobs added for the dependencies would overwrite production jobs as well
+            passed = jbm.job_pre_check(added) and passed
+        all_configs = dict(zip(interim_jobs_list, all_configs))
+        configs = [all_configs.get(job) for job in jobs]
+    else:
+        configs = jutils.map_concurrently(interim_conn, fetch, jobs)
+        analyses = {job: analysis for job, analysis in
+                    zip(jobs, janalysis.analyze(janalysis.analyze_job_config, configs)) if analysis}
+
+    plugins_missing = set(snapshot.plugin_differences())
+    production_plugins = snapshot.production.get_plugin_versions() or {}
+    plugin_status = {}
+    plugins = set()
+    folders = []
+    written = []
+    for job, config_xml in zip(jobs, configs):
+        if not config_xml:
+            failures.append({'kind': 'job', 'name': job, 'error': "config.xml NOT RETRIEVED in Interim Server"})
+            continue
+        analysis = analyses.get(job)
+        requires = jbm.get_job_plugin_versions(config_xml, analysis['plugins']) if analysis else {}
+        fields = job_plugin_fields(requires, plugins_missing, production_plugins, plugin_status)
+        plugins.update(fields['plugins'])
+
+        parts = job.split('/')[:-1]
+        for index in range(1, len(parts) + 1):
+            folder = '/'.join(parts[:index])
+            if folder in folders or folder in jobs or folder in production_jobs_list:
+                continue
+            if not production_conn.job_exists(folder):
+                folders.append(folder)
+
+        action = 'update' if job in production_jobs_list else 'create'
+        steps.append(step('job', action, job, hash=jutils.config_hash(config_xml), requires=requires, **fields))
+        written.append(job)
+    steps.extend(step('folder', 'create', folder) for folder in folders)
+
+    # Jobs are written after the jobs triggering them, and after the folders containing them
+    edges = jgraph.build_graph({job: (analyses[job]['downstream'], analyses[job]['upstream'])
+                                for job in written if job in analyses}, interim_jobs)
+    for job in written:
+        parts = job.split('/')
+        for index in range(1, len(parts)):
+            edges.setdefault('/'.join(parts[:index]), set()).add(job)
+    levels = {job: index for index, level in enumerate(jgraph.topological_levels(written, edges)) for job in level}
+    for s in steps:
+        if s['kind'] == 'job' and s['name'] in levels:
+            s['level'] = levels[s['name']]
+
+    # The views to write once the jobs are written: every view containing a written job, or the views listed
+    if ftype == 'job':
+        for job in written:
+            for view in jbm.affected_views(job):
+                view_jobs.setdefault(view, []).append(job)
+    view_jobs = {view: [job for job in view_jobs[view] if job in written] for view in view_jobs}
+    view_names = [view for view in view_jobs if view_jobs[view]]
+    view_configs = jutils.map_concurrently(interim_conn,
+                                           lambda view: jutils.get_view_config_xml(interim_conn, view), view_names)
+    for view, config_xml in zip(view_names, view_configs):
+        if not config_xml:
+            failures.append({'kind': 'view', 'name': view, 'error': "config.xml NOT RETRIEVED in Interim Server"})
+            continue
+        action = 'update' if view in production_views_and_jobs else 'create'
+        steps.append(step('view', action, view, hash=jutils.config_hash(config_xml), jobs=view_jobs[view]))
+
+    # Production views left without jobs are deleted at the end, as production_cleanup would
+    deleted_jobs = {s['name'] for s in steps if s['kind'] == 'job' and s['action'] == 'delete'}
+    planned_views = {s['name'] for s in steps if s['kind'] == 'view'}
+    for view, view_jobs_in_production in production_views_and_jobs.items():
+        if view == 'all' or view in planned_views:
+            continue
+        if not set(view_jobs_in_production) - deleted_jobs:
+            steps.append(step('view', 'delete', view, cleanup=True))
+
+    steps.sort(key=lambda s: (STEP_ORDER[(s['kind'], s['action'])], s.get('level', s['name'].count('/'))))
+
+    plan = seal({
+        'format': PLAN_FORMAT,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'production': cfg.production_url,
+        'interim': cfg.interim_url,
+        'ftype': ftype,
+        'publish_list': list(publish_list),
+        'passed': passed,
+        'plugins': sorted(plugins),
+        'steps': steps,
+        'failures': failures,
+        'dependencies': {'upstream': upstream, 'downstream': downstream, 'added': added},
+        'fingerprint': fingerprint(snapshot),
+    })
+    if added:
+        cfg.table.add_row("Dependencies", "Jobs Added", ", ".join(added))
+    cfg.table.add_row("Transfer Plan", f"Steps: {len(steps)}", f"Plugins: {len(plugins)}",
+                      f"Failures: {len(failures)}", f"Requests: {plan['requests']}")
+    add_plugin_version_rows(plan)
+    return plan
+
+
+def pre_check(plan):
+    """
+    Runs the publish standards pre-check on the publish list of a plan and on the jobs added for their dependencies.
+
+    Returns:
+    - bool: True if all of them meet the standards, False otherwise.
+    """
+    publish_list = plan['publish_list']
+    passed = jbm.job_pre_check(publish_list) if plan['ftype'] == 'job' else jbm.view_pre_check(publish_list)
+    added = plan['dependencies']['added']
+    if added:
+        passed = jbm.job_pre_check(added) and passed
+    return passed
+
+
+def refresh_plan(plan, check=False):
+    """
+    Verifies a plan against the current inventory snapshot, re-doing only what changed since it was made.
+
+    - Nothing changed: the plan is used as it is, without reading any config again.
+    - Only plugins changed: the plugins each job is missing, or has other versions of, are worked out again from
+      the plugins it requires.
+    - Jobs or views changed in either server: the transfer is planned again.
+
+    Changes to configs do not show in the inventories; the executor compares every config it writes with the hash
+    in the plan and checks the plugins of the configs that changed.
+
+    Parameters:
+    - plan (dict): A plan that passed check_plan.
+    - check (bool, optional): Whether to run the publish standards pre-check again. Defaults to False.
+
+    Returns:
+    - dict: The plan to execute, with a new fingerprint and token; the given plan is not modified.
+    """
+    snapshot = jinv.get_snapshot()
+    current = fingerprint(snapshot)
+    previous = plan['fingerprint']
+    check = check or plan['passed'] is not None
+
+    if any(current[server][part] != previous[server][part] for server in current for part in ('jobs', 'views')):
+        cfg.table.add_row("Transfer Plan", "Outdated", "Jobs/Views Changed Since the Plan Was Made")
+        dependencies = plan['dependencies']
+        return build_plan(plan['publish_list'], plan['ftype'], check=check, upstream=dependencies['upstream'],
+                          downstream=dependencies['downstream'])
+
+    plan = dict(plan, steps=[dict(s) for s in plan['steps']])
+    if current != previous:
+        plugins_missing = set(snapshot.plugin_differences())
+        production_plugins = snapshot.production.get_plugin_versions() or {}
+        plugin_status = {}
+        plugins = set()
+        for s in plan['steps']:
+            if 'requires' in s:
+                s.update(job_plugin_fields(s['requires'], plugins_missing, production_plugins, plugin_status))
+                plugins.update(s['plugins'])
+        plan['plugins'] = sorted(plugins)
+        cfg.table.add_row("Transfer Plan", "Plugins Changed", f"Plugins: {len(plugins)}")
+        add_plugin_version_rows(plan)
+    else:
+        cfg.table.add_row("Transfer Plan", "Up to Date", f"Steps: {len(plan['steps'])}")
+
+    if check:
+        plan['passed'] = pre_check(plan)
+    plan['fingerprint'] = current
+    return seal(plan)
+
+
+def remember(plan):
+    """
+    Keeps a plan as the plan of the last public call, see get_plan().
+
+    Returns:
+        dict: The plan.
+    """
+    cfg.plan = plan
+    cfg.pending_plan = None
+    return plan
+
+
+def defer_plan(publish_list, ftype, passed):
+    """
+    Keeps the publish standards pre-check of publish_list, so that last_plan plans its transfer on first use
+    instead of the check reading every config it would write.
+    """
+    cfg.plan = None
+    cfg.pending_plan = {'publish_list': list(publish_list), 'ftype': ftype, 'passed': passed}
+
+
+def last_plan():
+    """
+    Returns the plan of the last public call; a deferred check is planned now, against the current snapshot, with
+    the result of its pre-check.
+
+    Returns:
+        dict: The plan, or None if no transfer was planned or checked yet.
+    """
+    pending = cfg.pending_plan
+    if pending is not None:
+        plan = build_plan(pending['publish_list'], pending['ftype'], check=False)
+        plan['passed'] = pending['passed']
+        remember(seal(plan))
+    return cfg.plan
+
+
+def current_plan(publish_list, ftype, check=False):
+    """
+    Returns the plan of the last public call if it is for the same jobs/views and servers, verified again with
+    refresh_plan, else a new plan.
+    """
+    plan = last_plan()
+    try:
+        check_plan(plan, publish_list, ftype)
+    except ValueError:
+        return build_plan(publish_list, ftype, check=check)
+    return refresh_plan(plan, check=check)
+
+
+def add_plan_rows(plan):
+    """
+    Adds a row per step and per failure of the plan to cfg.table.
+    """
+    for s in plan['steps']:
+        cfg.table.add_row("", s['name'], s['kind'].title(), s['action'].title(), ", ".join(s.get('plugins', [])))
+    for failure in plan['failures']:
+        cfg.table.add_row("", failure['name'], failure['kind'].title(), "Failed", failure['error'])
+
+
+def plugin_dependencies(plan):
+    """
+    Adds the plugins each job of the plan is missing in production to cfg.table, as check_plugin_dependencies
+    reports them, and the plugins whose production version is older or newer than the version the job was saved
+    with. With an update center set, the plugins they need in turn are added too.
+
+    Returns:
+        dict: For a list of jobs, every job with the list of plugins it is missing; for a list of views, only the
+              jobs that are missing plugins.
+    """
+    job_steps = {s['name']: s for s in plan['steps'] if 'requires' in s}
+    index = jupdates.get_index()
+    production_plugins = {}
+    if index is not None:
+        production_plugins = jinv.get_snapshot().production.get_plugin_versions() or {}
+
+    def report(job):
+        s = job_steps.get(job)
+        if s is None:
+            cfg.table.add_row("", "FAILED", "Job Not Present in Interim Server")
+            return []
+        cfg.table.add_row("Plugin Check", job)
+        if s['plugins']:
+            cfg.table.add_row("", "Plugins to be INSTALLED", str(s['plugins']))
+            if index is not None:
+                to_install, unavailable = jupdates.install_set(s['plugins'], index, production_plugins)
+                dependencies = [plugin for plugin in to_install if plugin not in s['plugins']]
+                if dependencies:
+                    cfg.table.add_row("", "Plugin Dependencies to be INSTALLED", str(dependencies))
+                if unavailable:
+                    cfg.table.add_row("", "NOT AVAILABLE in Update Center", str(unavailable))
+        else:
+            cfg.table.add_row("", "SUCCESS", "All Plugins Installed")
+        for status in ('older', 'newer'):
+            if s[status]:
+                versions = [f"{name} {s[status][name]} (Job: {s['requires'][name]})" for name in s[status]]
+                cfg.table.add_row("", f"Plugins {status.upper()} in Production", ", ".join(versions))
+        return s['plugins']
+
+    job_plugins = {}
+    if plan['ftype'] == 'job':
+        for job in plan['publish_list']:
+            cfg.table.add_row("Job", job)
+            job_plugins[job] = report(job)
+            cfg.table.add_row()
+    else:
+        view_steps = {s['name']: s for s in plan['steps'] if 'jobs' in s}
+        for view in plan['publish_list']:
+            if view in view_steps:
+                cfg.table.add_row("View", view)
+                for job in view_steps[view]['jobs']:
+                    plugins = report(job)
+                    if plugins:
+                        job_plugins[job] = plugins
+                cfg.table.add_row()
+    return job_plugins
+
+
+def check_plan(plan, publish_list=None, ftype=None):
+    """
+    Checks that a plan can be executed against the current connections.
+
+    Raises:
+    - ValueError: If the plan has an unsupported format, does not match its token, was made for other servers or
+                  for other jobs/views.
+    """
+    if not isinstance(plan, dict) or plan.get('format') != PLAN_FORMAT:
+        raise ValueError("Unsupported Plan Format")
+    if plan.get('token') != digest({key: value for key, value in plan.items() if key != 'token'}):
+        raise ValueError("Plan Does Not Match Its Token")
+    if plan['production'] != cfg.production_url or plan['interim'] != cfg.interim_url:
+        raise ValueError("Plan Was Made for Other Servers")
+    if publish_list is not None and (plan['publish_list'] != list(publish_list) or plan['ftype'] != ftype):
+        raise ValueError("Plan Does Not Match the Publish List")
+
+
+def execute_plan(plan):
+    """
+    Applies a plan to production: installs its plugins, creates its folders, deletes, creates and updates its jobs,
+    then writes its views and deletes the views left without jobs.
+
+    Jobs are written concurrently, bounded by the transfer workers, one dependency level after another. A view is
+    written only if at least one of its planned jobs was written. Without cfg.allowDuplicates the plan must have
+    passed the publish standards pre-check; plans made without it are checked first.
+
+    Parameters:
+    - plan (dict): A plan returned by build_plan.
+
+    Returns:
+    - bool: True if the plan was applied, False if it could not be; failed jobs/views are in cfg.table.
+    """
+    try:
+        production_conn = cfg.production_conn
+        interim_conn = cfg.interim_conn
+        check_plan(plan)
+
+        if not cfg.allowDuplicates:
+            passed = plan['passed']
+            if passed is None:
+                passed = pre_check(plan)
+            if not passed:
+                raise ValueError('Error: Duplicate Job(s) present')
+
+        if len(plan['publish_list']) == 0:
+            cfg.table.add_row("", "", "Error", "Enter Job Details to Move/Update")
+            return False
+
+        for failure in plan['failures']:
+            jres.record(failure['name'], failure['kind'], 'published', jres.FAILED, failure['error'])
+            jevents.emit(jevents.FAILED, failure['kind'], failure['name'], failure['error'])
+
+        def planned(kind, *actions):
+            return [s for s in plan['steps'] if s['kind'] == kind and s['action'] in actions]
+
+        unavailable = jbm.install_missing_plugins(plan['plugins']) if plan['plugins'] else set()
+
+        for s in planned('folder', 'create'):
+            jbm.create_folder(s['name'])
+
+        jutils.map_concurrently(production_conn, lambda s: jutils.delete_job(s['name']), planned('job', 'delete'),
+                                workers=cfg.transfer_workers)
+
+        def publish(s):
+            started = time.time()
+            job = s['name']
+            try:
+                config_xml = jutils.get_config_xml(interim_conn, job)
+                if not config_xml:
+                    jres.record(job, 'job', 'published', jres.FAILED, "config.xml NOT RETRIEVED in Interim Server",
+                                started)
+                    jevents.emit(jevents.FAILED, 'job', job, "config.xml NOT RETRIEVED in Interim Server")
+                    return False
+                jevents.emit(jevents.FETCHED, 'job', job)
+
+                missing = set(s['plugins'])
+                with _plugins_lock:
+                    if jutils.config_hash(config_xml) != s['hash']:
+                        # The config changed since the plan was made, so it may need other plugins
+                        missing = set(jinv.get_snapshot().plugin_differences()).intersection(
+                            jbm.get_job_specific_plugins(config_xml) or [])
+                        if missing:
+                            unavailable.update(jbm.install_missing_plugins(sorted(missing)))
+                    plugins_installed = not unavailable.intersection(missing)
+                jevents.emit(jevents.PLUGINS_CHECKED, 'job', job, plugins_installed)
+                if not plugins_installed:
+                    jres.record(job, 'job', 'published', jres.FAILED,
+                                "Job Specific Plugin NOT INSTALLED in Production Server", started)
+                    jevents.emit(jevents.FAILED, 'job', job, "Job Specific Plugin NOT INSTALLED in Production Server")
+                    return False
+
+                cfg.table.add_row("Publishing Details", "Name", "Type", "Status", "Action")
+                if s['action'] == 'update':
+                    return jutils.update_job(job, config_xml)
+                return jutils.create_job(job, config_xml)
+
+            except Exception as e:
+                jres.record(job, 'job', 'published', jres.FAILED, str(e), started)
+                jevents.emit(jevents.FAILED, 'job', job, str(e))
+                return False
+
+        # Each dependency level is written once the previous one is, its jobs concurrently
+        levels = {}
+        for s in planned('job', 'create', 'update'):
+            levels.setdefault(s['level'], []).append(s)
+        published = set()
+        for level in sorted(levels):
+            for s, chk in zip(levels[level], jutils.map_concurrently(production_conn, publish, levels[level],
+                                                                     workers=cfg.transfer_workers)):
+                if chk:
+                    published.add(s['name'])
+
+        def write_view(s):
+            view = s['name']
+            config_xml = jutils.get_view_config_xml(interim_conn, view)
+            if not config_xml:
+                jres.record(view, 'view', 'published', jres.FAILED, "config.xml NOT RETRIEVED in Interim Server")
+                jevents.emit(jevents.FAILED, 'view', view, "config.xml NOT RETRIEVED in Interim Server")
+                return False
+            jevents.emit(jevents.FETCHED, 'view', view)
+            if s['action'] == 'update':
+                return jutils.update_view(view, config_xml)
+            return jutils.create_view(view, config_xml)
+
+        # Each view is written once, however many of its jobs were written
+        views = [s for s in planned('view', 'create', 'update') if published.intersection(s['jobs'])]
+        jutils.map_concurrently(production_conn, write_view, views, workers=cfg.transfer_workers)
+
+        # Views planned for clean up are deleted only if they are still empty
+        production_views_and_jobs = jinv.get_snapshot().production.get_view_and_its_jobs()
+        for s in planned('view', 'delete'):
+            if not s.get('cleanup') or not production_views_and_jobs.get(s['name'], [None]):
+                jutils.delete_view(s['name'])
+        cfg.table.add_row("Production CleanUp", "Success")
+        return True
+
+    except Exception as e:
+        cfg.table.add_row("Transfer Status", "Failed", str(e))
+        jevents.emit(jevents.FAILED, detail=str(e))
+        return False
@@ -0,0 +1,180 @@
+"""
+
+Summary - Structured results of the public functions, with the rich table report as an optional view over them.
+
+"""
+
+import time
+from . import config as cfg
+
+SUCCESS = 'success'
+FAILED = 'failed'
+
+
+class Result:
+    """
+    The outcome of a single operation on a job, view or plugin.
+
+    Attributes:
+        entity (str): The name of the job, view or plugin.
+        kind (str): "job", "view" or "plugin".
+        action (str): What was done, e.g. "created", "updated", "unchanged", "deleted" or "published".
+        status (str): SUCCESS or FAILED.
+        error (str): The error message of failed operations, else None.
+        started (float): When the operation started, as returned by time.time().
+        elapsed (float): How long the operation took, in seconds.
+    """
+
+    __slots__ = ('entity', 'kind', 'action', 'status', 'error', 'started', 'elapsed')
+
+    def __init__(self, entity, kind, action, status=SUCCESS, error=None, started=None, elapsed=0.0):
+        self.entity = entity
+        self.kind = kind
+        self.action = action
+        self.status = status
+        self.error = error
+        self.started = started if started is not None else time.time()
+        self.elapsed = elapsed
+
+    @property
+    def ok(self):
+        return self.status == SUCCESS
+
+    def cells(self):
+        """
+        Returns the row of the report for this result.
+        """
+        detail = self.action.title() if self.ok else self.error
+        return "", self.entity, self.kind.title(), self.status.title(), detail
+
+    def __repr__(self):
+        return f"Result({self.entity!r}, {self.kind!r}, {self.action!r}, {self.status!r}, {self.error!r})"
+
+
+class ResultSet:
+    """
+    The results of a public function, in the order they were added, along with the free-form report rows.
+
+    It is used as cfg.table: add_column, add_row and add_section keep the layout of the report, add_result
+    records a Result. Nothing is rendered until render() is called, which only happens in "console" mode.
+    """
+
+    def __init__(self):
+        self.results = []
+        self._columns = []
+        self._rows = []
+
+    def add_column(self, header, **kwargs):
+        self._columns.append((header, kwargs))
+
+    def add_row(self, *cells, **kwargs):
+        self._rows.append((cells, kwargs))
+
+    def add_section(self):
+        self._rows.append(None)
+
+    def add_result(self, result):
+        self.results.append(result)
+        self._rows.append(result)
+        return result
+
+    def __iter__(self):
+        return iter(self.results)
+
+    def __len__(self):
+        return len(self.results)
+
+    def filter(self, kind=None, action=None, status=None):
+        """
+        Returns the results matching all of the given fields.
+
+        Args:
+            kind (str, optional): "job", "view" or "plugin".
+            action (str, optional): e.g. "created".
+            status (str, optional): SUCCESS or FAILED.
+
+        Returns:
+            list: The matching results, in order.
+        """
+        return [result for result in self.results
+                if (kind is None or result.kind == kind) and (action is None or result.action == action)
+                and (status is None or result.status == status)]
+
+    def failed(self):
+        """
+        Returns the results of the operations that failed.
+        """
+        return self.filter(status=FAILED)
+
+    def show(self):
+        """
+        Prints the report to the console.
+        """
+        get_console().print(self.render())
+
+    def render(self):
+        """
+        Builds the rich table of the report.
+
+        Returns:
+            rich.table.Table: The report, with one row per result and per free-form row.
+        """
+        from rich.table import Table
+
+        table = Table(show_lines=True, width=cfg.width)
+        for header, kwargs in self._columns:
+            table.add_column(header, **kwargs)
+        for row in self._rows:
+            if row is None:
+                table.add_section()
+            elif isinstance(row, Result):
+                table.add_row(*row.cells())
+            else:
+                table.add_row(*row[0], **row[1])
+        return table
+
+
+def get_console():
+    """
+    Returns the rich console the reports are printed to, creating it on first use.
+    """
+    if cfg.console is None:
+        from rich.console import Console
+
+        cfg.console = Console()
+    return cfg.console
+
+
+class DiscardingResultSet(ResultSet):
+    """
+    Stands in for cfg.table when the results are consumed as events, so nothing is kept in memory.
+    """
+
+    def add_row(self, *cells, **kwargs):
+        pass
+
+    def add_section(self):
+        pass
+
+    def add_result(self, result):
+        return result
+
+
+def record(entity, kind, action, status=SUCCESS, error=None, started=None):
+    """
+    Add a Result to cfg.table.
+
+    Args:
+        entity (str): The name of the job, view or plugin.
+        kind (str): "job", "view" or "plugin".
+        action (str): What was done, e.g. "created".
+        status (str, optional): SUCCESS or FAILED. Defaults to SUCCESS.
+        error (str, optional): The error message of a failed operation.
+        started (float, optional): When the operation started; the elapsed time is measured from it.
+
+    Returns:
+        Result: The recorded result.
+    """
+    now = time.time()
+    started = now if started is None else started
+    return cfg.table.add_result(Result(entity, kind, action, status, error, started, now - started))
@@ -16,6 +16,9 @@ def pytest_addoption(parser):
     parser.addoption("--interim_username", action="store", help="Username for Interim Jenkins Server")
     parser.addoption("--interim_password", action="store", help="Password for Interim Jenkins Server")
 
+def pytest_configure(config):
+    config.addinivalue_line("markers", "offline: the test needs no Jenkins servers or credentials")
+
 @pytest.fixture(scope="session")
 def jenkinsCreds(request):
     """Retrieve and validate Jenkins server credentials from pytest command-line options."""
@@ -55,16 +58,26 @@ def pytest_collection_modifyitems(items):
         "test_check_plugin_dependencies.py": 3,
         "test_check_and_install_plugin_dependencies.py": 4,
         "test_check_publish_standards.py": 5,
-        "test_transfer.py": 6,
-        "test_interim_cleanup.py": 7,
-        "test_production_cleanup.py": 8
+        "test_check_server_drift.py": 6,
+        "test_plan_transfer.py": 7,
+        "test_transfer.py": 8,
+        "test_bundle.py": 9,
+        "test_interim_cleanup.py": 10,
+        "test_production_cleanup.py": 11,
+        "test_resolve_plugin_dependencies.py": 12
     }
     
     items.sort(key=lambda item: order.get(os.path.basename(item.nodeid.split("::")[0]), 999))
 
-@pytest.fixture(scope="session", autouse=True)
-def ensure_server_connections(jenkinsCreds):
-    """Ensure server connections are established before any tests run."""
+@pytest.fixture(autouse=True)
+def ensure_server_connections(request):
+    """Ensure server connections are established before any test using the servers runs."""
+    if request.node.get_closest_marker("offline") is None:
+        request.getfixturevalue("serverConnections")
+
+@pytest.fixture(scope="session")
+def serverConnections(jenkinsCreds):
+    """Connect to both servers once per session."""
 
     try:
         # Create Jenkins objects for both servers
@@ -0,0 +1,145 @@
+"""
+
+The analysis of configs and the memo of their plugin references need no Jenkins server: analyzing many configs in
+worker processes gives the same results as analyzing them one after another, and malformed configs give None.
+
+"""
+
+import concurrent.futures
+import hashlib
+import pytest
+import jenkins_job_transfers as jjt
+from jenkins_job_transfers import analysis
+from jenkins_job_transfers import baseModule as bMod
+from jenkins_job_transfers import config as cfg
+
+pytestmark = pytest.mark.offline
+
+JOB_CONFIG = """<?xml version='1.1' encoding='UTF-8'?>
+<project>
+  <properties>
+    <hudson.plugins.git.GitProperty plugin="git@5.{index}.0"/>
+  </properties>
+  <publishers>
+    <hudson.tasks.BuildTrigger>
+      <childProjects>Downstream {index}</childProjects>
+    </hudson.tasks.BuildTrigger>
+  </publishers>
+</project>"""
+
+VIEW_CONFIG = """<hudson.model.ListView>
+  <jobNames>
+    <string>Job {index}</string>
+  </jobNames>
+</hudson.model.ListView>"""
+
+MALFORMED_CONFIG = "<project><description>Not Closed</project>"
+
+
+def make_configs(template):
+    """
+    Returns more than POOL_MIN_CONFIGS configs, every 10th not retrieved and every 7th not well-formed.
+    """
+    configs = []
+    for index in range(analysis.POOL_MIN_CONFIGS + 50):
+        if index % 10 == 0:
+            configs.append(None)
+        elif index % 7 == 0:
+            configs.append(MALFORMED_CONFIG)
+        else:
+            configs.append(template.format(index=index))
+    return configs
+
+
+@pytest.fixture
+def pooled(monkeypatch):
+    """
+    Analyze in two processes, counting the pools started.
+
+    Yields:
+        list: One entry per process pool started.
+    """
+    pools = []
+
+    class CountingPool(concurrent.futures.ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            pools.append(kwargs.get("max_workers"))
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", CountingPool)
+    try:
+        jjt.set_analysis_processes(2)
+        yield pools
+    finally:
+        jjt.set_analysis_processes(1)
+
+
+@pytest.fixture
+def pluginCache():
+    """
+    Start with an empty plugin memo and restore its size afterwards.
+    """
+    size = cfg.plugin_cache_size
+    bMod._plugin_cache.clear()
+    try:
+        yield bMod._plugin_cache
+    finally:
+        cfg.plugin_cache_size = size
+        bMod._plugin_cache.clear()
+
+
+@pytest.mark.parametrize("func, template", [(analysis.analyze_job_config, JOB_CONFIG),
+                                            (analysis.analyze_view_config, VIEW_CONFIG)])
+def test_analyze_in_processes_matches_serial(pooled, func, template):
+
+    configs = make_configs(template)
+
+    results = analysis.analyze(func, configs)
+
+    assert pooled == [2], "Configs Not Analyzed in a Process Pool"
+
+    jjt.set_analysis_processes(1)
+    assert results == analysis.analyze(func, configs), "Process Pool Results Differ From the Serial Results"
+    assert pooled == [2], "Serial Analysis Started a Process Pool"
+
+    assert [index for index, result in enumerate(results) if result is None] == \
+        [index for index, config in enumerate(configs) if config in (None, MALFORMED_CONFIG)], \
+        "Missing or Malformed Configs Not Analyzed as None"
+
+
+def test_analyze_job_config():
+
+    result = analysis.analyze_job_config(JOB_CONFIG.format(index=1).encode("utf-8"))
+
+    assert result["plugins"] == ("git@5.1.0",), "Plugin References Not Found"
+    assert result["downstream"] == ["Downstream 1"], "Downstream Jobs Not Found"
+    assert analysis.analyze_job_config(MALFORMED_CONFIG.encode("utf-8")) is None, "Malformed Config Analyzed"
+
+
+def test_plugin_references_memoized(pluginCache):
+
+    config_xml = JOB_CONFIG.format(index=1)
+
+    assert bMod.get_plugin_references(config_xml) == ("git@5.1.0",), "Plugin References Not Found"
+    assert hashlib.sha256(config_xml.encode("utf-8")).digest() in pluginCache, "Plugin References Not Memoized"
+    # Once memoized, references passed in are not used
+    assert bMod.get_plugin_references(config_xml, references=("other@1.0",)) == ("git@5.1.0",), \
+        "Memoized Plugin References Not Returned"
+
+    assert bMod.get_plugin_references(MALFORMED_CONFIG) is None, "Malformed Config Not Returned as None"
+    assert bMod.get_plugin_references(MALFORMED_CONFIG) is None, "Memoized Malformed Config Not Returned as None"
+
+
+def test_plugin_references_evicted(pluginCache):
+
+    cfg.plugin_cache_size = 2
+    configs = [JOB_CONFIG.format(index=index) for index in range(3)]
+
+    for config_xml in configs[:2]:
+        bMod.get_plugin_references(config_xml)
+    # Using the first config again makes the second the least recently used
+    bMod.get_plugin_references(configs[0])
+    bMod.get_plugin_references(configs[2])
+
+    assert list(pluginCache) == [hashlib.sha256(configs[index].encode("utf-8")).digest() for index in (0, 2)], \
+        "Least Recently Used Plugin References Not Evicted"
@@ -0,0 +1,113 @@
+import jenkins_job_transfers as jjt
+from importlib.resources import files
+import json
+import logging
+import os
+import tempfile
+import zipfile
+import pytest
+from . import config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def loadJob(conn, jobName=None, jobFileName=None):
+    """
+    Load a job in the given server from one of the job XML assets.
+
+    Args:
+        conn (Jenkins): The Jenkins connection to load the job in.
+        jobName (str): The name of the job.
+        jobFileName (str): The filename of the XML file containing the job configuration.
+
+    Returns:
+        bool: True if the job was loaded, otherwise False.
+    """
+    try:
+        jobPath = files("jenkins_job_transfers.tests.assets.xmlFilesForJobs").joinpath(jobFileName)
+        with open(jobPath, "r") as xmlFile:
+            if not conn.job_exists(jobName):
+                conn.create_job(jobName, xmlFile.read())
+        return True
+
+    except Exception as e:
+        logger.error("Exception in loadJob: %s", e)
+        return False
+
+
+def test_export_and_import_bundle():
+    """
+    Verifies that a job exported from interim into a bundle is created in production by import_bundle, and that
+    applying the same bundle again succeeds.
+    """
+    jobName = "Bundle - Job"
+    bundlePath = os.path.join(tempfile.mkdtemp(), "bundle.zip")
+
+    try:
+
+        if not config.interimConn or not config.productionConn: pytest.skip("Jenkins Servers Not Connected")
+
+        if not loadJob(config.interimConn, jobName, "jobWithNoPluginsNoViews.xml"):
+            pytest.fail("Failed to Load Job in Interim Server")
+
+        assert jjt.export_bundle(bundlePath, [jobName], "job", mode="quiet"), "Bundle Not Exported"
+        assert "manifest.json" in zipfile.ZipFile(bundlePath).namelist(), "Bundle Has No Manifest"
+
+        assert jjt.import_bundle(bundlePath, mode="quiet"), "Bundle Not Imported"
+        assert config.productionConn.job_exists(jobName), "Job Not Created in Production Server"
+
+        assert jjt.import_bundle(bundlePath, mode="quiet"), "Bundle Not Imported a Second Time"
+
+    finally:
+        for conn in [config.interimConn, config.productionConn]:
+            if conn and conn.job_exists(jobName):
+                conn.delete_job(jobName)
+        if os.path.exists(bundlePath):
+            os.remove(bundlePath)
+
+
+def test_import_bundle_skips_jobs_in_failed_folders():
+    """
+    Verifies that the jobs inside a folder that could not be imported are skipped instead of written.
+    """
+    folderName = "Bundle Folder"
+    jobName = folderName + "/Job"
+    bundlePath = os.path.join(tempfile.mkdtemp(), "bundle.zip")
+
+    try:
+
+        if not config.interimConn or not config.productionConn: pytest.skip("Jenkins Servers Not Connected")
+
+        if not loadJob(config.interimConn, folderName, "folder.xml") \
+                or not loadJob(config.interimConn, jobName, "jobWithNoPluginsNoViews.xml"):
+            pytest.fail("Failed to Load Jobs in Interim Server")
+
+        assert jjt.export_bundle(bundlePath, [jobName], "job", mode="quiet"), "Bundle Not Exported"
+
+        # The folder needs a plugin no update center has, so it cannot be imported
+        with zipfile.ZipFile(bundlePath) as bundle:
+            entries = {name: bundle.read(name) for name in bundle.namelist()}
+        manifest = json.loads(entries["manifest.json"])
+        for job in manifest["jobs"]:
+            if job["name"] == folderName:
+                job["plugins"].append("bundle-missing-plugin")
+        manifest["plugins"]["bundle-missing-plugin"] = "1.0"
+        entries["manifest.json"] = json.dumps(manifest).encode("utf-8")
+        with zipfile.ZipFile(bundlePath, "w") as bundle:
+            for name, data in entries.items():
+                bundle.writestr(name, data)
+
+        assert not jjt.import_bundle(bundlePath, mode="quiet"), "Bundle With a Failed Folder Imported"
+        failed = {result.entity: result.error for result in jjt.get_results().failed()}
+
+        assert folderName in failed, "Failed Folder Not Recorded"
+        assert failed.get(jobName, "").startswith("Skipped"), "Job in the Failed Folder Not Recorded as Skipped"
+        assert not config.productionConn.job_exists(folderName), "Failed Folder Written to the Production Server"
+
+    finally:
+        for conn in [config.interimConn, config.productionConn]:
+            if conn and conn.job_exists(folderName):
+                conn.delete_job(folderName)
+        if os.path.exists(bundlePath):
+            os.remove(bundlePath)
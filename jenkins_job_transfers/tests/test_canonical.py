@@ -0,0 +1,80 @@
+"""
+
+The canonical form, content hash and diff of configs need no Jenkins server: configs that only differ in
+serialization hash the same, and ignore-rules remove what they select before hashing.
+
+"""
+
+import pytest
+from jenkins_job_transfers import canonical
+
+pytestmark = pytest.mark.offline
+
+CONFIG = """<?xml version='1.1' encoding='UTF-8'?>
+<project>
+  <description>Build</description>
+  <properties>
+    <hudson.model.ParametersDefinitionProperty plugin="core@1.0" enabled="true"/>
+  </properties>
+  <builders>
+    <hudson.tasks.Shell>
+      <command>make</command>
+    </hudson.tasks.Shell>
+  </builders>
+</project>"""
+
+# The same config with attributes reordered, other quoting, no XML declaration, comments and other whitespace
+EQUIVALENT_CONFIG = """<project><!-- saved by hand -->
+<description>Build</description>
+    <properties><hudson.model.ParametersDefinitionProperty enabled='true' plugin='core@1.0'></hudson.model.ParametersDefinitionProperty></properties>
+<builders><hudson.tasks.Shell><command>make</command></hudson.tasks.Shell>
+<!-- no more steps --></builders></project>"""
+
+
+def test_hash_ignores_serialization():
+
+    assert canonical.content_hash(CONFIG, ignore=[]) == canonical.content_hash(EQUIVALENT_CONFIG, ignore=[]), \
+        "Equivalent Configs Hashed Differently"
+
+
+def test_hash_changes_with_content():
+
+    changed = CONFIG.replace("<command>make</command>", "<command>make test</command>")
+
+    assert canonical.content_hash(CONFIG, ignore=[]) != canonical.content_hash(changed, ignore=[]), \
+        "Changed Config Hashed the Same"
+
+
+def test_ignore_rule_drops_subtree():
+
+    changed = CONFIG.replace("<command>make</command>", "<command>make test</command>")
+
+    assert canonical.content_hash(CONFIG, ignore=["//builders"]) == \
+        canonical.content_hash(changed, ignore=["//builders"]), "Ignored Subtree Changed the Hash"
+    assert b"builders" not in canonical.canonicalize(CONFIG, ignore=["//builders"]), "Ignored Subtree Not Dropped"
+
+
+def test_diff_paths():
+
+    changed = CONFIG.replace("<description>Build</description>", "<description>Deploy</description>") \
+        .replace('enabled="true"', 'enabled="false"') \
+        .replace("</builders>", "<hudson.tasks.Shell><command>deploy</command></hudson.tasks.Shell></builders>")
+
+    changes = {change["path"]: change for change in canonical.diff(CONFIG, changed, ignore=[])}
+
+    assert set(changes) == {
+        "/project/description[1]/text()",
+        "/project/properties[1]/hudson.model.ParametersDefinitionProperty[1]/@enabled",
+        "/project/builders[1]/hudson.tasks.Shell[2]",
+    }, "Unexpected Diff Paths"
+    assert changes["/project/description[1]/text()"]["old"] == "Build", "Old Value Not Reported"
+    assert changes["/project/description[1]/text()"]["new"] == "Deploy", "New Value Not Reported"
+    assert changes["/project/builders[1]/hudson.tasks.Shell[2]"]["change"] == "added", "Added Element Not Reported"
+    assert canonical.diff(CONFIG, EQUIVALENT_CONFIG, ignore=[]) == [], "Equivalent Configs Reported as Different"
+
+
+@pytest.mark.parametrize("rule", ["//builders[", "count(//builders)", "string(//description)", "$undefined"])
+def test_bad_rules_rejected(rule):
+
+    with pytest.raises(ValueError):
+        canonical.validate_rules([rule])
@@ -0,0 +1,89 @@
+import jenkins_job_transfers as jjt
+from importlib.resources import files
+import logging
+import pytest
+from . import config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def loadJob(conn, jobName=None, jobFileName=None):
+    """
+    Load a job in the given server from one of the job XML assets.
+
+    Args:
+        conn (Jenkins): The Jenkins connection to load the job in.
+        jobName (str): The name of the job.
+        jobFileName (str): The filename of the XML file containing the job configuration.
+
+    Returns:
+        bool: True if the job was loaded, otherwise False.
+    """
+    try:
+        jobPath = files("jenkins_job_transfers.tests.assets.xmlFilesForJobs").joinpath(jobFileName)
+        with open(jobPath, "r") as xmlFile:
+            if not conn.job_exists(jobName):
+                conn.create_job(jobName, xmlFile.read())
+        return True
+
+    except Exception as e:
+        logger.error("Exception in loadJob: %s", e)
+        return False
+
+
+def test_check_server_drift_missing_and_extra():
+    """
+    Verifies that a job only present in interim is reported as missing and a job only present in production as extra.
+    """
+    interimJobName = "Server Drift - Interim Only"
+    productionJobName = "Server Drift - Production Only"
+
+    try:
+
+        if not config.interimConn or not config.productionConn: pytest.skip("Jenkins Servers Not Connected")
+
+        if not loadJob(config.interimConn, interimJobName, "jobWithNoPluginsNoViews.xml"):
+            pytest.fail("Failed to Load Job in Interim Server")
+        if not loadJob(config.productionConn, productionJobName, "jobWithNoPluginsNoViews.xml"):
+            pytest.fail("Failed to Load Job in Production Server")
+
+        result = jjt.check_server_drift(mode="quiet")
+
+        assert interimJobName in result['jobs']['missing'], "Interim Only Job Not Reported as Missing"
+        assert productionJobName in result['jobs']['extra'], "Production Only Job Not Reported as Extra"
+
+    finally:
+        for conn, jobName in [(config.interimConn, interimJobName), (config.productionConn, productionJobName)]:
+            if conn and conn.job_exists(jobName):
+                conn.delete_job(jobName)
+
+
+def test_check_server_drift_changed_and_identical():
+    """
+    Verifies that a job with the same config in both servers is identical and one with a different config is changed.
+    """
+    identicalJobName = "Server Drift - Identical"
+    changedJobName = "Server Drift - Changed"
+
+    try:
+
+        if not config.interimConn or not config.productionConn: pytest.skip("Jenkins Servers Not Connected")
+
+        for conn in [config.interimConn, config.productionConn]:
+            if not loadJob(conn, identicalJobName, "jobWithNoPluginsNoViews.xml"):
+                pytest.fail("Failed to Load Identical Job")
+        if not loadJob(config.interimConn, changedJobName, "jobWithNoPluginsNoViews.xml") or \
+                not loadJob(config.productionConn, changedJobName, "jobWithPluginsNoViews.xml"):
+            pytest.fail("Failed to Load Changed Job")
+
+        result = jjt.check_server_drift(mode="quiet")
+
+        assert identicalJobName in result['jobs']['identical'], "Identical Job Not Reported as Identical"
+        assert changedJobName in result['jobs']['changed'], "Changed Job Not Reported as Changed"
+
+    finally:
+        for conn in [config.interimConn, config.productionConn]:
+            for jobName in [identicalJobName, changedJobName]:
+                if conn and conn.job_exists(jobName):
+                    conn.delete_job(jobName)
@@ -0,0 +1,50 @@
+"""
+
+Importing the package should stay cheap for short-lived scripts: rich, lxml and python-jenkins are only imported
+once they are used, and the import itself has to fit in IMPORT_TIME_BUDGET seconds.
+
+"""
+
+import json
+import subprocess
+import sys
+import pytest
+
+pytestmark = pytest.mark.offline
+
+IMPORT_TIME_BUDGET = 0.1
+DEFERRED_MODULES = ["jenkins", "requests", "lxml", "rich"]
+
+MEASURE_IMPORT = """
+import json, sys, time
+start = time.perf_counter()
+import jenkins_job_transfers
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "loaded": [name for name in %r if name in sys.modules]}))
+""" % (DEFERRED_MODULES,)
+
+
+def measureImport():
+    """
+    Import the package in a fresh interpreter.
+
+    Returns:
+        dict: The import time in seconds under 'elapsed' and the deferred modules that were imported under 'loaded'.
+    """
+    output = subprocess.run([sys.executable, "-c", MEASURE_IMPORT], capture_output=True, text=True, check=True)
+    return json.loads(output.stdout)
+
+
+def test_import_defers_heavy_dependencies():
+
+    result = measureImport()
+
+    assert result["loaded"] == [], f"Dependencies Imported with the Package: {result['loaded']}"
+
+
+def test_import_time_budget():
+
+    # The best of a few runs, so a busy machine does not fail the budget
+    elapsed = min(measureImport()["elapsed"] for _ in range(3))
+
+    assert elapsed < IMPORT_TIME_BUDGET, f"Import Took {elapsed:.3f}s, Budget is {IMPORT_TIME_BUDGET}s"
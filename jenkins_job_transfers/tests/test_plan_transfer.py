@@ -0,0 +1,158 @@
+import jenkins_job_transfers as jjt
+from importlib.resources import files
+import json
+import logging
+import pytest
+from . import config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def loadJob(conn, jobName=None, jobFileName=None):
+    """
+    Load a job in the given server from one of the job XML assets.
+
+    Args:
+        conn (Jenkins): The Jenkins connection to load the job in.
+        jobName (str): The name of the job.
+        jobFileName (str): The filename of the XML file containing the job configuration.
+
+    Returns:
+        bool: True if the job was loaded, otherwise False.
+    """
+    try:
+        jobPath = files("jenkins_job_transfers.tests.assets.xmlFilesForJobs").joinpath(jobFileName)
+        with open(jobPath, "r") as xmlFile:
+            if not conn.job_exists(jobName):
+                conn.create_job(jobName, xmlFile.read())
+        return True
+
+    except Exception as e:
+        logger.error("Exception in loadJob: %s", e)
+        return False
+
+
+def test_plan_transfer_writes_nothing():
+    """
+    Verifies that planning the transfer of a new job and an invalid job plans a create and a failure, without
+    writing to the production server.
+    """
+    jobName = "Plan Transfer - Job"
+    invalidJobName = "Plan Transfer - Invalid Job"
+
+    try:
+
+        if not config.interimConn or not config.productionConn: pytest.skip("Jenkins Servers Not Connected")
+
+        if not loadJob(config.interimConn, jobName, "jobWithNoPluginsNoViews.xml"):
+            pytest.fail("Failed to Load Job in Interim Server")
+
+        plan = jjt.plan_transfer([jobName, invalidJobName], "job", allowDuplicates=True, mode="quiet")
+
+        assert plan is not None, "Transfer Not Planned"
+        assert ("job", "create", jobName) in [(step["kind"], step["action"], step["name"]) for step in plan["steps"]], \
+            "Job Create Not Planned"
+        assert [failure["name"] for failure in plan["failures"]] == [invalidJobName], "Invalid Job Not Planned as Failed"
+        assert plan["requests"] > 0, "Requests Not Estimated"
+        assert not config.productionConn.job_exists(jobName), "Job Written to the Production Server"
+
+    finally:
+        for conn in [config.interimConn, config.productionConn]:
+            if conn and conn.job_exists(jobName):
+                conn.delete_job(jobName)
+
+
+def test_transfer_saved_plan():
+    """
+    Verifies that a plan saved as JSON is executed by transfer, and that it is refused for another publish list.
+    """
+    jobName = "Plan Transfer - Saved Plan"
+
+    try:
+
+        if not config.interimConn or not config.productionConn: pytest.skip("Jenkins Servers Not Connected")
+
+        if not loadJob(config.interimConn, jobName, "jobWithNoPluginsNoViews.xml"):
+            pytest.fail("Failed to Load Job in Interim Server")
+
+        plan = json.loads(json.dumps(jjt.plan_transfer([jobName], "job", allowDuplicates=True, mode="quiet")))
+
+        assert not jjt.transfer(["Another Job"], "job", allowDuplicates=True, mode="quiet", plan=plan), \
+            "Plan Executed for Another Publish List"
+        assert jjt.transfer([jobName], "job", allowDuplicates=True, mode="quiet", plan=plan), "Plan Not Executed"
+        assert config.productionConn.job_exists(jobName), "Job Not Transferred to the Production Server"
+
+    finally:
+        for conn in [config.interimConn, config.productionConn]:
+            if conn and conn.job_exists(jobName):
+                conn.delete_job(jobName)
+
+
+def test_transfer_plan_token_from_checks():
+    """
+    Verifies that the plan of check_publish_standards and check_plugin_dependencies is executed by transfer, and that
+    a plan edited after it was made is refused.
+    """
+    jobName = "Plan Transfer - Token"
+
+    try:
+
+        if not config.interimConn or not config.productionConn: pytest.skip("Jenkins Servers Not Connected")
+
+        if not loadJob(config.interimConn, jobName, "jobWithNoPluginsNoViews.xml"):
+            pytest.fail("Failed to Load Job in Interim Server")
+
+        jjt.check_publish_standards([jobName], "job", allowDuplicates=True, mode="quiet")
+        assert jjt.check_plugin_dependencies([jobName], "job", mode="quiet") == {jobName: []}, \
+            "Unexpected Plugin Dependencies"
+        plan = jjt.get_plan()
+
+        tampered = dict(plan, steps=[])
+        assert not jjt.transfer([jobName], "job", allowDuplicates=True, mode="quiet", plan=tampered), \
+            "Edited Plan Executed"
+        assert not config.productionConn.job_exists(jobName), "Job Written by the Edited Plan"
+
+        assert jjt.transfer([jobName], "job", allowDuplicates=True, mode="quiet", plan=plan), "Plan Not Executed"
+        assert config.productionConn.job_exists(jobName), "Job Not Transferred to the Production Server"
+
+    finally:
+        for conn in [config.interimConn, config.productionConn]:
+            if conn and conn.job_exists(jobName):
+                conn.delete_job(jobName)
+
+
+def test_plan_transfer_plugin_versions():
+    """
+    Verifies that a job saved with a newer version of a plugin than production has is planned, and reported by
+    check_plugin_dependencies, with the plugin as older in production.
+    """
+    jobName = "Plan Transfer - Plugin Versions"
+
+    try:
+
+        if not config.interimConn or not config.productionConn: pytest.skip("Jenkins Servers Not Connected")
+
+        installed = [plugin["shortName"] for plugin in config.productionConn.get_plugins(depth=1).values()]
+        if not installed: pytest.skip("No Plugins Installed in Production Server")
+        plugin = sorted(installed)[0]
+
+        jobPath = files("jenkins_job_transfers.tests.assets.xmlFilesForJobs").joinpath("jobWithNoPluginsNoViews.xml")
+        with open(jobPath, "r") as xmlFile:
+            configXml = xmlFile.read().replace("<properties/>",
+                                               f'<properties><property plugin="{plugin}@99999.0"/></properties>')
+        if not config.interimConn.job_exists(jobName):
+            config.interimConn.create_job(jobName, configXml)
+
+        plan = jjt.plan_transfer([jobName], "job", allowDuplicates=True, mode="quiet")
+        jobSteps = [step for step in plan["steps"] if step["name"] == jobName]
+
+        assert jobSteps and plugin in jobSteps[0]["older"], "Older Plugin Version Not Planned"
+        assert jobSteps[0]["requires"][plugin] == "99999.0", "Plugin Version of the Job Not Planned"
+        assert jjt.check_plugin_dependencies([jobName], "job", mode="quiet") == {jobName: []}, \
+            "Older Plugin Reported as Missing"
+
+    finally:
+        for conn in [config.interimConn, config.productionConn]:
+            if conn and conn.job_exists(jobName):
+                conn.delete_job(jobName)
@@ -0,0 +1,33 @@
+import jenkins_job_transfers as jjt
+from importlib.resources import files
+import logging
+import pytest
+from . import config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def test_resolve_plugin_dependencies():
+    """
+    Verifies that the plugins to install are resolved from a local update-center index: every plugin needed,
+    directly or through other plugins, after the plugins it needs, leaving out optional dependencies, and the
+    plugins whose dependencies the index does not have.
+    """
+
+    try:
+
+        if not config.interimConn or not config.productionConn: pytest.skip("Jenkins Servers Not Connected")
+
+        jjt.set_update_center(str(files("jenkins_job_transfers.tests.assets.updateCenter").joinpath(
+            "update-center.json")))
+
+        resolved = jjt.resolve_plugin_dependencies(["jjt-test-pipeline", "jjt-test-reports"], mode="quiet")
+
+        assert resolved["install"] == ["jjt-test-credentials", "jjt-test-scm", "jjt-test-pipeline"], \
+            "Plugins Not Resolved in Dependency Order"
+        assert resolved["unavailable"] == ["jjt-test-reports", "jjt-test-retired"], \
+            "Unavailable Plugins Not Reported"
+
+    finally:
+        jjt.set_update_center(None)
@@ -246,3 +246,218 @@ def test_transfer_views():
                 for jobName in jobNames:
                     if conn.job_exists(jobName):
                         conn.delete_job(jobName)
+
+
+def test_iter_transfer_job_events():
+
+    jobName = "Iter Transfer Job without Plugins and No Views"
+
+    try:
+
+        if not config.interimConn or not config.productionConn: pytest.skip("Jenkins Servers Not Connected")
+
+        if not loadJobInInterimServer(jobName=jobName, jobFileNameForInterim="jobWithNoPluginsNoViews.xml"):
+            pytest.fail("Failed to Load Job in Interim Server")
+
+        events = list(jjt.iter_transfer([jobName], "job", allowDuplicates=True))
+        kinds = [event.kind for event in events if event.name == jobName]
+
+        assert kinds == ["fetched", "plugins_checked", "created"], "Unexpected Events for the Transferred Job"
+        assert events[-1].kind == "finished" and events[-1].detail, "Transfer Not Reported as Finished"
+        assert config.productionConn.job_exists(jobName), "Job Not Transferred to the Production Server"
+
+    finally:
+        for conn in [config.interimConn, config.productionConn]:
+            if conn:
+                if conn.job_exists(jobName):
+                    conn.delete_job(jobName)
+
+
+def test_transfer_job_on_event_callback():
+
+    jobName = "Transfer Job with Event Callback"
+    events = []
+
+    try:
+
+        if not config.interimConn or not config.productionConn: pytest.skip("Jenkins Servers Not Connected")
+
+        if not loadJobInInterimServer(jobName=jobName, jobFileNameForInterim="jobWithNoPluginsNoViews.xml"):
+            pytest.fail("Failed to Load Job in Interim Server")
+
+        result = jjt.transfer([jobName, "Invalid Job - Event Callback"], "job", allowDuplicates=True, mode="quiet",
+                              on_event=events.append)
+
+        assert result, "Transfer Failed"
+        assert ("created", jobName) in [(event.kind, event.name) for event in events], "Created Event Not Emitted"
+        assert ("failed", "Invalid Job - Event Callback") in [(event.kind, event.name) for event in events], \
+            "Failed Event Not Emitted for the Invalid Job"
+
+    finally:
+        for conn in [config.interimConn, config.productionConn]:
+            if conn:
+                if conn.job_exists(jobName):
+                    conn.delete_job(jobName)
+
+
+def test_transfer_job_results():
+
+    jobName = "Transfer Job Results"
+
+    try:
+
+        if not config.interimConn or not config.productionConn: pytest.skip("Jenkins Servers Not Connected")
+
+        if not loadJobInInterimServer(jobName=jobName, jobFileNameForInterim="jobWithNoPluginsNoViews.xml"):
+            pytest.fail("Failed to Load Job in Interim Server")
+
+        jjt.transfer([jobName, "Invalid Job - Results"], "job", allowDuplicates=True, mode="quiet")
+        results = jjt.get_results()
+
+        assert [result.entity for result in results.filter(kind="job", action="created")] == [jobName], \
+            "Created Job Not Recorded"
+        assert [result.entity for result in results.failed()] == ["Invalid Job - Results"], \
+            "Invalid Job Not Recorded as Failed"
+
+    finally:
+        for conn in [config.interimConn, config.productionConn]:
+            if conn:
+                if conn.job_exists(jobName):
+                    conn.delete_job(jobName)
+
+
+def test_transfer_job_with_downstream_jobs():
+
+    jobName = "Transfer Dependencies - Upstream"
+    downstreamJobName = "Transfer Dependencies - Downstream"
+
+    try:
+
+        if not config.interimConn or not config.productionConn: pytest.skip("Jenkins Servers Not Connected")
+
+        if not loadJobInInterimServer(jobName=downstreamJobName, jobFileNameForInterim="jobWithNoPluginsNoViews.xml") \
+                or not loadJobInInterimServer(jobName=jobName, jobFileNameForInterim="jobWithDownstreamJob.xml"):
+            pytest.fail("Failed to Load Jobs in Interim Server")
+
+        assert jjt.transfer([jobName], "job", allowDuplicates=True, mode="quiet", workers=2, includeDownstream=True), \
+            "Transfer Failed"
+        created = [result.entity for result in jjt.get_results().filter(kind="job", action="created")]
+
+        assert created == [jobName, downstreamJobName], "Jobs Not Transferred in Dependency Order"
+        assert config.productionConn.job_exists(downstreamJobName), "Downstream Job Not Transferred"
+
+    finally:
+        for conn in [config.interimConn, config.productionConn]:
+            if conn:
+                for name in [jobName, downstreamJobName]:
+                    if conn.job_exists(name):
+                        conn.delete_job(name)
+
+
+def test_transfer_view_skip_unchanged():
+
+    viewName = "Transfer View - Skip Unchanged"
+    jobNames = []
+
+    try:
+
+        if not config.interimConn or not config.productionConn: pytest.skip("Jenkins Servers Not Connected")
+
+        # The jobs listed in the view config
+        jobNames = ["Test Transfer Job 1", "Test Transfer Job 2"]
+        for jobName in jobNames:
+            if not loadJobInInterimServer(jobName=jobName, jobFileNameForInterim="jobWithNoPluginsNoViews.xml"):
+                pytest.fail("Failed to Load Jobs in Interim Server")
+
+        chk, _ = loadViewInInterimServer(viewName=viewName, viewFileNameForInterim="viewWithJobsWithPlugins.xml")
+
+        if not chk:
+            pytest.fail("Failed to Load View in Interim Server")
+
+        assert jjt.transfer([viewName], "view", allowDuplicates=True, mode="quiet"), "First Transfer Failed"
+        assert jjt.transfer([viewName], "view", allowDuplicates=True, mode="quiet", skipUnchanged=True), \
+            "Second Transfer Failed"
+        results = jjt.get_results()
+
+        assert sorted(result.entity for result in results.filter(kind="job", action="unchanged")) == sorted(jobNames), \
+            "Unchanged Jobs Not Recorded"
+        assert [result.entity for result in results.filter(kind="view", action="unchanged")] == [viewName], \
+            "Unchanged View Not Recorded"
+        assert not results.filter(action="updated"), "Unchanged Jobs or View Updated"
+
+    finally:
+        for conn in [config.interimConn, config.productionConn]:
+            if conn:
+                if conn.view_exists(viewName):
+                    conn.delete_view(viewName)
+                for jobName in jobNames:
+                    if conn.job_exists(jobName):
+                        conn.delete_job(jobName)
+
+
+def test_transfer_job_in_folders():
+
+    folderName = "Transfer Folder"
+    jobName = folderName + "/Sub/Job in Folders"
+
+    try:
+
+        if not config.interimConn or not config.productionConn: pytest.skip("Jenkins Servers Not Connected")
+
+        for name in [folderName, folderName + "/Sub"]:
+            if not loadJobInInterimServer(jobName=name, jobFileNameForInterim="folder.xml"):
+                pytest.fail("Failed to Load Folders in Interim Server")
+        if not loadJobInInterimServer(jobName=jobName, jobFileNameForInterim="jobWithNoPluginsNoViews.xml"):
+            pytest.fail("Failed to Load Job in Interim Server")
+
+        jobList = utils.get_job_list(config.interimConn, tree=utils.get_inventory_tree(config.interimConn))
+        assert {folderName, folderName + "/Sub", jobName} <= set(jobList), "Folders and Job Not Listed"
+        assert jjt.transfer([jobName], "job", allowDuplicates=True, mode="quiet"), "Transfer Failed"
+
+        assert config.productionConn.job_exists(folderName), "Folder Not Created in the Production Server"
+        assert config.productionConn.job_exists(folderName + "/Sub"), "Sub-Folder Not Created in the Production Server"
+        assert config.productionConn.job_exists(jobName), "Job Not Transferred to the Production Server"
+
+    finally:
+        for conn in [config.interimConn, config.productionConn]:
+            if conn:
+                if conn.job_exists(folderName):
+                    conn.delete_job(folderName)
+
+
+def test_transfer_downstream_jobs_pre_checked():
+
+    viewName = "Transfer Dependencies - Pre Check"
+    jobName = "Transfer Dependencies - Pre Checked Upstream"
+    downstreamJobName = "Transfer Dependencies - Downstream"
+
+    try:
+
+        if not config.interimConn or not config.productionConn: pytest.skip("Jenkins Servers Not Connected")
+
+        if not loadJobInInterimServer(jobName=downstreamJobName, jobFileNameForInterim="jobWithNoPluginsNoViews.xml") \
+                or not loadJobInInterimServer(jobName=jobName, jobFileNameForInterim="jobWithDownstreamJob.xml"):
+            pytest.fail("Failed to Load Jobs in Interim Server")
+
+        # Only the upstream job is in a view, so the downstream job fails the publish standards pre-check
+        viewPath = files("jenkins_job_transfers.tests.assets.xmlFilesForViews").joinpath("viewWithJobsWithPlugins.xml")
+        viewXml = etree.fromstring(viewPath.read_bytes())
+        jobNames = viewXml.find("jobNames")
+        for string in jobNames.findall("string"):
+            jobNames.remove(string)
+        etree.SubElement(jobNames, "string").text = jobName
+        config.interimConn.create_view(viewName, etree.tostring(viewXml).decode("utf-8"))
+
+        assert jjt.check_publish_standards([jobName], "job", mode="quiet"), "Upstream Job Failed the Pre Check"
+        assert not jjt.transfer([jobName], "job", allowDuplicates=False, mode="quiet", includeDownstream=True), \
+            "Downstream Job Not Pre Checked"
+        assert not config.productionConn.job_exists(downstreamJobName), "Downstream Job Written Without a Pre Check"
+
+    finally:
+        for conn in [config.interimConn, config.productionConn]:
+            if conn:
+                if conn.view_exists(viewName):
+                    conn.delete_view(viewName)
+                for name in [jobName, downstreamJobName]:
+                    if conn.job_exists(name):
+                        conn.delete_job(name)
@@ -0,0 +1,226 @@
+"""
+
+Summary - Plugin dependencies read from an update-center index: the full set of plugins a plugin needs and the
+          smallest set of installs that gives production all of them, worked out without asking Jenkins.
+
+The index is the update-center JSON published by Jenkins (update-center.json or update-center.actual.json), read
+from a local file or downloaded once and cached on disk for a time-to-live.
+
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from . import config as cfg
+from . import graph as jgraph
+from .lazy import lazy_import
+
+request = lazy_import('urllib.request')
+
+UPDATE_CENTER_URL = 'https://updates.jenkins.io/current/update-center.actual.json'
+DEFAULT_TTL = 24 * 60 * 60
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'jenkins_job_transfers')
+
+# update-center.json wraps the index in a JSONP call: updateCenter.post(...);
+JSONP = re.compile(r'^\s*updateCenter\.post\(\s*(.*?)\s*\);?\s*$', re.DOTALL)
+
+# Version parts: numbers, and qualifiers such as "beta" or "rc"
+VERSION_PART = re.compile(r'\d+|[A-Za-z]+')
+
+
+def _version_parts(version):
+    return [(2, int(part), '') if part.isdigit() else (0, 0, part.lower())
+            for part in VERSION_PART.findall(version or '')]
+
+
+def compare_versions(version, other_version):
+    """
+    Compare two plugin versions part by part, numbers numerically. A qualifier sorts before the release it
+    qualifies, e.g. "1.0-beta-1" < "1.0" < "1.0.1".
+
+    Args:
+        version (str): A plugin version.
+        other_version (str): The plugin version to compare to.
+
+    Returns:
+        int: -1 if version is older than other_version, 0 if they are the same, 1 if it is newer.
+    """
+    parts, other_parts = _version_parts(version), _version_parts(other_version)
+    length = max(len(parts), len(other_parts))
+    # A missing part sorts after a qualifier and before a number
+    parts += [(1, 0, '')] * (length - len(parts))
+    other_parts += [(1, 0, '')] * (length - len(other_parts))
+    return (parts > other_parts) - (parts < other_parts)
+
+
+def parse_index(data):
+    """
+    Parse an update-center index.
+
+    Args:
+        data (str): The update-center JSON, optionally wrapped in updateCenter.post(...).
+
+    Returns:
+        dict: Plugin short names as keys, each a dict with the 'version' published and its 'dependencies', a list
+              of dicts with 'name', 'version' and 'optional'.
+    """
+    match = JSONP.match(data)
+    index = json.loads(match.group(1) if match else data)
+    return {
+        name: {
+            'version': plugin.get('version'),
+            'dependencies': [{'name': dependency['name'], 'version': dependency.get('version'),
+                              'optional': bool(dependency.get('optional'))}
+                             for dependency in plugin.get('dependencies', [])],
+        }
+        for name, plugin in index.get('plugins', {}).items()
+    }
+
+
+def cache_path(url, cache_dir=None):
+    """
+    Returns the file an index downloaded from url is cached in.
+    """
+    name = hashlib.sha256(url.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_dir or DEFAULT_CACHE_DIR, f'update-center-{name}.json')
+
+
+def load_index(source, ttl=DEFAULT_TTL, cache_dir=None):
+    """
+    Load an update-center index from a local file, or from a URL through the disk cache.
+
+    A cached download is used while it is younger than ttl; after that it is downloaded again, and the stale
+    copy is only used if the download fails.
+
+    Args:
+        source (str): A local file or a URL, e.g. UPDATE_CENTER_URL.
+        ttl (int, optional): Seconds a cached download stays valid. Defaults to one day.
+        cache_dir (str, optional): The directory downloads are cached in. Defaults to DEFAULT_CACHE_DIR.
+
+    Returns:
+        dict: The parsed index, see parse_index.
+    """
+    if not re.match(r'^https?://', source):
+        with open(source, encoding='utf-8') as f:
+            return parse_index(f.read())
+
+    path = cache_path(source, cache_dir)
+    if os.path.exists(path) and time.time() - os.path.getmtime(path) < ttl:
+        with open(path, encoding='utf-8') as f:
+            return parse_index(f.read())
+
+    try:
+        with request.urlopen(source, timeout=60) as response:
+            data = response.read().decode('utf-8')
+        index = parse_index(data)
+    except Exception:
+        if not os.path.exists(path):
+            raise
+        with open(path, encoding='utf-8') as f:
+            return parse_index(f.read())
+
+    # Written to a temporary file first, so a concurrent reader never sees a partial index
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = f'{path}.{os.getpid()}.tmp'
+    with open(temporary, 'w', encoding='utf-8') as f:
+        f.write(data)
+    os.replace(temporary, path)
+    return index
+
+
+def get_index():
+    """
+    Returns the index set with set_update_center, loaded on first use; None if no update center is set.
+    """
+    if cfg.update_center is None:
+        return None
+    if cfg.update_center_index is None:
+        cfg.update_center_index = load_index(cfg.update_center, cfg.update_center_ttl, cfg.update_center_cache_dir)
+    return cfg.update_center_index
+
+
+def dependency_closure(plugin_names, index, optional=False):
+    """
+    Get every plugin the given plugins need, directly or through other plugins, with the lowest version needed.
+
+    Args:
+        plugin_names (list): Short names of the plugins.
+        index (dict): The update-center index, see parse_index.
+        optional (bool): Whether to follow optional dependencies too.
+
+    Returns:
+        tuple: A dict of the plugins, the given ones included, with the lowest version that satisfies every plugin
+               depending on them (None for the given plugins nothing depends on), and the sorted names of the plugins
+               missing from the index.
+    """
+    required = {name: None for name in plugin_names}
+    unknown = set()
+    pending = list(plugin_names)
+    seen = set()
+    while pending:
+        name = pending.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        if name not in index:
+            unknown.add(name)
+            continue
+        for dependency in index[name]['dependencies']:
+            if dependency['optional'] and not optional:
+                continue
+            dependency_name = dependency['name']
+            version = required.get(dependency_name)
+            if version is None or compare_versions(dependency['version'], version) > 0:
+                required[dependency_name] = dependency['version']
+            pending.append(dependency_name)
+    return required, sorted(unknown)
+
+
+def install_set(plugin_names, index, installed):
+    """
+    Get the fewest plugins to install so that the given plugins and everything they need are in production.
+
+    A plugin is installed if it is missing, or if it is older than a plugin depending on it needs, provided the
+    update center has a new enough version.
+
+    Args:
+        plugin_names (list): Short names of the plugins needed.
+        index (dict): The update-center index, see parse_index.
+        installed (dict): Installed plugin short names as keys and their versions as values.
+
+    Returns:
+        tuple: The plugins to install, every plugin after the plugins it needs, and the sorted names of the plugins
+               that cannot be installed from the index: missing from it, or needing a newer version than it has.
+    """
+    required, unknown = dependency_closure(plugin_names, index)
+    unavailable = set(unknown)
+    to_install = []
+    for name, version in required.items():
+        if name in unavailable:
+            continue
+        if name in installed and (version is None or compare_versions(installed[name], version) >= 0):
+            continue
+        if version is not None and compare_versions(index[name]['version'], version) < 0:
+            unavailable.add(name)
+            continue
+        to_install.append(name)
+
+    def needs(name):
+        return [d['name'] for d in index[name]['dependencies'] if not d['optional']]
+
+    # A plugin needing a plugin that cannot be installed cannot be installed either
+    blocked = True
+    while blocked:
+        blocked = [name for name in to_install if unavailable.intersection(needs(name))]
+        unavailable.update(blocked)
+        to_install = [name for name in to_install if name not in blocked]
+
+    # Dependencies are installed before the plugins needing them
+    edges = {}
+    for name in to_install:
+        for dependency in needs(name):
+            edges.setdefault(dependency, set()).add(name)
+    ordered = [name for level in jgraph.topological_levels(sorted(to_install), edges) for name in level]
+    return ordered, sorted(unavailable)
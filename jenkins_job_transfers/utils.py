@@ -1,6 +1,43 @@
-import jenkins
-from lxml import etree
+import re
+import threading
+import time
 from . import config as cfg
+from . import canonical as jcanon
+from . import events as jevents
+from . import results as jres
+from . import analysis as janalysis
+from .lazy import lazy_import
+
+jenkins = lazy_import('jenkins')
+futures = lazy_import('concurrent.futures')
+
+INVENTORY_TREE = '?tree=views[name,jobs[name,fullName]],jobs[name,url,jobs[name]]'
+FOLDER_TREE = '?tree=jobs[name,url,jobs[name]]'
+PLUGIN_TREE = '?tree=plugins[shortName,version,active,enabled]'
+UPDATE_CENTER_TREE = '?tree=restartRequiredForCompletion,jobs[id,name,status[type,success],errorMessage]'
+
+# Update center job states that are still in progress
+PENDING_INSTALL_STATES = ('Pending', 'Installing')
+
+# Deploys a batch of plugins and their needed dependencies, each plugin only once
+BATCH_INSTALL_SCRIPT = '''
+def updateCenter = Jenkins.instance.updateCenter
+def toDeploy = [:]
+[%(names)s].each { name ->
+    def plugin = updateCenter.getPlugin(name)
+    if (plugin == null) {
+        println('NOT FOUND: ' + name)
+        return
+    }
+    plugin.getNeededDependencies().each { toDeploy[it.name] = it }
+    toDeploy[plugin.name] = plugin
+}
+toDeploy.values().each { it.deploy() }
+println('DEPLOYING: ' + toDeploy.keySet().join(','))
+'''
+
+# View types whose member jobs are fully described by the tree API; other views are read from config.xml
+TREE_VIEW_CLASSES = ('hudson.model.ListView',)
 
 
 def get_config_xml(conn, job_name):
@@ -20,6 +57,35 @@ def get_config_xml(conn, job_name):
     return config_xml
 
 
+def config_hash(config_xml):
+    """
+    Compute a content hash of a job or view config over its canonical form, see canonical.content_hash.
+
+    Parameters:
+    - config_xml: the configuration XML
+
+    Returns:
+    str: The hex digest of the canonical config.
+    """
+    return jcanon.content_hash(config_xml)
+
+
+def configs_match(config_xml, other_config_xml):
+    """
+    Check whether two job or view configs have the same normalized content.
+
+    Parameters:
+    - config_xml: the configuration XML
+    - other_config_xml: the configuration XML to compare with, may be None
+
+    Returns:
+    bool: True if both configs hash to the same value, False otherwise.
+    """
+    if config_xml is None or other_config_xml is None:
+        return False
+    return config_hash(config_xml) == config_hash(other_config_xml)
+
+
 def create_job(job_name, config_xml):
     """
     Creates a job on Jenkins-Production using the provided connection, job name, and configuration XML.
@@ -29,35 +95,51 @@ def create_job(job_name, config_xml):
     - config_xml: the XML configuration for the job
 
     Returns:
-    None
+    bool: True if the operation succeeded, False otherwise.
     """
+    started = time.time()
     try:
         production_conn = cfg.production_conn
         production_conn.create_job(job_name, config_xml)
-        cfg.table.add_row(*["", job_name, 'Job', 'Success', 'Created'])
+        if cfg.snapshot: cfg.snapshot.production.job_created(job_name)
+        jres.record(job_name, 'job', 'created', started=started)
+        jevents.emit(jevents.CREATED, 'job', job_name)
+        return True
 
     except jenkins.JenkinsException as e:
-        print(f"FAILED to Create Job. Error: {e}")
-        cfg.table.add_row(*["", job_name, 'Job', 'Failed', str(e)])
+        jres.record(job_name, 'job', 'created', jres.FAILED, str(e), started)
+        jevents.emit(jevents.FAILED, 'job', job_name, str(e))
+        return False
 
 
 def update_job(job_name, config_xml):
     """
     A function to update a job on Jenkins-Production with the provided configuration XML.
 
+    With cfg.skipUnchanged set, the job is left alone when production already has the same config.
+
     Parameters:
     - job_name: the name of the job to be updated
     - config_xml: the new configuration XML for the job
 
     Returns:
-    None
+    bool: True if the operation succeeded, False otherwise.
     """
+    started = time.time()
     try:
         production_conn = cfg.production_conn
+        if cfg.skipUnchanged and configs_match(config_xml, get_config_xml(production_conn, job_name)):
+            jres.record(job_name, 'job', 'unchanged', started=started)
+            jevents.emit(jevents.UNCHANGED, 'job', job_name)
+            return True
         production_conn.reconfig_job(job_name, config_xml)
-        cfg.table.add_row(*["", job_name, 'Job', 'Success', 'Updated'])
+        jres.record(job_name, 'job', 'updated', started=started)
+        jevents.emit(jevents.UPDATED, 'job', job_name)
+        return True
     except jenkins.JenkinsException as e:
-        cfg.table.add_row(*["", job_name, 'Job', 'Failed', str(e)])
+        jres.record(job_name, 'job', 'updated', jres.FAILED, str(e), started)
+        jevents.emit(jevents.FAILED, 'job', job_name, str(e))
+        return False
 
 
 def delete_job(job_name):
@@ -68,14 +150,20 @@ def delete_job(job_name):
     - job_name: the name of the job to be deleted
 
     Returns:
-    None
+    bool: True if the operation succeeded, False otherwise.
     """
+    started = time.time()
     try:
         production_conn = cfg.production_conn
         production_conn.delete_job(job_name)
-        cfg.table.add_row(*["", job_name, 'Job', 'Success', 'Deleted'])
+        if cfg.snapshot: cfg.snapshot.production.job_deleted(job_name)
+        jres.record(job_name, 'job', 'deleted', started=started)
+        jevents.emit(jevents.DELETED, 'job', job_name)
+        return True
     except jenkins.JenkinsException as e:
-        cfg.table.add_row(*["", job_name, 'Job', 'Failed', str(e)])
+        jres.record(job_name, 'job', 'deleted', jres.FAILED, str(e), started)
+        jevents.emit(jevents.FAILED, 'job', job_name, str(e))
+        return False
 
 
 def create_view(view_name, config_xml):
@@ -87,33 +175,51 @@ def create_view(view_name, config_xml):
             config_xml: Configuration XML for the updated view.
 
         Returns:
-            None
+            bool: True if the operation succeeded, False otherwise.
     """
+    started = time.time()
     try:
         production_conn = cfg.production_conn
         production_conn.create_view(view_name, config_xml)
-        cfg.table.add_row(*["", view_name, 'View', 'Success', 'Created'])
+        if cfg.snapshot: cfg.snapshot.production.view_written(view_name)
+        jres.record(view_name, 'view', 'created', started=started)
+        jevents.emit(jevents.VIEW_CREATED, 'view', view_name)
+        return True
     except jenkins.JenkinsException as e:
-        cfg.table.add_row(*["", view_name, 'View', 'Failed', str(e)])
+        jres.record(view_name, 'view', 'created', jres.FAILED, str(e), started)
+        jevents.emit(jevents.FAILED, 'view', view_name, str(e))
+        return False
 
 
 def update_view(view_name, config_xml):
     """
     A function to update a specified view in Jenkins production environment.
 
+    With cfg.skipUnchanged set, the view is left alone when production already has the same config.
+
     Args:
         view_name: Name of the view to be updated.
         config_xml: Configuration XML for the updated view.
 
     Returns:
-        None
+        bool: True if the operation succeeded, False otherwise.
     """
+    started = time.time()
     try:
         production_conn = cfg.production_conn
+        if cfg.skipUnchanged and configs_match(config_xml, get_view_config_xml(production_conn, view_name)):
+            jres.record(view_name, 'view', 'unchanged', started=started)
+            jevents.emit(jevents.UNCHANGED, 'view', view_name)
+            return True
         production_conn.reconfig_view(view_name, config_xml)
-        cfg.table.add_row(*["", view_name, 'View', 'Success', 'Updated'])
+        if cfg.snapshot: cfg.snapshot.production.view_written(view_name)
+        jres.record(view_name, 'view', 'updated', started=started)
+        jevents.emit(jevents.VIEW_UPDATED, 'view', view_name)
+        return True
     except jenkins.JenkinsException as e:
-        cfg.table.add_row(*["", view_name, 'View', 'Failed', str(e)])
+        jres.record(view_name, 'view', 'updated', jres.FAILED, str(e), started)
+        jevents.emit(jevents.FAILED, 'view', view_name, str(e))
+        return False
 
 
 def delete_view(view_name):
@@ -124,92 +230,335 @@ def delete_view(view_name):
         view_name: Name of the view to be deleted.
 
     Returns:
-        None
+        bool: True if the operation succeeded, False otherwise.
     """
+    started = time.time()
     try:
         production_conn = cfg.production_conn
         production_conn.delete_view(view_name)
-        cfg.table.add_row(*["", view_name, 'View', 'Success', 'Deleted'])
+        if cfg.snapshot: cfg.snapshot.production.view_deleted(view_name)
+        jres.record(view_name, 'view', 'deleted', started=started)
+        jevents.emit(jevents.VIEW_DELETED, 'view', view_name)
+        return True
     except jenkins.JenkinsException as e:
-        cfg.table.add_row(*["", view_name, 'View', 'Failed', str(e)])
+        jres.record(view_name, 'view', 'deleted', jres.FAILED, str(e), started)
+        jevents.emit(jevents.FAILED, 'view', view_name, str(e))
+        return False
 
 
-def get_plugin_list(conn):
+def get_plugin_versions(conn):
     """
-    Get a list of plugins using the provided connection object.
+    Get the installed plugins and their versions using the provided connection object.
+
+    Only the fields named in PLUGIN_TREE are requested, instead of the full depth=2 plugin manager
+    payload returned by get_plugins_info().
 
     Args:
         conn: The connection object used to retrieve plugin information.
 
     Returns:
-        list: A list of short names of the plugins.
+        dict: Plugin short names as keys and their installed versions as values.
     """
     try:
-        plist = []
-        for plugin in conn.get_plugins_info():
-            plist.append(plugin.get('shortName'))
-        return plist
+        plugins = conn.get_info(item='pluginManager', query=PLUGIN_TREE)['plugins']
+        return {plugin['shortName']: plugin.get('version') for plugin in plugins}
     except Exception as e:
-        print("Error in get_plugin_list: ", e)
+        print("Error in get_plugin_versions: ", e)
+
+
+def install_plugins(conn, plugin_names):
+    """
+    Start the installation of several plugins, and their needed dependencies, with a single script console request.
+
+    Args:
+        conn: The connection to the Jenkins server.
+        plugin_names (list): Short names of the plugins to install.
+
+    Returns:
+        tuple: The plugins being deployed (including dependencies) and the plugins missing from the update center.
+    """
+    for name in plugin_names:
+        if not re.match(r'^[\w.\-]+$', name):
+            raise ValueError(f"Invalid Plugin Name: {name}")
+    names = ", ".join(f"'{name}'" for name in plugin_names)
+    output = conn.run_script(BATCH_INSTALL_SCRIPT % {'names': names})
+
+    deploying, not_found = None, []
+    for line in output.splitlines():
+        if line.startswith('DEPLOYING: '):
+            deploying = [name for name in line[len('DEPLOYING: '):].split(',') if name]
+        elif line.startswith('NOT FOUND: '):
+            not_found.append(line[len('NOT FOUND: '):])
+    if deploying is None:
+        raise jenkins.JenkinsException(f"Unexpected Script Console Output: {output}")
+    return deploying, not_found
+
+
+def wait_for_plugin_installs(conn, timeout=600, poll_interval=1):
+    """
+    Poll the update center until none of its installation jobs is pending.
+
+    The update center is queried with the lean UPDATE_CENTER_TREE, and the polling interval doubles
+    up to 10 seconds while installs are still running.
+
+    Args:
+        conn: The connection to the Jenkins server.
+        timeout (int, optional): Seconds to wait before giving up. Defaults to 600.
+        poll_interval (float, optional): Seconds to wait before the first poll. Defaults to 1.
+
+    Returns:
+        dict: 'failed' maps failed installation jobs to their error message, 'restart_required' tells whether
+              Jenkins needs a restart to complete the installs and 'timed_out' whether installs were still pending.
+    """
+    deadline = time.time() + timeout
+    while True:
+        time.sleep(poll_interval)
+        update_center = conn.get_info(item='updateCenter', query=UPDATE_CENTER_TREE)
+        jobs = [job for job in update_center.get('jobs', []) if job.get('status')]
+        pending = [job for job in jobs if job['status'].get('type') in PENDING_INSTALL_STATES]
+        if not pending or time.time() >= deadline:
+            failed = {job.get('name'): job.get('errorMessage') for job in jobs
+                      if job['status'].get('type') not in PENDING_INSTALL_STATES
+                      and job['status'].get('success') is False}
+            return {
+                'failed': failed,
+                'restart_required': bool(update_center.get('restartRequiredForCompletion')),
+                'timed_out': bool(pending),
+            }
+        poll_interval = min(poll_interval * 2, 10)
+
+
+def safe_restart(conn, timeout=600):
+    """
+    Restart Jenkins once running builds have finished, and wait for it to be back in normal operation.
+
+    Args:
+        conn: The connection to the Jenkins server.
+        timeout (int, optional): Seconds to wait for Jenkins to come back. Defaults to 600.
+
+    Returns:
+        bool: True if Jenkins is back in normal operation within the timeout, False otherwise.
+    """
+    deadline = time.time() + timeout
+    conn.run_script('Jenkins.instance.safeRestart()')
+
+    # Jenkins keeps answering while it quiets down, so wait for it to go away before waiting for it to come back
+    while time.time() < deadline:
+        try:
+            conn.get_version()
+        except Exception:
+            break
+        time.sleep(2)
+    return conn.wait_for_normal_op(max(0, deadline - time.time()))
+
+
+def get_inventory_tree(conn):
+    """
+    Retrieve all views with their member jobs, and all job names, in a single request.
+
+    Args:
+        conn: The connection to the Jenkins server.
+
+    Returns:
+        dict: The server's api/json restricted to INVENTORY_TREE, with 'views' and 'jobs' keys.
+    """
+    return conn.get_info(query=INVENTORY_TREE)
 
 
-def get_job_list(conn):
+def get_job_list(conn, tree=None):
     """
     A function to retrieve a list of job names from the given connection object.
 
+    Jobs inside folders are listed by their full name, e.g. "team/build", down to cfg.folder_depth levels.
+
     Parameters:
     conn (connection object): The connection object used to retrieve job information.
+    tree (dict, optional): A response of get_inventory_tree to read the top-level jobs from instead of querying the server.
 
     Returns:
-    list: A list of job names extracted from the connection object.
+    list: A list of full job names, including the folders themselves.
     """
     try:
+        if tree is not None:
+            return walk_folders(conn, tree['jobs'])
         job_list = []
-        for job in conn.get_jobs():
-            job_list.append(job['name'])
+        for job in conn.get_all_jobs(folder_depth=cfg.folder_depth):
+            job_list.append(job['fullname'])
         return job_list
     except Exception as e:
         print("Error in get_job_list: ", e)
 
 
-def get_views_list(conn):
+def folder_item(full_name):
+    """
+    Get the path of a job or folder relative to the server URL, e.g. "job/team/job/build" for "team/build".
+
+    Args:
+        full_name (str): The full name of the job or folder.
+
+    Returns:
+        str: The item path, as taken by conn.get_info(item=...).
+    """
+    return '/'.join('job/' + part for part in full_name.split('/'))
+
+
+def get_folder_items(conn, folder):
+    """
+    Retrieve the items directly inside a folder.
+
+    Args:
+        conn: The connection to the Jenkins server.
+        folder (str): The full name of the folder.
+
+    Returns:
+        list: The items, restricted to FOLDER_TREE; folders have a 'jobs' key.
+    """
+    return conn.get_info(item=folder_item(folder), query=FOLDER_TREE)['jobs']
+
+
+def walk_folders(conn, items, depth=None):
+    """
+    List the full names of the given top-level items and of everything inside the folders among them.
+
+    Folders are walked one level at a time; the sibling folders of a level are fetched concurrently, bounded by
+    the worker limit of the server.
+
+    Args:
+        conn: The connection to the Jenkins server.
+        items (list): The top-level items, each with a 'name', and a 'jobs' key for folders.
+        depth (int, optional): The number of folder levels to walk, 0 for the top level only. Defaults to
+                               cfg.folder_depth, where None walks every level.
+
+    Returns:
+        list: Full names ("folder/job") of the items and folders found, level by level.
+    """
+    if depth is None:
+        depth = cfg.folder_depth
+
+    names = []
+    level = [(item['name'], item) for item in items]
+    level_number = 0
+    while level:
+        folders = []
+        for full_name, item in level:
+            names.append(full_name)
+            if 'jobs' in item:
+                folders.append(full_name)
+        if not folders or (depth is not None and level_number >= depth):
+            break
+
+        children = map_concurrently(conn, lambda folder: get_folder_items(conn, folder), folders)
+        level = [(f'{folder}/{child["name"]}', child)
+                 for folder, folder_children in zip(folders, children) for child in folder_children]
+        level_number += 1
+    return names
+
+
+def get_views_list(conn, tree=None):
     """
     Retrieves a list of views from the given connection.
 
     Args:
         conn: The connection object used to retrieve the views.
+        tree (dict, optional): A response of get_inventory_tree to read the views from instead of querying the server.
 
     Returns:
         list: A list of names of the views retrieved from the connection.
     """
     try:
         view_list = []
-        for view in conn.get_views():
+        views = tree['views'] if tree is not None else conn.get_views()
+        for view in views:
             view_list.append(view['name'])
         return view_list
     except Exception as e:
         print("Error in get_views_list: ", e)
 
 
-def get_view_and_its_jobs(conn):
+def get_view_and_its_jobs(conn, tree=None):
     """
     Generate a dictionary of views and their associated jobs.
 
+    With cfg.inventory_backend set to "tree", see set_inventory_backend, the membership of list views is read
+    from a single get_inventory_tree request; only views of other types fall back to parsing their config.xml.
+
     :param conn: The connection object to interact with the system.
+    :param tree: Optional response of get_inventory_tree, reused instead of querying the server again.
     :return: A dictionary containing view names as keys and a list of job names as values.
     """
     try:
         view_list = {}
-        for view in conn.get_views():
-            if view['name'] != 'all':
-                config_xml_views = get_view_config_xml(conn, view['name'])
-                root = etree.fromstring(config_xml_views.encode('utf-8'))  # Parse the XML string with lxml
-                view_list[view["name"]] = root.xpath('//jobNames/string/text()')
+        to_fetch = []
+        if cfg.inventory_backend == 'tree':
+            if tree is None:
+                tree = get_inventory_tree(conn)
+            for view in tree['views']:
+                if view['name'] == 'all':
+                    continue
+                if view.get('_class') in TREE_VIEW_CLASSES and 'jobs' in view:
+                    view_list[view['name']] = [job.get('fullName', job['name']) for job in view['jobs']]
+                else:
+                    view_list[view['name']] = None
+                    to_fetch.append(view['name'])
+        else:
+            for view in conn.get_views():
+                if view['name'] != 'all':
+                    view_list[view['name']] = None
+                    to_fetch.append(view['name'])
+
+        # View configs are fetched concurrently, bounded by the worker limit of the server, then parsed, in worker
+        # processes if set with set_analysis_processes
+        fetched = map_concurrently(conn, lambda name: get_view_config_xml(conn, name), to_fetch)
+        analyzed = janalysis.analyze(janalysis.analyze_view_config, fetched)
+        for view_name, config_xml, jobs in zip(to_fetch, fetched, analyzed):
+            if config_xml is None:
+                raise ValueError(f"{view_name}'s config.xml NOT RETRIEVED")
+            if jobs is None:
+                raise ValueError(f"{view_name}'s config.xml NOT PARSED")
+            view_list[view_name] = jobs
         return view_list
     except Exception as e:
         print("Error in get_view_and_its_jobs: ", e)
 
 
+def get_jobs_in_view(conn, view_name):
+    """
+    Retrieve the names of the jobs in a single view, the same way get_view_and_its_jobs does.
+
+    Args:
+        conn: The connection to the Jenkins server.
+        view_name: The name of the view.
+
+    Returns:
+        list: The job names in the view, or None if the view does not exist.
+    """
+    if cfg.inventory_backend == 'tree':
+        try:
+            view = conn.get_info(item=f'view/{view_name}', query='?tree=jobs[name,fullName]')
+        except jenkins.JenkinsException:
+            return None
+        if view.get('_class') in TREE_VIEW_CLASSES and 'jobs' in view:
+            return [job.get('fullName', job['name']) for job in view['jobs']]
+    return get_jobs_in_view_config(conn, view_name)
+
+
+def get_jobs_in_view_config(conn, view_name):
+    """
+    Retrieve the names of the jobs listed in a single view's configuration.
+
+    Args:
+        conn: The connection to the Jenkins server.
+        view_name: The name of the view.
+
+    Returns:
+        list: The job names in the view, or None if the view's configuration could not be retrieved.
+    """
+    config_xml_views = get_view_config_xml(conn, view_name)
+    if config_xml_views is None:
+        return None
+    return janalysis.analyze_view_config(config_xml_views.encode('utf-8'))
+
+
 def get_view_config_xml(conn, view_name):
     """
     Retrieve the configuration XML for a specific view.
@@ -225,4 +574,113 @@ def get_view_config_xml(conn, view_name):
         config_xml = conn.get_view_config(view_name)
     except jenkins.JenkinsException:
         config_xml = None
-    return config_xml
\ No newline at end of file
+    return config_xml
+
+
+def get_max_workers(conn, workers=None):
+    """
+    Get the number of concurrent requests allowed against the server of the given connection.
+
+    Args:
+        conn: The connection to the Jenkins server.
+        workers (int, optional): The worker count requested by the caller. Defaults to cfg.max_workers.
+
+    Returns:
+        int: The smaller of the requested worker count and the server's own limit, at least 1.
+    """
+    if workers is None:
+        workers = cfg.max_workers
+    server_limit = cfg.max_workers_per_server.get(conn.server.rstrip('/'))
+    if server_limit is not None:
+        workers = min(workers, server_limit)
+    return max(1, workers)
+
+
+class _TableBuffer:
+    """
+    Records the calls a worker thread makes on cfg.table so they can be replayed later.
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def add_row(self, *args, **kwargs):
+        self.calls.append(('add_row', args, kwargs))
+
+    def add_section(self):
+        self.calls.append(('add_section', (), {}))
+
+    def add_result(self, result):
+        self.calls.append(('add_result', (result,), {}))
+        return result
+
+    def replay(self, table):
+        for name, args, kwargs in self.calls:
+            getattr(table, name)(*args, **kwargs)
+
+
+class TableRouter:
+    """
+    Stands in for cfg.table while worker threads are running; each worker writes to its own buffer.
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self._local = threading.local()
+
+    def bind(self, buffer):
+        self._local.buffer = buffer
+
+    def target(self):
+        return getattr(self._local, 'buffer', None) or self.table
+
+    def __getattr__(self, name):
+        return getattr(self.target(), name)
+
+
+def map_concurrently(conn, func, items, workers=None):
+    """
+    Apply func to every item using a thread pool bounded by the worker limit of conn's server.
+
+    Rows added to cfg.table by func are buffered per item and added in the order of items once all of
+    them are done, so the report does not depend on which worker finished first.
+
+    Args:
+        conn: The connection to the Jenkins server the calls are made against.
+        func: A callable taking a single item.
+        items: The items to process.
+        workers (int, optional): The number of workers requested. Defaults to cfg.max_workers.
+
+    Returns:
+        list: The results of func, in the same order as items.
+    """
+    items = list(items)
+    workers = min(get_max_workers(conn, workers), len(items))
+    if workers <= 1:
+        return [func(item) for item in items]
+
+    table = cfg.table
+    if table is None:
+        with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(func, items))
+
+    router = table if isinstance(table, TableRouter) else TableRouter(table)
+    parent = router.target()
+    buffers = [_TableBuffer() for _ in items]
+
+    def run(index):
+        router.bind(buffers[index])
+        try:
+            return func(items[index])
+        finally:
+            router.bind(None)
+
+    cfg.table = router
+    try:
+        with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(run, range(len(items))))
+    finally:
+        cfg.table = table
+        for buffer in buffers:
+            buffer.replay(parent)
+    return results